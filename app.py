@@ -1,21 +1,6 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-from onboarding import show_onboarding
-from product_catalog import show_product_catalog
-from product_detail import show_product_detail
-from order_booking import show_order_booking
-from order_confirmation import show_order_confirmation
-from merchandiser_agent import show_merchandiser_agent
-from retailer_analysis import show_retailer_analysis
-from stock_analysis import show_stock_analysis
-from virtual_silk_road_landing import show_virtual_silk_road_landing
-from virtual_silk_road import show_virtual_silk_road
-from visualization import show_visualization
-from empire_os_landing import show_empire_os_landing
-from synergyze_landing import show_synergyze_landing
-from hsn_transaction_system import show_hsn_transaction_system
+from page_registry import show_page
+from session_memory import manage_session
 
 # Configure the page
 st.set_page_config(
@@ -48,6 +33,9 @@ if 'is_authenticated' not in st.session_state:
 if 'user_role' not in st.session_state:
     st.session_state.user_role = 'public'  # Options: 'public', 'licensed', 'emperor'
 
+# Keep this session's state within its memory budget
+manage_session()
+
 # Sidebar navigation
 with st.sidebar:
     # Application title with new branding
@@ -99,6 +87,9 @@ with st.sidebar:
         if st.button("📈 Stock Analysis", use_container_width=True):
             st.session_state.page = 'stock_analysis'
             
+        if st.button("🔎 Retail Screener", use_container_width=True):
+            st.session_state.page = 'retail_screener'
+            
         st.markdown("### Inventory Management")
         
         # Add HSN Transaction System button
@@ -117,6 +108,10 @@ with st.sidebar:
             
         if st.button("⚡ License Management", use_container_width=True):
             st.session_state.page = 'license_management'
+
+        if st.session_state.user_role == 'emperor':
+            if st.button("🧠 Session Memory", use_container_width=True):
+                st.session_state.page = 'session_memory'
             
         st.markdown("### Enterprise Intelligence")
             
@@ -126,6 +121,9 @@ with st.sidebar:
         if st.button("📈 Technical Analysis", use_container_width=True):
             st.session_state.page = 'visualization'
             
+        if st.button("🔎 Retail Screener", use_container_width=True):
+            st.session_state.page = 'retail_screener'
+            
         st.markdown("### Advanced Tools")
         
         if st.button("🏆 HSN Transaction Suite", use_container_width=True):
@@ -190,61 +188,8 @@ with st.sidebar:
 if 'page' not in st.session_state:
     st.session_state.page = 'vsr_landing'  # Default to the public landing page
 
-# Main content area based on the current page
-if st.session_state.page == 'onboarding':
-    show_onboarding()
-elif st.session_state.page == 'product_catalog':
-    show_product_catalog()
-elif st.session_state.page == 'product_detail':
-    show_product_detail()
-elif st.session_state.page == 'order_booking':
-    show_order_booking()
-elif st.session_state.page == 'order_confirmation':
-    show_order_confirmation()
-elif st.session_state.page == 'merchandiser_agent':
-    show_merchandiser_agent()
-elif st.session_state.page == 'retailer_analysis':
-    show_retailer_analysis()
-elif st.session_state.page == 'stock_analysis':
-    show_stock_analysis()
-elif st.session_state.page == 'visualization':
-    show_visualization()
-elif st.session_state.page == 'hsn_transaction_system':
-    show_hsn_transaction_system()
-# Empire Ecosystem pages
-elif st.session_state.page == 'empire_os_landing':
-    show_empire_os_landing()  # Public marketing page for Empire OS
-elif st.session_state.page == 'vsr_landing':
-    show_virtual_silk_road_landing()  # Public marketing page for Virtual Silk Road
-elif st.session_state.page == 'synergyze_landing':
-    show_synergyze_landing()  # Public marketing page for Synergyze Licenses
-
-# Private access dashboards
-elif st.session_state.page == 'virtual_silk_road':
-    # Check if user has proper access
-    if st.session_state.user_role in ['licensed', 'emperor']:
-        show_virtual_silk_road()  # Private Emperor's view
-    else:
-        # Redirect unauthorized users to the public landing
-        st.warning("⚠️ You need licensed access to view the Emperor's Virtual Silk Road dashboard.")
-        show_virtual_silk_road_landing()
-# Emperor control dashboards - redirect if no access
-elif st.session_state.page in ['empire_os_dashboard', 'license_management']:
-    if st.session_state.user_role == 'emperor':
-        # Show the Emperor's dashboard
-        from empire_os_dashboard import show_empire_os_dashboard, show_license_dashboard
-        
-        if st.session_state.page == 'empire_os_dashboard':
-            show_empire_os_dashboard()
-        else:  # license_management
-            show_license_dashboard()
-    else:
-        # Redirect unauthorized users
-        st.warning("⚠️ Only the Emperor has access to this command interface.")
-        show_empire_os_landing()
-else:
-    # Fallback to landing page if an unknown page is requested
-    show_virtual_silk_road_landing()
+# Main content area based on the current page; each page's module is imported on first use
+show_page(st.session_state.page, st.session_state.user_role)
 
 # Footer - dynamically change based on the current section
 st.markdown("---")
@@ -0,0 +1,39 @@
+import os
+
+# Directory for local, process-independent caches (market data, fundamentals, etc.)
+CACHE_DIR = os.environ.get("ECG_CACHE_DIR", ".cache")
+
+def cache_path(filename):
+    """Return the path of a file inside the local cache directory, creating the directory if needed"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, filename)
+
+# Market data source: "yfinance" (live), "replay" (recorded fixtures) or "synthetic" (generated GBM prices)
+MARKET_DATA_PROVIDER = os.environ.get("MARKET_DATA_PROVIDER", "yfinance")
+MARKET_DATA_FIXTURES_DIR = os.environ.get("MARKET_DATA_FIXTURES_DIR", os.path.join("fixtures", "market_data"))
+MARKET_DATA_REPLAY_LATENCY = float(os.environ.get("MARKET_DATA_REPLAY_LATENCY", "0"))
+MARKET_DATA_SYNTHETIC_SEED = int(os.environ.get("MARKET_DATA_SYNTHETIC_SEED", "0"))
+
+# Chart rendering: traces with more points than this are drawn with WebGL;
+# set ECG_CHART_PAYLOAD_REPORT=1 to show the serialized size under every chart
+CHART_WEBGL_THRESHOLD = int(os.environ.get("ECG_CHART_WEBGL_THRESHOLD", "10000"))
+CHART_PAYLOAD_REPORT = os.environ.get("ECG_CHART_PAYLOAD_REPORT", "0") == "1"
+
+# Session memory: above this many bytes of private session state, large
+# DataFrames are moved to a shared, deduplicated cache; sessions idle longer
+# than SESSION_IDLE_SECONDS release what they hold there
+SESSION_MEMORY_BUDGET = int(float(os.environ.get("ECG_SESSION_MEMORY_MB", "50")) * 1e6)
+SESSION_SPILL_MIN_BYTES = int(float(os.environ.get("ECG_SESSION_SPILL_MIN_MB", "1")) * 1e6)
+SESSION_IDLE_SECONDS = int(os.environ.get("ECG_SESSION_IDLE_SECONDS", "1800"))
+
+# Generated sample activity for the HSN transaction store: days of history
+# created for an empty store, and average transactions per weekday
+TRANSACTION_SAMPLE_DAYS = int(os.environ.get("ECG_TRANSACTION_SAMPLE_DAYS", "365"))
+TRANSACTION_SAMPLE_ROWS_PER_DAY = int(os.environ.get("ECG_TRANSACTION_SAMPLE_ROWS_PER_DAY", "150"))
+
+# HSN nomenclature master (code, description, GST rate); a binary snapshot of
+# its trie is kept in the cache directory and rebuilt when the file changes
+HSN_MASTER_PATH = os.environ.get("ECG_HSN_MASTER", os.path.join("data", "hsn_master.csv"))
+# Products labelled with their HSN code, used with the master descriptions to
+# train the product description classifier
+HSN_LABELLED_PRODUCTS_PATH = os.environ.get("ECG_HSN_LABELLED_PRODUCTS", os.path.join("data", "hsn_labelled_products.csv"))
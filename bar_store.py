@@ -0,0 +1,159 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from downsampling import aggregate_ohlc
+from market_data_cache import period_to_start
+
+# Multi-resolution bars. Only base intervals are downloaded and cached; every
+# other interval is resampled from the finest base that covers the request.
+# Resampled levels are built on first use, kept in memory, and when new base
+# bars arrive only the buckets from the first changed bar onwards are rebuilt.
+#
+# Intraday intervals come from intraday bases. Daily and weekly bars always
+# come from daily bars, which carry dividend-adjusted closes and full-session
+# volume that intraday feeds do not.
+
+# Intervals offered to users, finest first
+INTERVALS = ["1m", "5m", "15m", "1h", "1d", "1wk"]
+
+INTERVAL_LABELS = {
+    "1m": "1 Minute",
+    "5m": "5 Minutes",
+    "15m": "15 Minutes",
+    "1h": "1 Hour",
+    "1d": "1 Day",
+    "1wk": "1 Week"
+}
+
+# Intervals that are downloaded, and how far back the upstream feed serves them
+BASE_LOOKBACK = {
+    "1m": pd.Timedelta(days=7),
+    "5m": pd.Timedelta(days=60),
+    "1h": pd.Timedelta(days=730),
+    "1d": None
+}
+
+INTRADAY_INTERVALS = {"1m", "5m", "15m", "1h"}
+
+MINUTE_NS = 60 * 1_000_000_000
+DAY_NS = 1440 * MINUTE_NS
+BUCKET_NS = {"1m": MINUTE_NS, "5m": 5 * MINUTE_NS, "15m": 15 * MINUTE_NS, "1h": 60 * MINUTE_NS, "1d": DAY_NS}
+# Intraday buckets are aligned to the 9:30 session open, so hourly bars start at 9:30, 10:30, ...
+SESSION_OPEN_NS = 570 * MINUTE_NS
+
+# Bars per year, for annualizing statistics computed on each interval
+PERIODS_PER_YEAR = {"1m": 252 * 390, "5m": 252 * 78, "15m": 252 * 26, "1h": 252 * 7, "1d": 252, "1wk": 52}
+
+def bucket_keys(index, interval):
+    """Start time (ns) of the interval bucket each timestamp falls into"""
+    ns = index.asi8
+    if interval == "1wk":
+        days = ns // DAY_NS
+        # Weeks start on Monday; 1970-01-01 was a Thursday
+        return (days - (days + 3) % 7) * DAY_NS
+    step = BUCKET_NS[interval]
+    if interval == "1d":
+        return ns - ns % step
+    return ns - (ns - SESSION_OPEN_NS) % step
+
+def resample_ohlcv(frame, interval):
+    """Resample time-sorted OHLCV bars to a coarser interval in one vectorized pass"""
+    if frame.empty:
+        return frame
+    keys = bucket_keys(frame.index, interval)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    resampled = aggregate_ohlc(frame, starts, pd.DatetimeIndex(keys[starts], name=frame.index.name))
+    return resampled[list(frame.columns)]
+
+def _interval_ns(interval):
+    return 7 * DAY_NS if interval == "1wk" else BUCKET_NS[interval]
+
+def base_interval(interval, start, now=None):
+    """Return the finest base interval that can serve interval back to start, or None"""
+    now = now if now is not None else pd.Timestamp.now()
+    if interval not in INTRADAY_INTERVALS:
+        return "1d"
+    for base, lookback in BASE_LOOKBACK.items():
+        if base == "1d" or _interval_ns(base) > _interval_ns(interval):
+            continue
+        if start >= now - lookback:
+            return base
+    return None
+
+def available_intervals(period, now=None):
+    """Return the intervals that can be served for a period string"""
+    start = period_to_start(period, now)
+    return [interval for interval in INTERVALS if base_interval(interval, start, now) is not None]
+
+def _fingerprint(frame):
+    # The last bar may be partial, so its values are part of the fingerprint
+    last = tuple(frame.iloc[-1].fillna(-1.0)) if len(frame) else ()
+    return len(frame), frame.index[-1].value if len(frame) else None, last
+
+class BarStore:
+    """Serve any interval from cached base bars through lazily materialized resampled levels"""
+
+    def __init__(self, history_loader, max_levels=256):
+        # history_loader(ticker, start, end, interval) -> OHLCV DataFrame of base bars
+        self.history_loader = history_loader
+        self.max_levels = max_levels
+        self._levels = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "extended": 0, "built": 0}
+
+    def _materialize(self, ticker, base, interval, bars):
+        """Return bars resampled to interval, reusing and extending the cached level"""
+        if bars.empty:
+            return bars
+        key = (ticker, base, interval, bars.index[0].value)
+        fingerprint = _fingerprint(bars)
+        with self._lock:
+            cached = self._levels.get(key)
+            if cached is not None:
+                self._levels.move_to_end(key)
+
+        if cached is not None and cached["fingerprint"] == fingerprint:
+            with self._lock:
+                self.stats["hits"] += 1
+            return cached["level"].copy()
+
+        if cached is not None and len(bars) >= cached["fingerprint"][0]:
+            # New or updated base bars: rebuild from the bucket holding the old last bar
+            level = cached["level"]
+            last_key = level.index[-1]
+            tail = resample_ohlcv(bars[bars.index >= last_key], interval)
+            level = pd.concat([level[level.index < last_key], tail])
+            outcome = "extended"
+        else:
+            level = resample_ohlcv(bars, interval)
+            outcome = "built"
+
+        with self._lock:
+            self.stats[outcome] += 1
+            self._levels[key] = {"fingerprint": fingerprint, "level": level}
+            self._levels.move_to_end(key)
+            while len(self._levels) > self.max_levels:
+                self._levels.popitem(last=False)
+        return level.copy()
+
+    def get_bars(self, ticker, start=None, end=None, interval="1d", period=None):
+        """Return OHLCV bars for a ticker at any interval in INTERVALS
+
+        Raises ValueError when no base interval reaches back far enough
+        (e.g. 1-minute bars for a 5-year period).
+        """
+        now = pd.Timestamp.now()
+        start = pd.Timestamp(start) if start is not None else period_to_start(period or "1y", now)
+        base = base_interval(interval, start, now)
+        if base is None:
+            raise ValueError(f"{INTERVAL_LABELS.get(interval, interval)} bars are not available that far back")
+        bars = self.history_loader(ticker, start, end, base)
+        if interval == base:
+            return bars
+        return self._materialize(ticker, base, interval, bars)
+
+    def clear(self):
+        """Drop every materialized level"""
+        with self._lock:
+            self._levels.clear()
@@ -0,0 +1,249 @@
+import threading
+from collections import OrderedDict, deque
+import numpy as np
+import pandas as pd
+from frame_memo import frame_hash
+from indicator_engine import rolling_mean, simple_returns
+
+# Rolling covariance and correlation over a returns panel (dates x tickers).
+# The engine keeps pairwise sums over the current window, so each new row is a
+# rank-1 add and the row leaving the window a rank-1 remove. Missing returns
+# are skipped pair by pair, like pandas' DataFrame.cov(). The first window is
+# built with blockwise matrix products so hundreds of tickers stay cheap.
+#
+# The newest row may still change: the OHLCV cache refetches today's partial
+# bar, so its return (and the next day's) can be revised. A revised last row
+# is swapped out with a remove and an add of the new values.
+
+BLOCK_SIZE = 128
+
+# Engines kept for the most recently used (tickers, window) selections
+MAX_ENGINES = 16
+
+# Window lengths (trading days) offered in the retailer comparison
+CORRELATION_WINDOWS = {
+    "1 Month (21d)": 21,
+    "3 Months (63d)": 63,
+    "6 Months (126d)": 126,
+    "1 Year (252d)": 252
+}
+
+def _window_sums(centered, mask, block_size=BLOCK_SIZE):
+    """Pairwise counts, sums, squares and cross products of a window, computed in column blocks
+
+    For tickers i and j, each statistic covers only the rows where both are valid.
+    """
+    filled = np.where(mask, centered, 0.0)
+    weights = mask.astype(float)
+    n_cols = centered.shape[1]
+    stats = {name: np.empty((n_cols, n_cols)) for name in ("counts", "sums", "squares", "products")}
+    for start in range(0, n_cols, block_size):
+        block = slice(start, start + block_size)
+        stats["counts"][block] = weights[:, block].T @ weights
+        stats["sums"][block] = filled[:, block].T @ weights
+        stats["squares"][block] = (filled[:, block] ** 2).T @ weights
+        stats["products"][block] = filled[:, block].T @ filled
+    return stats
+
+class RollingCovariance:
+    """Covariance and correlation matrix of the last `window` return rows, updated one row at a time"""
+
+    def __init__(self, tickers, window):
+        self.tickers = list(tickers)
+        self.window = window
+        n_cols = len(self.tickers)
+        self.rows = deque()
+        # Per-ticker offset subtracted before summing; keeps the sums small so
+        # the add/remove updates do not lose precision
+        self.shift = None
+        self.counts = np.zeros((n_cols, n_cols))
+        self.sums = np.zeros((n_cols, n_cols))
+        self.squares = np.zeros((n_cols, n_cols))
+        self.products = np.zeros((n_cols, n_cols))
+        self.last_timestamp = None
+        # Set by get_rolling_covariance to detect rewritten rows
+        self.fingerprint = None
+        # Engines are shared by every session; updates and reads take this lock
+        self._lock = threading.RLock()
+
+    def _apply(self, row, sign):
+        mask = ~np.isnan(row)
+        centered = np.where(mask, row - self.shift, 0.0)
+        weights = mask.astype(float)
+        self.counts += sign * np.outer(weights, weights)
+        self.sums += sign * np.outer(centered, weights)
+        self.squares += sign * np.outer(centered ** 2, weights)
+        self.products += sign * np.outer(centered, centered)
+
+    def _initialize(self, rows):
+        rows = np.atleast_2d(np.asarray(rows, dtype=float))[-self.window:]
+        mask = ~np.isnan(rows)
+        counts = mask.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.shift = np.where(counts > 0, np.where(mask, rows, 0.0).sum(axis=0) / counts, 0.0)
+        stats = _window_sums(rows - self.shift, mask)
+        self.counts, self.sums = stats["counts"], stats["sums"]
+        self.squares, self.products = stats["squares"], stats["products"]
+        self.rows = deque(rows)
+
+    def update(self, row, timestamp=None):
+        """Add one row of returns (NaN for missing) and drop the row leaving the window"""
+        row = np.asarray(row, dtype=float)
+        with self._lock:
+            if self.shift is None:
+                self._initialize(row)
+            else:
+                self._apply(row, 1.0)
+                self.rows.append(row)
+                if len(self.rows) > self.window:
+                    self._apply(self.rows.popleft(), -1.0)
+            self.last_timestamp = timestamp
+
+    def revise_last(self, row):
+        """Replace the newest row with revised values; returns whether anything changed"""
+        row = np.asarray(row, dtype=float)
+        with self._lock:
+            if not self.rows or np.array_equal(self.rows[-1], row, equal_nan=True):
+                return False
+            self._apply(self.rows[-1], -1.0)
+            self._apply(row, 1.0)
+            self.rows[-1] = row
+            return True
+
+    def update_frame(self, returns):
+        """Feed every row of a returns frame newer than the last one seen
+
+        The frame's row for the last timestamp seen replaces the stored one
+        if it was revised. On the first call only the last `window` rows
+        matter, so they are loaded in one blockwise pass instead of row by row.
+        """
+        returns = returns.reindex(columns=self.tickers)
+        with self._lock:
+            if self.last_timestamp is not None:
+                if self.last_timestamp in returns.index:
+                    self.revise_last(returns.loc[self.last_timestamp].to_numpy(dtype=float))
+                returns = returns[returns.index > self.last_timestamp]
+            if returns.empty:
+                return 0
+            if self.shift is None:
+                self._initialize(returns.to_numpy(dtype=float))
+            else:
+                for row in returns.to_numpy(dtype=float):
+                    self.update(row)
+            self.last_timestamp = returns.index[-1]
+            return len(returns)
+
+    def _centered_cross(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.products - self.sums * self.sums.T / self.counts
+
+    def covariance(self):
+        """Sample covariance matrix of the current window (pairwise complete observations)"""
+        with self._lock, np.errstate(invalid="ignore", divide="ignore"):
+            cov = self._centered_cross() / (self.counts - 1)
+            cov[self.counts < 2] = np.nan
+        return pd.DataFrame(cov, index=self.tickers, columns=self.tickers)
+
+    def correlation(self):
+        """Correlation matrix of the current window (pairwise complete observations)"""
+        with self._lock, np.errstate(invalid="ignore", divide="ignore"):
+            # Each ticker's spread over the rows it shares with the other ticker
+            spread = self.squares - self.sums ** 2 / self.counts
+            corr = self._centered_cross() / np.sqrt(spread * spread.T)
+            corr[self.counts < 2] = np.nan
+            np.fill_diagonal(corr, np.where(np.diagonal(self.counts) >= 2, 1.0, np.nan))
+        return pd.DataFrame(np.clip(corr, -1.0, 1.0), index=self.tickers, columns=self.tickers)
+
+_engines = OrderedDict()
+_engines_lock = threading.Lock()
+
+def _settled_fingerprint(returns, window, last_timestamp):
+    """Hash of the rows up to last_timestamp that are still in the window, except the newest
+
+    The newest row may be revised and is handled by update_frame; a change
+    in any older row of the window means the sums must be rebuilt.
+    """
+    return frame_hash(returns[returns.index <= last_timestamp].iloc[-window:-1])
+
+def get_rolling_covariance(prices, window):
+    """Return the cached engine for these tickers and window, fed with any new rows of prices
+
+    Engines are kept per (tickers, window) for the MAX_ENGINES most recent
+    selections, so a rerun with one new bar costs a single rank-1 update and
+    switching back to a window seen before is free. An engine is rebuilt when
+    the rows it already holds were rewritten.
+    """
+    key = (tuple(prices.columns), window)
+    returns = pd.DataFrame(simple_returns(prices.to_numpy(dtype=float)), index=prices.index, columns=prices.columns).iloc[1:]
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is not None and engine.last_timestamp is not None and (
+            (returns.index[-1:] < engine.last_timestamp).any()
+            or _settled_fingerprint(returns, window, engine.last_timestamp) != engine.fingerprint
+        ):
+            # Rewritten history: start over
+            engine = None
+        if engine is None:
+            engine = _engines[key] = RollingCovariance(prices.columns, window)
+        _engines.move_to_end(key)
+        while len(_engines) > MAX_ENGINES:
+            _engines.popitem(last=False)
+        engine.update_frame(returns)
+        if engine.last_timestamp is not None:
+            engine.fingerprint = _settled_fingerprint(returns, window, engine.last_timestamp)
+    return engine
+
+def rolling_correlation(prices, reference, window):
+    """Rolling correlation of every price column's returns with one reference price series"""
+    values = simple_returns(prices.to_numpy(dtype=float))
+    ref = simple_returns(reference.reindex(prices.index).to_numpy(dtype=float))[:, None]
+    valid = ~np.isnan(values) & ~np.isnan(ref)
+    x = np.where(valid, values, np.nan)
+    y = np.where(valid, np.broadcast_to(ref, values.shape), np.nan)
+    mean_x, mean_y = rolling_mean(x, window), rolling_mean(y, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = rolling_mean(x * y, window) - mean_x * mean_y
+        var_x = rolling_mean(x ** 2, window) - mean_x ** 2
+        var_y = rolling_mean(y ** 2, window) - mean_y ** 2
+        corr = cov / np.sqrt(var_x * var_y)
+    return pd.DataFrame(np.clip(corr, -1.0, 1.0), index=prices.index, columns=prices.columns)
+
+def cluster_order(corr):
+    """Order tickers so that groups moving together sit next to each other
+
+    Average-linkage agglomerative clustering on the distance sqrt((1 - corr) / 2).
+    Returns (order, merges): the ticker order for a heatmap and the list of
+    (left members, right members, distance) merges from first to last.
+    """
+    tickers = list(corr.index)
+    n = len(tickers)
+    if n < 3:
+        return tickers, []
+    distance = np.sqrt(np.clip((1 - corr.fillna(0).to_numpy(dtype=float)) / 2, 0, 1))
+    np.fill_diagonal(distance, np.inf)
+    members = {i: [i] for i in range(n)}
+    sizes = np.ones(n)
+    merges = []
+    for _ in range(n - 1):
+        i, j = np.unravel_index(np.argmin(distance), distance.shape)
+        i, j = min(i, j), max(i, j)
+        merges.append(([tickers[k] for k in members[i]], [tickers[k] for k in members[j]], float(distance[i, j])))
+        # Average linkage: size-weighted mean of the two clusters' distances
+        merged = (sizes[i] * distance[i] + sizes[j] * distance[j]) / (sizes[i] + sizes[j])
+        distance[i, :] = merged
+        distance[:, i] = merged
+        distance[i, i] = np.inf
+        # Cluster j is gone
+        distance[j, :] = np.inf
+        distance[:, j] = np.inf
+        sizes[i] += sizes[j]
+        members[i] = members[i] + members.pop(j)
+    order = next(iter(members.values()))
+    return [tickers[k] for k in order], merges
+
+def top_pairs(corr, n=10, ascending=False):
+    """Return the n most (or least) correlated distinct ticker pairs as a DataFrame"""
+    upper = np.triu(np.ones(corr.shape, dtype=bool), k=1)
+    pairs = corr.where(upper).stack().rename("Correlation").reset_index()
+    pairs.columns = ["Ticker A", "Ticker B", "Correlation"]
+    return pairs.sort_values("Correlation", ascending=ascending).head(n).reset_index(drop=True)
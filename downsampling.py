@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+# Downsampling of long price histories before figure construction.
+# Line series use Largest-Triangle-Three-Buckets (LTTB), which keeps the
+# visual shape (peaks, troughs) of the series; candles use bucket
+# aggregation that preserves each bucket's open, high, low and close.
+# Volume is never picked by LTTB: it is summed over the candle buckets.
+
+DEFAULT_CHART_WIDTH = 1200  # pixels
+POINTS_PER_PIXEL = 1.0
+PIXELS_PER_CANDLE = 4
+
+def point_budget(chart_width=DEFAULT_CHART_WIDTH, points_per_pixel=POINTS_PER_PIXEL):
+    """Number of points a line chart of the given width can usefully show"""
+    return max(int(chart_width * points_per_pixel), 3)
+
+def candle_budget(chart_width=DEFAULT_CHART_WIDTH, pixels_per_candle=PIXELS_PER_CANDLE):
+    """Number of candles a chart of the given width can usefully show"""
+    return max(int(chart_width // pixels_per_candle), 1)
+
+def lttb_indices(x, y, n_out):
+    """Return the indices of the points LTTB keeps when reducing (x, y) to n_out points"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point for the final bucket)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        # Keep the point forming the largest triangle with the previous pick and the next average
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.nanargmax(area)) if not np.all(np.isnan(area)) else start
+        selected[i + 1] = previous
+    return selected
+
+def lttb_frame(frame, column, n_out):
+    """Downsample a time-indexed frame to n_out rows chosen by LTTB on one column"""
+    if len(frame) <= n_out:
+        return frame
+    y = frame[column].to_numpy(dtype=float)
+    if np.isnan(y).any():
+        # Missing values (e.g. indicator warm-up) are treated as the nearest valid value
+        y = pd.Series(y).ffill().bfill().to_numpy()
+    return frame.iloc[lttb_indices(frame.index.asi8, y, n_out)]
+
+def aggregate_ohlc(frame, starts, index=None):
+    """Aggregate consecutive bars into buckets beginning at the row positions in starts
+
+    Open is the bucket's first value, High/Low its extremes, Volume its sum and
+    every other column (Close, Adj Close, ...) its last value. Buckets are
+    stamped with index, or with the time of their first bar.
+    """
+    n = len(frame)
+    ends = np.append(starts[1:], n) - 1
+    aggregated = {}
+    for column in frame.columns:
+        values = frame[column].to_numpy(dtype=float)
+        if column == "Open":
+            aggregated[column] = values[starts]
+        elif column == "High":
+            aggregated[column] = np.fmax.reduceat(values, starts)
+        elif column == "Low":
+            aggregated[column] = np.fmin.reduceat(values, starts)
+        elif column == "Volume":
+            aggregated[column] = np.add.reduceat(np.nan_to_num(values), starts)
+        else:
+            aggregated[column] = values[ends]
+    return pd.DataFrame(aggregated, index=index if index is not None else frame.index[starts])
+
+def downsample_ohlc(frame, n_out):
+    """Aggregate consecutive bars into n_out buckets, preserving open/high/low/close
+
+    Each bucket is stamped with the time of its first bar; volume is summed.
+    """
+    n = len(frame)
+    if n <= n_out:
+        return frame
+    starts = np.linspace(0, n, n_out, endpoint=False).astype(int)
+    return aggregate_ohlc(frame, starts)
@@ -5,6 +5,8 @@ import plotly.graph_objects as go
 import plotly.express as px
 import time
 import random
+from figure_encoding import render_chart
+from lazy_tabs import lazy_tabs
 
 def show_empire_os_dashboard():
     """
@@ -27,15 +29,15 @@ def show_empire_os_dashboard():
     )
     
     # Dashboard tabs for different sections
-    tabs = st.tabs([
+    tabs = lazy_tabs([
         "🌐 System Overview", 
         "⚡ License Performance", 
         "📊 Analytics Hub",
         "🔧 Control Center"
-    ])
+    ], key="empire_os_tab")
     
     # Tab 1: System Overview
-    with tabs[0]:
+    if tabs[0]:
         st.header("Empire OS System Overview")
         st.write("Real-time monitoring and control of the entire Empire OS ecosystem.")
         
@@ -237,7 +239,7 @@ def show_empire_os_dashboard():
             cpu_container.plotly_chart(update_cpu_gauge(), use_container_width=True)
             
     # Tab 2: License Performance
-    with tabs[1]:
+    if tabs[1]:
         st.header("License Performance Analytics")
         
         # Add a "live data" indicator with animation
@@ -350,7 +352,7 @@ def show_empire_os_dashboard():
                 margin=dict(l=0, r=0, t=10, b=0)
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
             
             # Interactive insight below the chart
             st.info("👑 **Emperor Insight**: Click on any segment to zoom in and analyze detailed metrics. Double-click to zoom out. Right-click for additional controls.")
@@ -462,7 +464,7 @@ def show_empire_os_dashboard():
             plot_bgcolor='rgba(0,0,0,0.02)'
         )
         
-        st.plotly_chart(ts_fig, use_container_width=True)
+        render_chart(ts_fig, use_container_width=True)
         
         # Add emperor controls for the time series data
         col1, col2, col3 = st.columns(3)
@@ -497,7 +499,7 @@ def show_empire_os_dashboard():
                 margin=dict(l=20, r=20, t=50, b=20)
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
         
         # License trends over time
         st.subheader("License Trends")
@@ -543,7 +545,7 @@ def show_empire_os_dashboard():
         # Add animation
         fig.update_traces(mode="lines+markers")
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
         
         # License geographical distribution
         st.subheader("License Geographical Distribution")
@@ -564,10 +566,10 @@ def show_empire_os_dashboard():
         # Add animation
         fig.update_traces(textposition='inside', textinfo='percent+label')
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
     
     # Tab 3: Analytics Hub
-    with tabs[2]:
+    if tabs[2]:
         st.header("Empire OS Analytics Hub")
         st.write("Advanced analytics for the Empire OS ecosystem with interactive visualizations.")
         
@@ -619,7 +621,7 @@ def show_empire_os_dashboard():
             fig.update_layout(height=400)
             fig.update_traces(textposition="outside")
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
             
             # Revenue trend
             st.subheader("Revenue Trend (12-Month Historical)")
@@ -659,7 +661,7 @@ def show_empire_os_dashboard():
             fig.update_yaxes(tickvals=fig.layout.yaxis.tickvals, 
                              ticktext=[f"{val/1000000:.2f}" for val in fig.layout.yaxis.tickvals])
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
             
         elif analysis_type == "User Engagement":
             st.subheader("User Engagement Analytics")
@@ -704,7 +706,7 @@ def show_empire_os_dashboard():
             fig.update_traces(textposition="top center")
             fig.update_layout(height=500)
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
             
             # User activity heatmap
             st.subheader("User Activity Patterns")
@@ -747,7 +749,7 @@ def show_empire_os_dashboard():
             fig.update_layout(height=400)
             fig.update_xaxes(tickmode='array', tickvals=list(range(0, 24, 2)))
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
             
         elif analysis_type == "System Performance":
             st.subheader("System Performance Analytics")
@@ -802,7 +804,7 @@ def show_empire_os_dashboard():
                 
                 fig.update_layout(height=400)
                 
-                st.plotly_chart(fig, use_container_width=True)
+                render_chart(fig, use_container_width=True)
             else:
                 st.info("Please select at least one performance metric to display")
             
@@ -842,7 +844,7 @@ def show_empire_os_dashboard():
             fig.update_traces(textposition="outside")
             fig.update_layout(height=400)
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
             
         elif analysis_type == "Governance":
             st.subheader("Governance Analytics")
@@ -887,7 +889,7 @@ def show_empire_os_dashboard():
             fig.update_traces(textposition="outside")
             fig.update_layout(height=400)
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
             
             # Policy violations breakdown
             st.subheader("Policy Violations Analysis")
@@ -918,7 +920,7 @@ def show_empire_os_dashboard():
             
             fig.update_layout(height=500)
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
             
         elif analysis_type == "Security":
             st.subheader("Security Analytics")
@@ -982,7 +984,7 @@ def show_empire_os_dashboard():
             
             fig.update_layout(height=350)
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
             
             # Incident type breakdown
             st.subheader("Security Incident Breakdown")
@@ -998,10 +1000,10 @@ def show_empire_os_dashboard():
             fig.update_traces(textposition='inside', textinfo='percent+label')
             fig.update_layout(height=350)
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
     
     # Tab 4: Control Center
-    with tabs[3]:
+    if tabs[3]:
         st.header("Emperor's Control Center")
         st.write("Direct control interfaces for the Empire OS core functions.")
         
@@ -1098,15 +1100,15 @@ def show_empire_os_dashboard():
         st.subheader("System-wide Controls")
         
         # Create tabs for different control categories
-        control_tabs = st.tabs([
+        control_tabs = lazy_tabs([
             "License Control", 
             "User Management", 
             "Governance Policies",
             "System Configuration"
-        ])
+        ], key="empire_control_tab")
         
         # Tab 1: License Control
-        with control_tabs[0]:
+        if control_tabs[0]:
             # License control interface
             st.subheader("License Master Control")
             
@@ -1140,7 +1142,7 @@ def show_empire_os_dashboard():
             st.button("Save License Policy Settings", type="primary", use_container_width=True)
             
         # Tab 2: User Management
-        with control_tabs[1]:
+        if control_tabs[1]:
             # User management interface
             st.subheader("User Role Management")
             
@@ -1187,7 +1189,7 @@ def show_empire_os_dashboard():
                 st.button("Delete User", use_container_width=True)
                 
         # Tab 3: Governance Policies
-        with control_tabs[2]:
+        if control_tabs[2]:
             # Governance policy interface
             st.subheader("Governance Policy Management")
             
@@ -1235,7 +1237,7 @@ def show_empire_os_dashboard():
                 st.button("Archive Policy", use_container_width=True)
                 
         # Tab 4: System Configuration
-        with control_tabs[3]:
+        if control_tabs[3]:
             # System configuration interface
             st.subheader("System Configuration")
             
@@ -1356,7 +1358,7 @@ def show_license_dashboard():
     
     fig.update_traces(textposition="outside")
     
-    st.plotly_chart(fig, use_container_width=True)
+    render_chart(fig, use_container_width=True)
     
     # License usage over time
     st.subheader("License Usage Trend")
@@ -1381,7 +1383,7 @@ def show_license_dashboard():
         markers=True
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    render_chart(fig, use_container_width=True)
     
     # License revenue analytics
     st.subheader("License Revenue Analytics")
@@ -1410,7 +1412,7 @@ def show_license_dashboard():
         
         fig.update_traces(textposition="inside", textinfo="percent+label")
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
     
     with rev_col2:
         # Revenue metrics
@@ -1437,4 +1439,4 @@ def show_license_dashboard():
             }
         ))
         
-        st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+        render_chart(fig, use_container_width=True)
\ No newline at end of file
@@ -0,0 +1,133 @@
+import threading
+from collections import deque
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+from app_config import CHART_PAYLOAD_REPORT, CHART_WEBGL_THRESHOLD
+
+# Figure post-processing before a chart is sent to the browser. Large line/marker
+# traces are switched to WebGL (Scattergl) and numeric arrays are stored as
+# NumPy arrays, which Plotly serializes as base64 typed arrays instead of
+# JSON number lists. Dates become epoch milliseconds on a date axis for the
+# same reason. The chart builders return figures memoized by frame_memo and
+# shared by every session, so the encoding is applied to a copy and the
+# figure passed in is never modified.
+
+# Trace attributes that hold one value per point
+DATA_ATTRIBUTES = ("x", "y", "open", "high", "low", "close", "customdata")
+
+_payload_log = deque(maxlen=100)
+_payload_lock = threading.Lock()
+
+def _point_count(trace):
+    for attribute in ("x", "y"):
+        values = getattr(trace, attribute, None)
+        if values is not None:
+            return len(values)
+    return 0
+
+def _to_webgl(trace):
+    """Return a Scattergl copy of a Scatter trace, or None if it uses SVG-only features"""
+    properties = trace.to_plotly_json()
+    properties.pop("type", None)
+    if properties.get("line", {}).get("shape") == "spline":
+        return None
+    properties.pop("cliponaxis", None)
+    try:
+        return go.Scattergl(**properties)
+    except ValueError:
+        return None
+
+def _typed_array(values):
+    """Return (array, is_date) for a column that can be sent as a typed array, else (None, False)"""
+    if isinstance(values, np.ndarray) and values.dtype.kind in "fiu":
+        return None, False  # already a typed array
+    array = np.asarray(values)
+    if array.dtype.kind == "M":
+        # Epoch milliseconds; the axis is typed as date so labels stay the same
+        milliseconds = array.astype("datetime64[ms]").astype(np.int64).astype(float)
+        milliseconds[np.isnat(array)] = np.nan
+        return milliseconds, True
+    if array.dtype.kind in "fiub":
+        return array.astype(float) if array.dtype.kind == "b" else array, False
+    if array.dtype == object and not any(isinstance(value, (str, bytes)) for value in array.flat):
+        # Numbers mixed with None; strings such as HSN codes stay categorical
+        try:
+            return array.astype(float), False
+        except (TypeError, ValueError):
+            return None, False
+    return None, False
+
+def _axis_name(trace, attribute):
+    reference = getattr(trace, f"{attribute}axis", None) or attribute
+    return f"{attribute}axis{reference[1:]}"
+
+def optimize_figure(fig, webgl_threshold=CHART_WEBGL_THRESHOLD):
+    """Return a copy of a figure with large Scatter traces switched to Scattergl and
+    numeric data stored as typed arrays; the figure passed in is left unchanged
+    """
+    fig = go.Figure(fig)
+    traces = list(fig.data)
+    replaced = False
+    for i, trace in enumerate(traces):
+        if isinstance(trace, go.Scatter) and _point_count(trace) > webgl_threshold:
+            webgl = _to_webgl(trace)
+            if webgl is not None:
+                traces[i] = webgl
+                replaced = True
+    if replaced:
+        fig.data = []
+        fig.add_traces(traces)
+
+    date_axes = set()
+    for trace in fig.data:
+        for attribute in DATA_ATTRIBUTES:
+            values = getattr(trace, attribute, None) if attribute in trace else None
+            if values is None or len(values) == 0:
+                continue
+            array, is_date = _typed_array(values)
+            if array is None:
+                continue
+            if is_date:
+                if attribute not in ("x", "y"):
+                    continue
+                date_axes.add(_axis_name(trace, attribute))
+            trace[attribute] = array
+    for axis in date_axes:
+        if fig.layout[axis].type is None:
+            fig.layout[axis].type = "date"
+    return fig
+
+def figure_payload_size(fig):
+    """Return the size in bytes of the figure as sent to the browser"""
+    return len(pio.to_json(fig, validate=False).encode())
+
+def render_chart(fig, show_payload=None, webgl_threshold=CHART_WEBGL_THRESHOLD, **kwargs):
+    """Optimize a figure and draw it with st.plotly_chart
+
+    With show_payload the serialized size is shown under the chart and kept
+    for payload_report(). It defaults to the "show_chart_payload" session
+    flag, or the ECG_CHART_PAYLOAD_REPORT setting when the flag is unset.
+    """
+    fig = optimize_figure(fig, webgl_threshold)
+    st.plotly_chart(fig, **kwargs)
+    if show_payload is None:
+        show_payload = st.session_state.get("show_chart_payload", CHART_PAYLOAD_REPORT)
+    if show_payload:
+        size = figure_payload_size(fig)
+        title = fig.layout.title.text or "Untitled chart"
+        with _payload_lock:
+            _payload_log.append({
+                "chart": title,
+                "bytes": size,
+                "traces": len(fig.data),
+                "points": sum(_point_count(trace) for trace in fig.data),
+                "webgl": sum(isinstance(trace, go.Scattergl) for trace in fig.data)
+            })
+        st.caption(f"Chart payload: {size / 1024:,.1f} KB")
+
+def payload_report():
+    """Return the most recent payload measurements, newest last"""
+    with _payload_lock:
+        return list(_payload_log)
@@ -0,0 +1,87 @@
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Memoization of indicator and chart functions keyed by a content hash of their
+# input frames, so Streamlit reruns with unchanged data skip the numeric work.
+
+_registry = {}
+
+def frame_hash(frame):
+    """Return a fast content hash of a DataFrame or Series (values, index and column names)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    names = frame.columns if isinstance(frame, pd.DataFrame) else [frame.name]
+    digest.update(repr(list(names)).encode())
+    return digest.hexdigest()
+
+def _key_part(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return ("frame", frame_hash(value))
+    if isinstance(value, np.ndarray):
+        return ("array", value.dtype.str, value.shape, hashlib.blake2b(value.tobytes(), digest_size=16).hexdigest())
+    if isinstance(value, (list, tuple)):
+        return tuple(_key_part(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _key_part(item)) for key, item in value.items()))
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+def memoize_frames(maxsize=64):
+    """Decorator: LRU-cache a function by the content of its DataFrame/Series arguments
+
+    DataFrame and Series results are copied on the way out so callers can
+    modify them freely. Other results (e.g. Plotly figures) are shared
+    between callers and must be treated as read-only.
+    """
+    def decorator(func):
+        cache = OrderedDict()
+        lock = threading.Lock()
+        stats = {"hits": 0, "misses": 0}
+
+        def _copy(result):
+            return result.copy() if isinstance(result, (pd.DataFrame, pd.Series)) else result
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (_key_part(args), _key_part(kwargs))
+            with lock:
+                if key in cache:
+                    cache.move_to_end(key)
+                    stats["hits"] += 1
+                    return _copy(cache[key])
+                stats["misses"] += 1
+
+            result = func(*args, **kwargs)
+
+            with lock:
+                cache[key] = result
+                cache.move_to_end(key)
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return _copy(result)
+
+        def cache_info():
+            with lock:
+                return dict(stats, size=len(cache), maxsize=maxsize)
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+                stats["hits"] = stats["misses"] = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        _registry[f"{func.__module__}.{func.__qualname__}"] = wrapper
+        return wrapper
+    return decorator
+
+def memo_stats():
+    """Return hit/miss counters for every memoized function"""
+    return {name: wrapper.cache_info() for name, wrapper in _registry.items()}
@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app_config import cache_path
+
+# Seconds each Ticker.info field stays fresh; fields not listed use DEFAULT_TTL
+FIELD_TTL = {
+    "currentPrice": 15 * 60,
+    "regularMarketPrice": 15 * 60,
+    "regularMarketChangePercent": 15 * 60,
+    "regularMarketOpen": 15 * 60,
+    "regularMarketDayHigh": 15 * 60,
+    "regularMarketDayLow": 15 * 60,
+    "volume": 15 * 60,
+    "marketCap": 60 * 60,
+    "fiftyTwoWeekLow": 6 * 60 * 60,
+    "fiftyTwoWeekHigh": 6 * 60 * 60
+}
+DEFAULT_TTL = 24 * 60 * 60
+
+class FundamentalsCache:
+    """Ticker.info cache with per-field TTL and stale-while-revalidate
+
+    Stale entries are returned immediately while a background thread
+    refreshes them. Entries are persisted to a JSON file so they survive
+    process restarts.
+    """
+
+    def __init__(self, fetcher, path=None, field_ttl=None, default_ttl=DEFAULT_TTL, max_workers=4):
+        # fetcher(ticker) -> Ticker.info style dict
+        self.fetcher = fetcher
+        self.path = path or cache_path("fundamentals.json")
+        self.field_ttl = dict(FIELD_TTL, **(field_ttl or {}))
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fundamentals-refresh")
+        self._entries = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # A corrupt cache file is simply rebuilt
+            return {}
+
+    def _save(self):
+        with self._lock:
+            snapshot = json.dumps(self._entries, default=str)
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(snapshot)
+        os.replace(tmp_path, self.path)
+
+    def is_stale(self, entry, fields=None, now=None):
+        """Return True if any of the requested fields has outlived its TTL"""
+        now = now if now is not None else time.time()
+        age = now - entry["fetched_at"]
+        fields = fields if fields is not None else entry["info"].keys()
+        ttl = min((self.field_ttl.get(field, self.default_ttl) for field in fields), default=self.default_ttl)
+        return age > ttl
+
+    def _fetch(self, ticker):
+        info = self.fetcher(ticker)
+        with self._lock:
+            self._entries[ticker] = {"fetched_at": time.time(), "info": info}
+        self._save()
+        return info
+
+    def _refresh(self, ticker):
+        try:
+            self._fetch(ticker)
+        except Exception:
+            # Keep serving the stale value; the next read will retry
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(ticker)
+
+    def get(self, ticker, fields=None):
+        """Return the info dict for a ticker, refreshing stale entries in the background"""
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if entry is not None and self.is_stale(entry, fields) and ticker not in self._refreshing:
+                self._refreshing.add(ticker)
+                self._executor.submit(self._refresh, ticker)
+        if entry is None:
+            return self._fetch(ticker)
+        return entry["info"]
+
+    def peek(self, ticker):
+        """Return the cached info dict without fetching, or None"""
+        with self._lock:
+            entry = self._entries.get(ticker)
+        return entry["info"] if entry is not None else None
+
+    def invalidate(self, ticker=None):
+        """Forget one ticker, or every cached entry"""
+        with self._lock:
+            if ticker is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(ticker, None)
+        self._save()
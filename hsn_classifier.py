@@ -0,0 +1,224 @@
+import csv
+import re
+import threading
+import numpy as np
+import pandas as pd
+from app_config import HSN_LABELLED_PRODUCTS_PATH
+from hsn_master import get_hsn_master, normalize_code
+
+# Offline product description -> HSN code classifier.
+#
+# Every training text (an HSN master description, or one of our labelled
+# product names) becomes a TF-IDF vector over the character 2- to 4-grams of
+# its words and the words themselves, so "jeans", "jean" and "denim jeans"
+# land close together and typos cost only a few grams. Vectors are L2-normalised, which makes a dot
+# product their cosine similarity.
+#
+# The training vectors are stored column-wise (for each n-gram, the texts
+# containing it and the weights). Scoring a batch of queries is one sparse
+# product: every non-zero query weight is multiplied with its n-gram's
+# column and the products are summed per (query, text) cell with a single
+# bincount, without scipy. A code's score is the best score of its texts,
+# and top-k takes an argpartition per row.
+#
+# A query costs one pair per (query n-gram, training text containing it), so
+# n-grams found in a large share of the texts (" c", "e ") are left out of
+# the vocabulary: their IDF weight is close to the minimum, yet on the full
+# nomenclature each would pair a query with thousands of texts. Batches are
+# cut by their number of pairs, not of rows.
+
+NGRAM_SIZES = (2, 3, 4)
+
+# N-grams in more than this share of the training texts are not features
+MAX_DOCUMENT_FREQUENCY = 0.35
+
+# Pairs (and dense query x text score cells) per sparse product; each pair
+# costs about 40 bytes of intermediate arrays
+BATCH_PAIRS = 2_000_000
+
+# Certainty shown for a match by cosine similarity
+CERTAINTY_LEVELS = [(0.5, "High"), (0.3, "Medium"), (0.0, "Low")]
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+def text_ngrams(text):
+    """Character n-grams of each word of text, padded with a space at both ends
+
+    The whole padded word is a feature too, so "men" and "women" differ by
+    more than the grams they do not share.
+    """
+    grams = []
+    for word in _NON_WORD.sub(" ", str(text).lower()).split():
+        word = f" {word} "
+        for n in NGRAM_SIZES:
+            grams.extend(word[i:i + n] for i in range(len(word) - n + 1))
+        if len(word) > NGRAM_SIZES[-1]:
+            grams.append(word)
+    return grams
+
+def certainty(score):
+    for threshold, label in CERTAINTY_LEVELS:
+        if score >= threshold:
+            return label
+    return CERTAINTY_LEVELS[-1][1]
+
+class TfidfVectorizer:
+    """Character n-gram TF-IDF vectors as (row, column, weight) arrays"""
+
+    def __init__(self, texts, max_document_frequency=MAX_DOCUMENT_FREQUENCY):
+        document_frequency = {}
+        for text in texts:
+            for gram in set(text_ngrams(text)):
+                document_frequency[gram] = document_frequency.get(gram, 0) + 1
+        limit = max_document_frequency * len(texts)
+        kept = [(gram, count) for gram, count in document_frequency.items() if count <= limit]
+        self.vocabulary = {gram: column for column, (gram, _) in enumerate(kept)}
+        counts = np.array([count for _, count in kept], dtype=np.float64)
+        self.idf = np.log((1 + len(texts)) / (1 + counts)) + 1
+
+    def transform(self, texts):
+        """Return (rows, columns, weights) of the L2-normalised vectors; unknown n-grams are dropped"""
+        rows, columns, counts = [], [], []
+        for row, text in enumerate(texts):
+            grams = {}
+            for gram in text_ngrams(text):
+                column = self.vocabulary.get(gram)
+                if column is not None:
+                    grams[column] = grams.get(column, 0) + 1
+            rows.extend([row] * len(grams))
+            columns.extend(grams)
+            counts.extend(grams.values())
+        rows = np.array(rows, dtype=np.int64)
+        columns = np.array(columns, dtype=np.int64)
+        # Sublinear term frequency, so repeated grams do not dominate
+        weights = (1 + np.log(np.array(counts, dtype=np.float64))) * self.idf[columns]
+        norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=len(texts)))
+        weights /= np.where(norms > 0, norms, 1)[rows]
+        return rows, columns, weights
+
+class HsnClassifier:
+    """TF-IDF nearest-neighbour classifier from product descriptions to HSN codes"""
+
+    def __init__(self, texts, codes, master):
+        self.master = master
+        # Group training texts by code so a code's texts are one contiguous run
+        order = sorted(range(len(texts)), key=lambda i: codes[i])
+        texts = [texts[i] for i in order]
+        codes = [codes[i] for i in order]
+        self.codes, run_starts = np.unique(np.array(codes), return_index=True)
+        self._run_starts = run_starts
+        self.vectorizer = TfidfVectorizer(texts)
+        rows, columns, weights = self.vectorizer.transform(texts)
+        # Column-wise (CSC) layout of the training matrix
+        order = np.argsort(columns, kind="stable")
+        self._texts = rows[order]
+        self._weights = weights[order]
+        self._column_starts = np.searchsorted(columns[order], np.arange(len(self.vectorizer.vocabulary) + 1))
+        self._n_texts = len(texts)
+
+    def _pair_counts(self, columns):
+        return self._column_starts[columns + 1] - self._column_starts[columns]
+
+    def _scores(self, rows, columns, weights, n_queries):
+        starts = self._column_starts[columns]
+        lengths = self._column_starts[columns + 1] - starts
+        total = int(lengths.sum())
+        # Positions of every (query non-zero, training non-zero) pair in the column arrays
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+        cells = np.repeat(rows, lengths) * self._n_texts + self._texts[offsets]
+        products = np.repeat(weights, lengths) * self._weights[offsets]
+        text_scores = np.bincount(cells, weights=products, minlength=n_queries * self._n_texts)
+        text_scores = text_scores.reshape(n_queries, self._n_texts)
+        return np.maximum.reduceat(text_scores, self._run_starts, axis=1)
+
+    def scores(self, queries):
+        """Return the (queries x codes) cosine similarity of each query to each code's best text"""
+        return self._scores(*self.vectorizer.transform(queries), len(queries))
+
+    def _batches(self, queries, max_pairs=BATCH_PAIRS):
+        """Yield (query count, rows, columns, weights) for consecutive batches of at most max_pairs pairs
+
+        A batch also holds at most max_pairs dense score cells; a single query
+        over the limit still forms a batch of its own.
+        """
+        rows, columns, weights = self.vectorizer.transform(queries)
+        pairs = np.bincount(rows, weights=self._pair_counts(columns), minlength=len(queries))
+        ends = np.cumsum(pairs)
+        max_rows = max(1, max_pairs // max(self._n_texts, 1))
+        first = 0
+        while first < len(queries):
+            done = ends[first - 1] if first else 0
+            last = int(np.searchsorted(ends, done + max_pairs, side="right"))
+            last = min(max(last, first + 1), first + max_rows)
+            lo, hi = np.searchsorted(rows, [first, last])
+            yield last - first, rows[lo:hi] - first, columns[lo:hi], weights[lo:hi]
+            first = last
+
+    def top_k(self, queries, k=3):
+        """Return (code indices, scores), each (queries x k), best first"""
+        indices, scores = [], []
+        for count, rows, columns, weights in self._batches(queries):
+            batch = self._scores(rows, columns, weights, count)
+            k_batch = min(k, batch.shape[1])
+            top = np.argpartition(-batch, k_batch - 1, axis=1)[:, :k_batch]
+            top_scores = np.take_along_axis(batch, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            indices.append(np.take_along_axis(top, order, axis=1))
+            scores.append(np.take_along_axis(top_scores, order, axis=1))
+        if not indices:
+            return np.empty((0, k), dtype=np.int64), np.empty((0, k))
+        return np.vstack(indices), np.vstack(scores)
+
+    def classify(self, description, k=3):
+        """Return up to k HSN master entries for one description, each with score and certainty"""
+        indices, scores = self.top_k([description], k)
+        matches = []
+        for index, score in zip(indices[0], scores[0]):
+            if score <= 0:
+                break
+            entry = self.master.get(self.codes[index])
+            entry.update(score=round(float(score), 3), certainty=certainty(score))
+            matches.append(entry)
+        return matches
+
+    def classify_many(self, descriptions):
+        """Classify a list of descriptions; returns a DataFrame of Predicted HSN, Score and Certainty"""
+        descriptions = ["" if pd.isna(d) else str(d) for d in descriptions]
+        indices, scores = self.top_k(descriptions, 1)
+        best = scores[:, 0] if len(descriptions) else np.empty(0)
+        codes = self.codes[indices[:, 0]] if len(descriptions) else np.empty(0, dtype=str)
+        return pd.DataFrame({
+            "Predicted HSN": np.where(best > 0, codes, None),
+            "Prediction Score": best.round(3),
+            "Certainty": [certainty(score) if score > 0 else None for score in best]
+        })
+
+def training_data(master, labelled_path=HSN_LABELLED_PRODUCTS_PATH):
+    """Return (texts, codes): master descriptions of headings and below, plus labelled products"""
+    texts, codes = [], []
+    for code, description in zip(master.codes, master.descriptions):
+        if len(code) >= 4:
+            texts.append(description)
+            codes.append(code)
+    try:
+        with open(labelled_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                code = normalize_code(row["hsn_code"])
+                if code in master:
+                    texts.append(row["product"])
+                    codes.append(code)
+    except FileNotFoundError:
+        pass
+    return texts, codes
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+def get_hsn_classifier():
+    """Return the process-wide classifier, trained on first use"""
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            master = get_hsn_master()
+            _classifier = HsnClassifier(*training_data(master), master)
+    return _classifier
@@ -0,0 +1,211 @@
+import threading
+from itertools import combinations
+import numpy as np
+import pandas as pd
+from hsn_master import get_hsn_master, normalize_code
+from search_index import EXACT, FIELD_PREFIX, WORD_PREFIXES, NgramIndex
+
+# Typo-tolerant HSN lookup.
+#
+# Codes are compared by Damerau-Levenshtein distance, where swapping two
+# adjacent digits (6230 for 6203) costs one edit like a wrong, missing or
+# extra digit. Candidates come from a symmetric-delete index: every code is
+# stored under each string left by deleting up to k of its digits. Two codes
+# within k edits always share such a string, since each substitution or
+# transposition is undone by one deletion on both sides and each insertion
+# by one deletion on one side. A query probes its own deletions in a sorted
+# key array and only the codes found are measured exactly.
+#
+# A BK-tree was the first choice, but code distances only span 0-8, so its
+# pruning leaves most of an 18,000-code nomenclature to be measured (around
+# half a second per lookup); the delete index answers in a few milliseconds.
+#
+# Descriptions ("cotton jeans") are looked up in a trigram index over the
+# master descriptions (see search_index).
+
+# Typed codes further than this from every listed code get no suggestion
+MAX_CODE_DISTANCE = 2
+
+# Confidence of a description match by how it matched
+DESCRIPTION_CONFIDENCE = {EXACT: 1.0, FIELD_PREFIX: 0.9, WORD_PREFIXES: 0.75}
+SUBSTRING_CONFIDENCE = 0.6
+
+def edit_distance(a, b):
+    """Damerau-Levenshtein distance: insertions, deletions, substitutions and adjacent transpositions"""
+    if a == b:
+        return 0
+    big = len(a) + len(b)
+    last_row = {}
+    # Row and column 0 of the table are the sentinel `big`, row and column 1 the empty-prefix costs
+    table = [[big] * (len(b) + 2) for _ in range(len(a) + 2)]
+    for i in range(len(a) + 1):
+        table[i + 1][1] = i
+    for j in range(len(b) + 1):
+        table[1][j + 1] = j
+    for i in range(1, len(a) + 1):
+        last_match = 0
+        for j in range(1, len(b) + 1):
+            k = last_row.get(b[j - 1], 0)
+            l = last_match
+            if a[i - 1] == b[j - 1]:
+                cost = 0
+                last_match = j
+            else:
+                cost = 1
+            table[i + 1][j + 1] = min(
+                table[i][j] + cost,
+                table[i + 1][j] + 1,
+                table[i][j + 1] + 1,
+                table[k][l] + (i - k - 1) + 1 + (j - l - 1)
+            )
+        last_row[a[i - 1]] = i
+    return table[len(a) + 1][len(b) + 1]
+
+def confidence(distance, query, code):
+    """Share of the longer code that did not need an edit (1.0 for an exact match)"""
+    return round(max(0.0, 1 - distance / max(len(query), len(code), 1)), 2)
+
+def deletes(word, max_deletes):
+    """Every string left after deleting up to max_deletes characters of word (including word itself)"""
+    variants = {word}
+    for count in range(1, min(max_deletes, len(word)) + 1):
+        for positions in combinations(range(len(word)), count):
+            variants.add("".join(ch for i, ch in enumerate(word) if i not in positions))
+    return variants
+
+def _digits_key(digits):
+    # The leading 1 keeps "062" and "62" apart
+    return int("1" + digits)
+
+class DeleteIndex:
+    """Symmetric-delete index over digit strings under edit_distance"""
+
+    def __init__(self, words, max_distance=MAX_CODE_DISTANCE):
+        self.words = list(words)
+        self.max_distance = max_distance
+        keys, owners = [], []
+        for index, word in enumerate(self.words):
+            for variant in deletes(word, max_distance):
+                keys.append(_digits_key(variant))
+                owners.append(index)
+        keys = np.array(keys, dtype=np.int64)
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._owners = np.array(owners, dtype=np.int32)[order]
+
+    def __len__(self):
+        return len(self.words)
+
+    def search(self, word, max_distance=None):
+        """Return [(distance, word)] for every stored word within max_distance edits, nearest first"""
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        longest = max((len(w) for w in self.words), default=0)
+        if not word.isdigit() or len(word) > longest + max_distance:
+            return []
+        probes = np.array([_digits_key(variant) for variant in deletes(word, max_distance)], dtype=np.int64)
+        lo = np.searchsorted(self._keys, probes, side="left")
+        hi = np.searchsorted(self._keys, probes, side="right")
+        candidates = set()
+        for start, stop in zip(lo.tolist(), hi.tolist()):
+            candidates.update(self._owners[start:stop].tolist())
+        found = []
+        for index in candidates:
+            distance = edit_distance(word, self.words[index])
+            if distance <= max_distance:
+                found.append((distance, self.words[index]))
+        found.sort()
+        return found
+
+class HsnLookup:
+    """Nearest-code and description lookup over the HSN master"""
+
+    def __init__(self, master):
+        self.master = master
+        self.codes = DeleteIndex(master.codes)
+        self.descriptions = NgramIndex()
+        self.descriptions.add_many(zip(master.codes, master.descriptions))
+
+    def _match(self, code, distance, query, match):
+        entry = self.master.get(code)
+        entry.update(distance=distance, confidence=confidence(distance, query, code), match=match)
+        return entry
+
+    def nearest_codes(self, text, limit=5, max_distance=MAX_CODE_DISTANCE):
+        """Return the master entries nearest to a typed code, with distance, confidence and match="code"
+
+        Codes of the typed length rank first among equally distant ones, so a
+        mistyped heading suggests headings before chapters or tariff items.
+        """
+        query = normalize_code(text)
+        if not query:
+            return []
+        found = self.codes.search(query, max_distance)
+        found.sort(key=lambda item: (item[0], abs(len(item[1]) - len(query)), item[1]))
+        return [self._match(code, distance, query, "code") for distance, code in found[:limit]]
+
+    def search_descriptions(self, text, limit=5):
+        """Return master entries whose description matches every word of text, with match="description" """
+        matches = []
+        for code, rank in self.descriptions.ranked(text, limit):
+            entry = self.master.get(code)
+            entry.update(distance=None, confidence=DESCRIPTION_CONFIDENCE.get(rank, SUBSTRING_CONFIDENCE),
+                         match="description")
+            matches.append(entry)
+        return matches
+
+    def lookup(self, text, limit=5):
+        """Return the best matches for a code or a description, best first
+
+        Input with digits is treated as a code (an exact match has distance 0
+        and confidence 1.0), anything else as description words.
+        """
+        if normalize_code(text):
+            return self.nearest_codes(text, limit)
+        return self.search_descriptions(text, limit)
+
+    def validate_codes(self, codes, max_distance=MAX_CODE_DISTANCE):
+        """Validate many typed codes at once; returns a DataFrame with one row per input code
+
+        Columns: HSN Code (as given), Status ("Valid", "Suggested" or "Not found"),
+        Suggested HSN, Suggested Description, Distance and Confidence. Each
+        distinct code is looked up once, so large files with repeated codes
+        cost little more than their distinct codes.
+        """
+        results = {}
+        for code in dict.fromkeys(codes):
+            text = "" if pd.isna(code) else str(code).strip()
+            if text.endswith(".0") and text[:-2].isdigit():
+                # Spreadsheet columns of codes are often read as floats
+                text = text[:-2]
+            nearest = self.nearest_codes(text, limit=1, max_distance=max_distance)
+            if nearest and nearest[0]["distance"] == 0:
+                status = "Valid"
+            elif nearest:
+                status = "Suggested"
+            else:
+                status = "Not found"
+            best = nearest[0] if nearest else {}
+            results[code] = (
+                status,
+                best.get("code"),
+                best.get("description"),
+                best.get("distance"),
+                best.get("confidence", 0.0)
+            )
+        rows = [results[code] for code in codes]
+        frame = pd.DataFrame(
+            rows, columns=["Status", "Suggested HSN", "Suggested Description", "Distance", "Confidence"]
+        )
+        frame.insert(0, "HSN Code", list(codes))
+        return frame
+
+_lookup = None
+_lookup_lock = threading.Lock()
+
+def get_hsn_lookup():
+    """Return the process-wide lookup over the HSN master"""
+    global _lookup
+    with _lookup_lock:
+        if _lookup is None:
+            _lookup = HsnLookup(get_hsn_master())
+    return _lookup
@@ -0,0 +1,283 @@
+import csv
+import os
+import threading
+from bisect import bisect_left
+import numpy as np
+from app_config import HSN_MASTER_PATH, cache_path
+
+# HSN nomenclature master held in an array-backed digit trie.
+#
+# Codes are 2 (chapter), 4 (heading), 6 (subheading) or 8 (tariff item)
+# digits, and every code is a prefix of the codes below it, so the hierarchy
+# is a trie over the digits 0-9. Nodes live in flat arrays: `child_nodes` has
+# one row of ten child node numbers per node (-1 for none) and `node_entry`
+# the master entry a node ends, if any. Entries are kept sorted by code, so
+# every node's descendants are one contiguous slice [node_lo, node_hi), and
+# each entry's parent and child entries are precomputed. Lookup, parent,
+# children and prefix queries walk at most eight nodes.
+#
+# The arrays are written to an .npz snapshot next to the other caches; later
+# processes load it instead of parsing the master file, and rebuild it when
+# the file's size or modification time changes.
+
+SNAPSHOT_VERSION = 1
+
+LEVELS = {2: "Chapter", 4: "Heading", 6: "Subheading", 8: "Tariff item"}
+
+# Sections group whole chapters and are not part of the digit hierarchy:
+# (section, first chapter, last chapter, title)
+SECTIONS = [
+    ("I", 1, 5, "Live animals; animal products"),
+    ("II", 6, 14, "Vegetable products"),
+    ("III", 15, 15, "Animal, vegetable or microbial fats and oils"),
+    ("IV", 16, 24, "Prepared foodstuffs; beverages, spirits and vinegar; tobacco"),
+    ("V", 25, 27, "Mineral products"),
+    ("VI", 28, 38, "Products of the chemical or allied industries"),
+    ("VII", 39, 40, "Plastics and rubber and articles thereof"),
+    ("VIII", 41, 43, "Raw hides and skins, leather, furskins; travel goods, handbags"),
+    ("IX", 44, 46, "Wood and articles of wood; cork; basketware"),
+    ("X", 47, 49, "Pulp of wood; paper and paperboard and articles thereof"),
+    ("XI", 50, 63, "Textiles and textile articles"),
+    ("XII", 64, 67, "Footwear, headgear, umbrellas; artificial flowers"),
+    ("XIII", 68, 70, "Articles of stone, plaster, cement; ceramic products; glass"),
+    ("XIV", 71, 71, "Pearls, precious stones and metals; imitation jewellery; coin"),
+    ("XV", 72, 83, "Base metals and articles of base metal"),
+    ("XVI", 84, 85, "Machinery and mechanical appliances; electrical equipment"),
+    ("XVII", 86, 89, "Vehicles, aircraft, vessels and transport equipment"),
+    ("XVIII", 90, 92, "Optical, measuring and medical instruments; clocks and watches; musical instruments"),
+    ("XIX", 93, 93, "Arms and ammunition"),
+    ("XX", 94, 96, "Miscellaneous manufactured articles"),
+    ("XXI", 97, 97, "Works of art, collectors' pieces and antiques"),
+    ("XXII", 98, 98, "Special classification provisions"),
+]
+
+def normalize_code(text):
+    """Return the digits of an HSN code as typed ("6203.42", "6203 42 90" -> "620342...")"""
+    return "".join(ch for ch in str(text) if ch.isdigit())
+
+def section_of(code):
+    """Return (section, title) of the section containing a code's chapter, or None"""
+    code = normalize_code(code)
+    if len(code) < 2:
+        return None
+    chapter = int(code[:2])
+    for section, first, last, title in SECTIONS:
+        if first <= chapter <= last:
+            return section, title
+    return None
+
+def read_master(path=HSN_MASTER_PATH):
+    """Read (code, description, GST rate or None) rows from a master CSV"""
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = []
+        for row in csv.DictReader(f):
+            code = normalize_code(row["code"])
+            if len(code) not in LEVELS:
+                raise ValueError(f"{path}: HSN code {row['code']!r} is not 2, 4, 6 or 8 digits")
+            rate = row.get("gst_rate", "").strip()
+            rows.append((code, row["description"].strip(), float(rate) if rate else None))
+    return rows
+
+class HsnTrie:
+    """Array-backed trie over the HSN nomenclature"""
+
+    def __init__(self, arrays):
+        self.child_nodes = arrays["child_nodes"]
+        self.node_entry = arrays["node_entry"]
+        self.node_lo = arrays["node_lo"]
+        self.node_hi = arrays["node_hi"]
+        self.parents = arrays["parents"]
+        self.rates = arrays["rates"]
+        self.child_order = arrays["child_order"]
+        self.child_parents = arrays["parents"][arrays["child_order"]]
+        self.codes = arrays["codes"].tolist()
+        self.descriptions = bytes(arrays["descriptions"]).decode("utf-8").split("\n")
+        self._arrays = arrays
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build the trie from (code, description, GST rate or None) rows"""
+        rows = sorted({code: (code, description, rate) for code, description, rate in rows}.values())
+        codes = [row[0] for row in rows]
+        children = [[-1] * 10]
+        node_entry = [-1]
+        node_prefix = [""]
+        parents = []
+        rates = []
+        for index, (code, _, rate) in enumerate(rows):
+            node, parent = 0, -1
+            for depth, digit in enumerate(code):
+                if node_entry[node] >= 0:
+                    parent = node_entry[node]
+                child = children[node][int(digit)]
+                if child < 0:
+                    child = len(children)
+                    children.append([-1] * 10)
+                    node_entry.append(-1)
+                    node_prefix.append(code[:depth + 1])
+                    children[node][int(digit)] = child
+                node = child
+            node_entry[node] = index
+            parents.append(parent)
+            # Rows are sorted, so a parent's (inherited) rate is already known
+            rates.append(rate if rate is not None else (rates[parent] if parent >= 0 else np.nan))
+        parents = np.array(parents, dtype=np.int32)
+        return cls({
+            "child_nodes": np.array(children, dtype=np.int32),
+            "node_entry": np.array(node_entry, dtype=np.int32),
+            "node_lo": np.array([bisect_left(codes, p) for p in node_prefix], dtype=np.int32),
+            # ":" sorts right after "9", so prefix + ":" bounds every code with the prefix
+            "node_hi": np.array([bisect_left(codes, p + ":") for p in node_prefix], dtype=np.int32),
+            "parents": parents,
+            "rates": np.array(rates, dtype=np.float32),
+            "child_order": np.argsort(parents, kind="stable").astype(np.int32),
+            "codes": np.array(codes, dtype="<U8"),
+            "descriptions": np.frombuffer("\n".join(row[1] for row in rows).encode("utf-8"), dtype=np.uint8)
+        })
+
+    @classmethod
+    def load_snapshot(cls, path, source=None):
+        """Load a snapshot written by save_snapshot; None if missing, stale or from another version"""
+        try:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in data.files}
+        except (OSError, ValueError):
+            return None
+        if int(arrays.pop("version", -1)) != SNAPSHOT_VERSION or str(arrays.pop("source", "")) != (source or ""):
+            return None
+        return cls(arrays)
+
+    def save_snapshot(self, path, source=None):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, version=SNAPSHOT_VERSION, source=source or "", **self._arrays)
+        os.replace(tmp_path, path)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return self.index(code) is not None
+
+    def _node(self, code):
+        node = 0
+        for digit in code:
+            if not digit.isdigit():
+                return -1
+            node = self.child_nodes[node, int(digit)]
+            if node < 0:
+                return -1
+        return node
+
+    def index(self, code):
+        """Return the entry index of an exact code, or None"""
+        node = self._node(normalize_code(code))
+        if node <= 0 or self.node_entry[node] < 0:
+            return None
+        return int(self.node_entry[node])
+
+    def entry(self, index):
+        """Return an entry as a dict: code, description, level, GST rate (inherited if not set)"""
+        code = self.codes[index]
+        rate = float(self.rates[index])
+        return {
+            "code": code,
+            "description": self.descriptions[index],
+            "level": LEVELS[len(code)],
+            "gst_rate": None if np.isnan(rate) else rate
+        }
+
+    def get(self, code):
+        """Return the entry of an exact code, or None"""
+        index = self.index(code)
+        return self.entry(index) if index is not None else None
+
+    def longest_prefix(self, code):
+        """Return the most specific entry whose code is a prefix of code, or None
+
+        For a code more detailed than the master ("62034299" when only 620342
+        is listed) this is the entry it falls under.
+        """
+        node, found = 0, None
+        for digit in normalize_code(code):
+            node = self.child_nodes[node, int(digit)]
+            if node < 0:
+                break
+            if self.node_entry[node] >= 0:
+                found = int(self.node_entry[node])
+        return self.entry(found) if found is not None else None
+
+    def parent(self, code):
+        """Return the entry directly above a code, or None for chapters and unknown codes"""
+        index = self.index(code)
+        if index is None or self.parents[index] < 0:
+            return None
+        return self.entry(int(self.parents[index]))
+
+    def path(self, code):
+        """Return the entries from the chapter down to the code itself"""
+        index = self.index(code)
+        path = []
+        while index is not None and index >= 0:
+            path.append(self.entry(index))
+            index = int(self.parents[index])
+        return path[::-1]
+
+    def children(self, code=None):
+        """Return the entries one level below a code (the chapters when code is None)"""
+        if code is None:
+            parent = -1
+        else:
+            parent = self.index(code)
+            if parent is None:
+                return []
+        lo = np.searchsorted(self.child_parents, parent, side="left")
+        hi = np.searchsorted(self.child_parents, parent, side="right")
+        return [self.entry(int(i)) for i in self.child_order[lo:hi]]
+
+    def with_prefix(self, prefix, level=None):
+        """Return every entry whose code starts with prefix, in code order
+
+        level ("Heading", ...) keeps only entries of that level.
+        """
+        prefix = normalize_code(prefix)
+        node = self._node(prefix)
+        if node < 0:
+            return []
+        entries = (self.entry(i) for i in range(self.node_lo[node], self.node_hi[node]))
+        return [e for e in entries if level is None or e["level"] == level]
+
+    def chapters(self):
+        return self.children()
+
+    def sections(self):
+        """Return [(section, title, [chapter entries])] for the sections that have chapters"""
+        chapters = self.chapters()
+        grouped = []
+        for section, first, last, title in SECTIONS:
+            members = [c for c in chapters if first <= int(c["code"]) <= last]
+            if members:
+                grouped.append((section, title, members))
+        return grouped
+
+def load_hsn_master(path=HSN_MASTER_PATH, snapshot_path=None):
+    """Return the trie of a master file, from its snapshot when it is up to date"""
+    stat = os.stat(path)
+    source = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    snapshot_path = snapshot_path or cache_path("hsn_master.npz")
+    trie = HsnTrie.load_snapshot(snapshot_path, source)
+    if trie is None:
+        trie = HsnTrie.from_rows(read_master(path))
+        trie.save_snapshot(snapshot_path, source)
+    return trie
+
+_master = None
+_master_lock = threading.Lock()
+
+def get_hsn_master():
+    """Return the process-wide HSN master"""
+    global _master
+    with _master_lock:
+        if _master is None:
+            _master = load_hsn_master()
+    return _master
@@ -5,6 +5,12 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import random
+from figure_encoding import render_chart
+from lazy_tabs import lazy_tabs
+from hsn_classifier import get_hsn_classifier
+from hsn_lookup import get_hsn_lookup
+from hsn_master import get_hsn_master, normalize_code, section_of
+from transaction_store import SORT_COLUMNS, TRANSACTION_TYPES, get_transaction_store
 
 def show_hsn_transaction_system():
     """
@@ -27,27 +33,27 @@ def show_hsn_transaction_system():
     )
     
     # Setup tabs for different sections
-    tabs = st.tabs([
+    tabs = lazy_tabs([
         "📊 Dashboard", 
         "🧾 HSN Transactions", 
         "📈 Trend Analysis", 
         "🏆 Leaderboards"
-    ])
+    ], key="hsn_section_tab")
     
     # Tab 1: Main Dashboard
-    with tabs[0]:
+    if tabs[0]:
         show_dashboard()
     
     # Tab 2: HSN Transaction Management
-    with tabs[1]:
+    if tabs[1]:
         show_hsn_transactions()
     
     # Tab 3: Trend Analysis
-    with tabs[2]:
+    if tabs[2]:
         show_trend_analysis()
     
     # Tab 4: Gamified Leaderboards
-    with tabs[3]:
+    if tabs[3]:
         show_gamified_leaderboard()
 
 def show_dashboard():
@@ -58,10 +64,11 @@ def show_dashboard():
     # Key performance metrics
     col1, col2, col3, col4 = st.columns(4)
     
-    # Generate some sample metrics
-    today = datetime.now().strftime("%d %b %Y")
-    transactions_today = random.randint(120, 180)
-    transactions_yesterday = random.randint(100, 160)
+    # Transaction counts come from the store; the other KPIs are still sample metrics
+    store = get_transaction_store()
+    today = datetime.now().date()
+    transactions_today = store.count(start=today, end=today)
+    transactions_yesterday = store.count(start=today - timedelta(days=1), end=today - timedelta(days=1))
     transaction_diff = transactions_today - transactions_yesterday
     
     with col1:
@@ -114,8 +121,8 @@ def show_dashboard():
     with col1:
         st.subheader("Recent HSN Transactions")
         
-        # Generate sample transaction data
-        transactions = generate_sample_transactions(10)
+        # Newest transactions from the store
+        transactions = store.query(limit=10)
         
         # Display recent transactions in a table
         st.dataframe(
@@ -151,12 +158,13 @@ def show_dashboard():
         fig.update_traces(textposition='inside', textinfo='percent+label')
         fig.update_layout(height=250, margin=dict(t=30, b=0, l=0, r=0))
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
         
         # Inventory movement summary
+        movements = store.summary("Transaction Type", start=today, end=today)
         inv_move_data = {
-            "Direction": ["Inward", "Outward", "Transfer", "Return"],
-            "Count": [45, 38, 12, 5]
+            "Direction": TRANSACTION_TYPES,
+            "Count": [movements.get(direction, (0, 0))[0] for direction in TRANSACTION_TYPES]
         }
         
         fig = px.bar(
@@ -175,7 +183,7 @@ def show_dashboard():
         
         fig.update_layout(height=250, margin=dict(t=30, b=0, l=0, r=0))
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
     
     # Lower dashboard section
     st.subheader("HSN Code Distribution")
@@ -196,7 +204,7 @@ def show_dashboard():
     
     fig.update_layout(height=500, margin=dict(t=30, b=0, l=0, r=0))
     
-    st.plotly_chart(fig, use_container_width=True)
+    render_chart(fig, use_container_width=True)
     
     # Notifications and alerts section
     st.subheader("Alerts & Notifications")
@@ -242,15 +250,15 @@ def show_hsn_transactions():
     st.subheader("HSN Transaction Management")
     
     # Create tabs for different transaction operations
-    transaction_tabs = st.tabs([
+    transaction_tabs = lazy_tabs([
         "View Transactions", 
         "Create Transaction", 
         "HSN Code Lookup", 
         "Bulk Operations"
-    ])
+    ], key="hsn_transaction_tab")
     
     # Tab 1: View and Filter Transactions
-    with transaction_tabs[0]:
+    if transaction_tabs[0]:
         st.subheader("Transaction Records")
         
         # Filter controls
@@ -278,22 +286,34 @@ def show_hsn_transactions():
             
             search_term = st.text_input("Search Transactions", placeholder="Enter transaction ID, HSN code, or product")
         
-        # Generate filtered transaction data
-        transactions = generate_sample_transactions(30)
+        # Filtering, sorting and paging run in the transaction store; only the visible page is loaded
+        store = get_transaction_store()
+        filters = transaction_filters(
+            date_filter, chapter_filter, type_filter, status_filter, search_term,
+            custom_range=(start_date, end_date) if date_filter == "Custom Range" else None
+        )
+        total = store.count(**filters)
         
-        # Apply filters (simplified for demo)
-        if search_term:
-            transactions = transactions[
-                transactions["Transaction ID"].str.contains(search_term, case=False) |
-                transactions["HSN Code"].astype(str).str.contains(search_term, case=False) |
-                transactions["Product Category"].str.contains(search_term, case=False)
-            ]
+        col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
         
-        if status_filter != "All Statuses":
-            transactions = transactions[transactions["Status"] == status_filter]
-            
-        if type_filter != "All Types":
-            transactions = transactions[transactions["Transaction Type"] == type_filter]
+        with col1:
+            sort_by = st.selectbox("Sort By", list(SORT_COLUMNS))
+        
+        with col2:
+            descending = st.checkbox("Descending", value=True)
+        
+        with col3:
+            page_size = st.selectbox("Rows per Page", [25, 50, 100, 250], index=1)
+        
+        pages = max(1, -(-total // page_size))
+        with col4:
+            page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1)
+        
+        transactions = store.query(
+            sort=sort_by, descending=descending, offset=(page - 1) * page_size, limit=page_size, **filters
+        )
+        
+        st.caption(f"{total:,} matching transactions · page {page:,} of {pages:,}")
         
         # Transaction view
         st.dataframe(
@@ -318,7 +338,7 @@ def show_hsn_transactions():
             st.button("✏️ Edit Selected", use_container_width=True)
     
     # Tab 2: Create New Transaction
-    with transaction_tabs[1]:
+    if transaction_tabs[1]:
         st.subheader("Create New HSN Transaction")
         
         # Use columns for form layout
@@ -461,11 +481,23 @@ def show_hsn_transactions():
         # Complete transaction button
         st.divider()
         if st.button("Submit Transaction", type="primary"):
-            st.success("Transaction created successfully!")
-            st.info("Transaction ID: TRX-" + datetime.now().strftime("%Y%m%d") + "-" + str(random.randint(1000, 9999)))
+            if manual_hsn and manual_hsn not in get_hsn_master():
+                st.error(f"HSN Code {manual_hsn} is not in the HSN master. Check the code before submitting.")
+            else:
+                if manual_product and manual_hsn:
+                    # Record the manually entered item in the transaction store
+                    location = (source_location if transaction_type == "Transfer" else warehouse).split()[0]
+                    transaction_id = get_transaction_store().add(
+                        transaction_date, normalize_code(manual_hsn), manual_product, manual_quantity,
+                        transaction_type, "Pending", location, 0.0
+                    )
+                else:
+                    transaction_id = "TRX-" + datetime.now().strftime("%Y%m%d") + "-" + str(random.randint(1000, 9999))
+                st.success("Transaction created successfully!")
+                st.info("Transaction ID: " + transaction_id)
     
     # Tab 3: HSN Code Lookup
-    with transaction_tabs[2]:
+    if transaction_tabs[2]:
         st.subheader("HSN Code Lookup & Verification")
         
         # HSN search interface
@@ -479,40 +511,61 @@ def show_hsn_transactions():
             )
             
             if hsn_search_option == "HSN Code":
-                hsn_query = st.text_input("Enter HSN Code", placeholder="e.g., 6203")
+                hsn_query = st.text_input("Enter HSN Code", placeholder="e.g., 6203 or cotton trousers")
                 search_button = st.button("Lookup HSN Details")
                 
                 if hsn_query:
-                    st.success(f"HSN Code: {hsn_query}")
-                    
-                    # Display HSN details
-                    hsn_details = {
-                        "Code": hsn_query,
-                        "Description": "Men's or boys' suits, ensembles, jackets, blazers, trousers, bib and brace overalls, breeches and shorts (other than swimwear)",
-                        "Chapter": "Chapter 62 - Articles of apparel and clothing accessories, not knitted or crocheted",
-                        "Section": "Section XI - Textiles and textile articles",
-                        "GST Rate": "12%",
-                        "Commonly Used For": "Men's trousers, jeans, formal pants, shorts"
-                    }
+                    # Nearest listed codes (typos and transposed digits included) or description matches
+                    matches = get_hsn_lookup().lookup(hsn_query)
                     
-                    for key, value in hsn_details.items():
-                        st.text(f"{key}: {value}")
+                    if matches and matches[0]["distance"] == 0:
+                        hsn_code = matches[0]["code"]
+                        st.success(f"HSN Code: {hsn_code}")
+                        show_hsn_details(hsn_code)
+                    elif matches:
+                        hsn_code = matches[0]["code"]
+                        if matches[0]["match"] == "code":
+                            st.warning(f"HSN Code {normalize_code(hsn_query)} is not in the HSN master. Did you mean {hsn_code}?")
+                        else:
+                            st.success(f"Found {len(matches)} HSN codes matching '{hsn_query}'")
+                        st.dataframe(pd.DataFrame({
+                            "HSN": [m["code"] for m in matches],
+                            "Description": [m["description"] for m in matches],
+                            "Level": [m["level"] for m in matches],
+                            "Edits": [m["distance"] for m in matches],
+                            "Confidence": [f"{m['confidence']:.0%}" for m in matches]
+                        }), use_container_width=True, hide_index=True)
+                    else:
+                        hsn_code = None
+                        st.error(f"No HSN code close to '{hsn_query}' in the HSN master")
                     
-                    # Show recent transactions with this HSN code
-                    st.subheader("Recent Transactions")
-                    transactions = generate_sample_transactions(5, hsn_code=hsn_query)
-                    st.dataframe(transactions, use_container_width=True, hide_index=True)
+                    if hsn_code:
+                        # Show recent transactions with this HSN code
+                        st.subheader("Recent Transactions")
+                        store = get_transaction_store()
+                        prefix = store.stored_prefix(hsn_code)
+                        if prefix is None:
+                            st.info(f"No transactions recorded under HSN {hsn_code[:4]}")
+                        else:
+                            if prefix != hsn_code:
+                                st.caption(f"Transactions booked under HSN {prefix}")
+                            transactions = store.query(search=prefix, limit=5)
+                            st.dataframe(transactions, use_container_width=True, hide_index=True)
             
             elif hsn_search_option == "Product Description":
                 product_query = st.text_input("Enter Product Description", placeholder="e.g., men's jeans")
                 search_button = st.button("Find Matching HSN Codes")
                 
                 if product_query:
-                    # Display matching HSN codes
+                    # Display matching HSN codes, ranked by the description classifier
                     matching_hsn_codes = [
-                        {"HSN": "6203", "Description": "Men's or boys' trousers, jeans, and shorts", "Certainty": "High", "GST": "12%"},
-                        {"HSN": "6103", "Description": "Men's or boys' trousers, knitted or crocheted", "Certainty": "Medium", "GST": "12%"},
-                        {"HSN": "5209", "Description": "Woven fabrics of cotton (denim)", "Certainty": "Low", "GST": "5%"}
+                        {
+                            "HSN": match["code"],
+                            "Description": match["description"],
+                            "Certainty": match["certainty"],
+                            "GST": f"{match['gst_rate']:g}%" if match["gst_rate"] is not None else "n/a"
+                        }
+                        for match in get_hsn_classifier().classify(product_query, k=3)
                     ]
                     
                     st.success(f"Found {len(matching_hsn_codes)} potential matches for '{product_query}'")
@@ -538,64 +591,37 @@ def show_hsn_transactions():
                         """, unsafe_allow_html=True)
             
             else:  # Browse Hierarchy
+                master = get_hsn_master()
+                sections = master.sections()
                 col1, col2, col3 = st.columns(3)
                 
                 with col1:
-                    sections = [
-                        "Section I - Animal products",
-                        "Section VIII - Raw hides, leather, furskins",
-                        "Section XI - Textiles and textile articles",
-                        "Section XII - Footwear, headgear, umbrellas",
-                        "Section XX - Miscellaneous manufactured articles"
-                    ]
-                    selected_section = st.selectbox("Select Section", sections)
+                    section_index = st.selectbox(
+                        "Select Section",
+                        range(len(sections)),
+                        format_func=lambda i: f"Section {sections[i][0]} - {sections[i][1]}"
+                    )
+                    chapters = sections[section_index][2]
                 
                 with col2:
-                    if "Section XI" in selected_section:
-                        chapters = [
-                            "Chapter 50 - Silk",
-                            "Chapter 52 - Cotton",
-                            "Chapter 61 - Knitted or crocheted apparel",
-                            "Chapter 62 - Non-knitted apparel",
-                            "Chapter 63 - Other textile articles"
-                        ]
-                    else:
-                        chapters = ["Select a section first"]
-                    
-                    selected_chapter = st.selectbox("Select Chapter", chapters)
+                    selected_chapter = st.selectbox(
+                        "Select Chapter",
+                        chapters,
+                        format_func=lambda entry: f"Chapter {entry['code']} - {entry['description']}"
+                    )
                 
                 with col3:
-                    if "Chapter 61" in selected_chapter:
-                        codes = [
-                            "6101 - Men's overcoats, knitted",
-                            "6102 - Women's overcoats, knitted",
-                            "6103 - Men's suits, knitted",
-                            "6104 - Women's suits, knitted",
-                            "6109 - T-shirts, knitted"
-                        ]
-                    elif "Chapter 62" in selected_chapter:
-                        codes = [
-                            "6201 - Men's overcoats, not knitted",
-                            "6202 - Women's overcoats, not knitted",
-                            "6203 - Men's suits, not knitted",
-                            "6204 - Women's suits, not knitted",
-                            "6205 - Men's shirts, not knitted"
-                        ]
-                    else:
-                        codes = ["Select a chapter first"]
-                    
-                    selected_code = st.selectbox("Select HSN Code", codes)
+                    # Every heading, subheading and tariff item of the chapter, in code order
+                    codes = master.with_prefix(selected_chapter["code"])[1:]
+                    selected_code = st.selectbox(
+                        "Select HSN Code",
+                        codes,
+                        format_func=lambda entry: f"{entry['code']} - {entry['description']}"
+                    )
                 
-                if "61" in selected_chapter or "62" in selected_chapter:
-                    if st.button("View HSN Details"):
-                        hsn_code = selected_code.split(" - ")[0]
-                        st.success(f"HSN Code: {hsn_code}")
-                        
-                        # Display HSN details
-                        st.text(f"Description: {selected_code.split(' - ')[1]}")
-                        st.text(f"Chapter: {selected_chapter}")
-                        st.text(f"Section: {selected_section}")
-                        st.text("GST Rate: 12%")
+                if selected_code and st.button("View HSN Details"):
+                    st.success(f"HSN Code: {selected_code['code']}")
+                    show_hsn_details(selected_code["code"])
         
         with col2:
             st.markdown("""
@@ -610,26 +636,21 @@ def show_hsn_transactions():
             </div>
             """, unsafe_allow_html=True)
             
-            st.markdown("""
+            # Latest distinct codes in the transaction store, described from the HSN master
+            recent_codes = get_transaction_store().query(limit=50)["HSN Code"].drop_duplicates().head(4)
+            recent_rows = ""
+            for code in recent_codes:
+                entry = get_hsn_master().longest_prefix(code)
+                recent_rows += f"""
+                    <tr>
+                        <td><strong>{code}</strong></td>
+                        <td>{entry['description'] if entry else 'Not in HSN master'}</td>
+                    </tr>"""
+            
+            st.markdown(f"""
             <div style='background-color: #e8f5e9; padding: 15px; border-radius: 5px; margin-top: 15px;'>
                 <h4 style='margin-top: 0;'>Recently Used HSN Codes</h4>
-                <table style='width: 100%;'>
-                    <tr>
-                        <td><strong>6109</strong></td>
-                        <td>T-shirts, knitted</td>
-                    </tr>
-                    <tr>
-                        <td><strong>6203</strong></td>
-                        <td>Men's suits, not knitted</td>
-                    </tr>
-                    <tr>
-                        <td><strong>6110</strong></td>
-                        <td>Sweaters, pullovers</td>
-                    </tr>
-                    <tr>
-                        <td><strong>6104</strong></td>
-                        <td>Women's suits, knitted</td>
-                    </tr>
+                <table style='width: 100%;'>{recent_rows}
                 </table>
             </div>
             """, unsafe_allow_html=True)
@@ -647,7 +668,7 @@ def show_hsn_transactions():
             """, unsafe_allow_html=True)
     
     # Tab 4: Bulk Operations
-    with transaction_tabs[3]:
+    if transaction_tabs[3]:
         st.subheader("Bulk Transaction Operations")
         
         # Options for bulk operations
@@ -740,17 +761,22 @@ def show_hsn_transactions():
                 horizontal=True
             )
             
+            validation = None
+            
             if validation_method == "Upload Product List":
                 uploaded_file = st.file_uploader("Upload Product List", type=["csv", "xlsx"])
+                st.caption("The file needs an HSN code column (e.g. \"HSN Code\") and may have a product column.")
                 
                 if uploaded_file:
-                    st.success("File uploaded successfully.")
-                    st.markdown("### Preview of Uploaded Data")
-                    st.dataframe(pd.DataFrame({
-                        "Product": ["Men's Jeans", "Women's Top", "Kids T-Shirt", "Formal Shirt", "Casual Shorts"],
-                        "Current HSN": ["6203", "6106", "6109", "6205", "6204"],
-                        "Status": ["Valid", "Valid", "Valid", "Needs Review", "Valid"]
-                    }))
+                    try:
+                        product_list = read_product_list(uploaded_file)
+                    except (ImportError, ValueError) as e:
+                        st.error(f"Could not read {uploaded_file.name}: {e}")
+                    else:
+                        st.success(f"File uploaded successfully. {len(product_list):,} products.")
+                        validation = hsn_validation_table(product_list["Product"], product_list["HSN"])
+                        st.markdown("### Preview of Uploaded Data")
+                        st.dataframe(validation.head(100), use_container_width=True, hide_index=True)
             else:
                 selected_category = st.selectbox(
                     "Select Product Category",
@@ -760,15 +786,24 @@ def show_hsn_transactions():
                 if selected_category:
                     st.success(f"Selected category: {selected_category}")
                     st.markdown("### Products in Selected Category")
-                    st.dataframe(pd.DataFrame({
-                        "Product": ["Men's Jeans", "Formal Trousers", "Casual Shirts", "Formal Shirts", "T-Shirts"],
-                        "Current HSN": ["6203", "6203", "6205", "6205", "6109"],
-                        "Status": ["Valid", "Valid", "Valid", "Valid", "Valid"]
-                    }), use_container_width=True)
+                    validation = hsn_validation_table(
+                        ["Men's Jeans", "Formal Trousers", "Casual Shirts", "Formal Shirts", "T-Shirts"],
+                        ["6203", "6203", "6205", "6205", "6109"]
+                    )
+                    st.dataframe(validation, use_container_width=True, hide_index=True)
             
             if st.button("Run HSN Validation"):
-                st.success("Validation completed. 1 item needs review.")
-                st.info("Download the validation report for details.")
+                if validation is None:
+                    st.warning("Upload a product list or select a category first.")
+                else:
+                    needs_review = int((validation["Status"] != "Valid").sum())
+                    st.success(f"Validation completed. {needs_review:,} of {len(validation):,} items need review.")
+                    st.download_button(
+                        "Download Validation Report",
+                        data=validation.to_csv(index=False),
+                        file_name="hsn_validation_report.csv",
+                        mime="text/csv"
+                    )
 
 def show_trend_analysis():
     """Display the real-time trend analysis interface"""
@@ -880,7 +915,7 @@ def show_trend_analysis():
             )
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
         
         # Transaction metrics
         metric_cols = st.columns(4)
@@ -945,15 +980,15 @@ def show_trend_analysis():
             )
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
         
         # HSN code breakdown for the latest period
         st.subheader("HSN Code Breakdown (Latest Period)")
         
         latest_data = pd.DataFrame({
             'HSN Code': ['6109', '6203', '6204', '6110', '6205', '4202', '6403', '6104', '6206', '6201'],
-            'Description': ['T-shirts', 'Men's trousers', 'Women's suits', 'Sweaters', 'Men's shirts', 
-                           'Handbags', 'Footwear', 'Women's suits (knitted)', 'Women's blouses', 'Men's coats'],
+            'Description': ['T-shirts', "Men's trousers", "Women's suits", 'Sweaters', "Men's shirts", 
+                           'Handbags', 'Footwear', "Women's suits (knitted)", "Women's blouses", "Men's coats"],
             'Transactions': [152, 143, 128, 87, 76, 68, 54, 47, 42, 38],
             'Growth': [12.3, 8.7, 15.2, -3.5, 5.6, 22.1, 4.8, -2.3, 6.7, 1.2]
         })
@@ -976,7 +1011,7 @@ def show_trend_analysis():
             coloraxis_colorbar=dict(title='Growth %')
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
     
     elif analysis_type == "Compliance Analysis":
         # Generate compliance data
@@ -1046,7 +1081,7 @@ def show_trend_analysis():
             )
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
         
         # Common compliance issues
         st.subheader("Common Compliance Issues")
@@ -1082,7 +1117,7 @@ def show_trend_analysis():
             height=400
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
     
     else:  # Organic Trends
         st.subheader("Organic Trend Analysis")
@@ -1132,7 +1167,7 @@ def show_trend_analysis():
                 height=500
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
             
             # Generate insights based on depth
             if insight_depth >= 3:
@@ -1228,7 +1263,7 @@ def show_trend_analysis():
             fig.update_yaxes(title_text="Transactions / Staff", secondary_y=False)
             fig.update_yaxes(title_text="Error Rate (%)", secondary_y=True)
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
             
             # Add insights based on depth
             if insight_depth >= 2:
@@ -1368,7 +1403,7 @@ def show_trend_analysis():
             fig.update_yaxes(title_text="Transaction Volume / HSN Changes", secondary_y=False)
             fig.update_yaxes(title_text="Error Rate (%)", secondary_y=True)
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
             
             # Add seasonal insights
             st.subheader("Seasonal Pattern Recognition")
@@ -1403,15 +1438,15 @@ def show_gamified_leaderboard():
     st.subheader("Inventory Management Leaderboards")
     
     # Create tabs for different leaderboard categories
-    leaderboard_tabs = st.tabs([
+    leaderboard_tabs = lazy_tabs([
         "Team Performance", 
         "Individual Rankings", 
         "HSN Accuracy", 
         "Achievements"
-    ])
+    ], key="hsn_leaderboard_tab")
     
     # Tab 1: Team Performance
-    with leaderboard_tabs[0]:
+    if leaderboard_tabs[0]:
         st.subheader("Team Performance Leaderboard")
         
         # Time period filter
@@ -1478,7 +1513,7 @@ def show_gamified_leaderboard():
             height=500
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
         
         # Team performance details
         st.subheader("Team Performance Details")
@@ -1570,10 +1605,10 @@ def show_gamified_leaderboard():
                 height=350
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
     
     # Tab 2: Individual Rankings
-    with leaderboard_tabs[1]:
+    if leaderboard_tabs[1]:
         st.subheader("Individual Performance Rankings")
         
         # Filters for individual rankings
@@ -1654,7 +1689,7 @@ def show_gamified_leaderboard():
             height=400
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
         
         # Individual badges and achievements
         st.subheader("Individual Achievements & Badges")
@@ -1765,7 +1800,7 @@ def show_gamified_leaderboard():
             """, unsafe_allow_html=True)
     
     # Tab 3: HSN Accuracy
-    with leaderboard_tabs[2]:
+    if leaderboard_tabs[2]:
         st.subheader("HSN Accuracy Leaderboard")
         
         # Filter for HSN accuracy view
@@ -1839,7 +1874,7 @@ def show_gamified_leaderboard():
             height=400
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
         
         # Common error patterns
         st.subheader("Common HSN Classification Errors")
@@ -1874,7 +1909,7 @@ def show_gamified_leaderboard():
             
             improvement_data = pd.DataFrame({
                 'HSN Code': ['6109', '6204', '6403', '6110', '4202'],
-                'Description': ['T-shirts', 'Women's suits', 'Footwear', 'Sweaters', 'Handbags'],
+                'Description': ['T-shirts', "Women's suits", 'Footwear', 'Sweaters', 'Handbags'],
                 'Previous': [88.5, 90.2, 85.7, 92.1, 89.3],
                 'Current': [97.8, 95.6, 90.2, 96.0, 92.4],
                 'Improvement': [9.3, 5.4, 4.5, 3.9, 3.1]
@@ -1901,7 +1936,7 @@ def show_gamified_leaderboard():
                 height=300
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
         
         with col2:
             st.subheader("Training Impact on Accuracy")
@@ -1957,10 +1992,10 @@ def show_gamified_leaderboard():
                 )
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            render_chart(fig, use_container_width=True)
     
     # Tab 4: Achievements
-    with leaderboard_tabs[3]:
+    if leaderboard_tabs[3]:
         st.subheader("Achievements & Rewards")
         
         # Create a tabular view of available achievements
@@ -2074,120 +2109,116 @@ def show_gamified_leaderboard():
                     </div>
                     """, unsafe_allow_html=True)
 
-def generate_sample_transactions(count=10, hsn_code=None):
-    """Generate sample transaction data"""
-    
-    transaction_types = ["Inward", "Outward", "Transfer", "Return"]
-    status_options = ["Completed", "Pending", "Cancelled", "On Hold"]
-    hsn_codes = ["6109", "6203", "6204", "6110", "6205", "4202", "6403", "6104", "6206", "6201"]
-    product_categories = [
-        "T-shirts", "Men's trousers", "Women's suits", "Sweaters", "Men's shirts",
-        "Handbags", "Footwear", "Women's suits (knitted)", "Women's blouses", "Men's coats"
-    ]
+def transaction_filters(date_filter, chapter_filter, type_filter, status_filter, search_term, custom_range=None):
+    """Translate the View Transactions filter widgets into transaction store filters"""
     
-    # Create a mapping from HSN code to product category
-    hsn_to_product = dict(zip(hsn_codes, product_categories))
-    
-    # Generate random transactions
-    transactions = []
-    
-    for i in range(count):
-        # Use provided HSN code or random one
-        current_hsn = hsn_code if hsn_code else random.choice(hsn_codes)
-        current_product = hsn_to_product[current_hsn]
-        
-        transaction_id = f"TRX-{datetime.now().strftime('%Y%m%d')}-{random.randint(1000, 9999)}"
-        date = (datetime.now() - timedelta(days=random.randint(0, 30))).strftime("%Y-%m-%d")
-        transaction_type = random.choice(transaction_types)
-        quantity = random.randint(5, 50)
-        status = random.choices(status_options, weights=[0.7, 0.2, 0.05, 0.05])[0]
-        
-        transactions.append({
-            "Transaction ID": transaction_id,
-            "Date": date,
-            "HSN Code": current_hsn,
-            "Product Category": current_product,
-            "Quantity": quantity,
-            "Transaction Type": transaction_type,
-            "Status": status,
-            "Location": random.choice(["Mumbai", "Delhi", "Bangalore", "Chennai", "Hyderabad"]),
-            "Value": quantity * random.randint(500, 2000)
-        })
+    today = datetime.now().date()
+    date_ranges = {
+        "Today": (today, today),
+        "Yesterday": (today - timedelta(days=1), today - timedelta(days=1)),
+        "Last 7 Days": (today - timedelta(days=6), today),
+        "Last 30 Days": (today - timedelta(days=29), today)
+    }
+    start, end = custom_range if date_filter == "Custom Range" and custom_range else date_ranges.get(date_filter, (None, None))
     
-    return pd.DataFrame(transactions)
+    filters = {"start": start, "end": end, "search": search_term or None}
+    if chapter_filter != "All Chapters":
+        # "Chapter 50-59: Textile Fibers" -> chapters 50 to 59
+        first, last = chapter_filter.split(":")[0].replace("Chapter", "").strip().split("-")
+        filters["chapters"] = (int(first), int(last))
+    if type_filter != "All Types":
+        filters["transaction_type"] = type_filter
+    if status_filter != "All Statuses":
+        filters["status"] = status_filter
+    return filters
 
-def generate_hsn_distribution():
-    """Generate HSN distribution data for visualization"""
+def show_hsn_details(code):
+    """Show an HSN code's description, place in the hierarchy and GST rate from the HSN master"""
     
-    # Define HSN sections, chapters, and codes
-    sections = {
-        "Section XI": "Textiles and textile articles",
-        "Section VIII": "Raw hides, leather, furskins",
-        "Section XII": "Footwear, headgear, umbrellas"
-    }
+    master = get_hsn_master()
+    entry = master.get(code)
+    path = master.path(code)
+    section = section_of(code)
     
-    # Chapters within sections
-    chapters = {
-        "Section XI": {
-            "Chapter 61": "Knitted or crocheted apparel",
-            "Chapter 62": "Non-knitted apparel",
-            "Chapter 63": "Other textile articles"
-        },
-        "Section VIII": {
-            "Chapter 42": "Leather articles"
-        },
-        "Section XII": {
-            "Chapter 64": "Footwear"
-        }
-    }
+    st.text(f"Code: {entry['code']} ({entry['level']})")
+    st.text(f"Description: {entry['description']}")
+    for parent in path[:-1]:
+        st.text(f"{parent['level']}: {parent['code']} - {parent['description']}")
+    if section:
+        st.text(f"Section: Section {section[0]} - {section[1]}")
+    st.text(f"GST Rate: {entry['gst_rate']:g}%" if entry["gst_rate"] is not None else "GST Rate: not listed")
     
-    # HSN codes within chapters
-    hsn_codes = {
-        "Chapter 61": {
-            "6109": "T-shirts, knitted",
-            "6110": "Sweaters, pullovers",
-            "6104": "Women's suits, knitted"
-        },
-        "Chapter 62": {
-            "6203": "Men's suits, not knitted",
-            "6204": "Women's suits, not knitted",
-            "6205": "Men's shirts, not knitted"
-        },
-        "Chapter 63": {
-            "6302": "Bed linen, table linen",
-            "6305": "Sacks and bags"
-        },
-        "Chapter 42": {
-            "4202": "Trunks, suitcases, handbags"
-        },
-        "Chapter 64": {
-            "6403": "Footwear with leather uppers",
-            "6404": "Footwear with textile uppers"
-        }
-    }
+    sub_codes = master.children(code)
+    if sub_codes:
+        st.text(f"Sub-divisions: {', '.join(sub['code'] for sub in sub_codes)}")
+
+def hsn_validation_table(products, codes):
+    """Return a validation table for products and their current HSN codes
+    
+    Codes not in the HSN master get the nearest listed code as a suggestion
+    (see HsnLookup.validate_codes), and each product description is
+    classified to compare its code with the predicted one.
+    """
+    
+    validation = get_hsn_lookup().validate_codes(list(codes))
+    validation = validation.rename(columns={"HSN Code": "Current HSN"})
+    validation.insert(0, "Product", list(products))
+    
+    # Classify every product description in one batch and flag valid codes whose
+    # heading disagrees with a confident prediction
+    predictions = get_hsn_classifier().classify_many(validation["Product"])
+    validation = pd.concat([validation, predictions], axis=1)
+    disagrees = (
+        (validation["Status"] == "Valid")
+        & (validation["Certainty"] == "High")
+        & (validation["Suggested HSN"].str[:4] != validation["Predicted HSN"].str[:4])
+    )
+    validation.loc[disagrees, "Status"] = "Needs Review"
+    return validation
+
+def read_product_list(uploaded_file):
+    """Read an uploaded CSV or Excel product list into Product and HSN columns"""
+    
+    if uploaded_file.name.lower().endswith(".xlsx"):
+        frame = pd.read_excel(uploaded_file, dtype=str)
+    else:
+        frame = pd.read_csv(uploaded_file, dtype=str)
+    
+    hsn_columns = [c for c in frame.columns if "hsn" in str(c).lower()]
+    if not hsn_columns:
+        raise ValueError(f"no HSN code column found (columns: {', '.join(map(str, frame.columns))})")
+    product_columns = [c for c in frame.columns if any(w in str(c).lower() for w in ("product", "description", "item"))]
+    
+    return pd.DataFrame({
+        "Product": frame[product_columns[0]] if product_columns else "",
+        "HSN": frame[hsn_columns[0]]
+    })
+
+def generate_hsn_distribution():
+    """Generate HSN distribution data for visualization"""
+    
+    # Activity per code in the transaction store, placed in the hierarchy by the HSN master
+    master = get_hsn_master()
+    totals = get_transaction_store().summary("HSN Code")
     
     # Generate distribution data
     dist_data = []
     
-    for section, section_desc in sections.items():
-        for chapter in chapters.get(section, {}):
-            chapter_desc = chapters[section][chapter]
-            
-            for hsn_code in hsn_codes.get(chapter, {}):
-                hsn_desc = hsn_codes[chapter][hsn_code]
-                
-                # Generate random count and value
-                count = random.randint(20, 200)
-                value = count * random.randint(1000, 5000)
-                
-                dist_data.append({
-                    "HSN Section": section,
-                    "HSN Chapter": chapter,
-                    "HSN Code": hsn_code,
-                    "Description": hsn_desc,
-                    "Transaction Count": count,
-                    "Value": value
-                })
+    for hsn_code, (count, _, value) in sorted(totals.items()):
+        section = section_of(hsn_code)
+        chapter = master.get(hsn_code[:2])
+        entry = master.longest_prefix(hsn_code)
+        if section is None or chapter is None:
+            continue
+        
+        dist_data.append({
+            "HSN Section": f"Section {section[0]}",
+            "HSN Chapter": f"Chapter {chapter['code']}",
+            "HSN Code": hsn_code,
+            "Description": entry["description"],
+            "Transaction Count": count,
+            "Value": value
+        })
     
     return pd.DataFrame(dist_data)
 
@@ -0,0 +1,103 @@
+"""Report the import cost of app startup and of every page module
+
+Each module is imported in a fresh interpreter with `python -X importtime`,
+so nothing is shared between measurements. Costs are reported on top of
+Streamlit itself, which every run of the app imports anyway.
+
+Usage:
+    python import_report.py                      # table of every page
+    python import_report.py --top 8              # also list the heaviest packages per page
+    python import_report.py --budget vsr_landing=150 --budget startup=100
+                                                 # exit 1 if a budget (ms) is exceeded, for CI
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from page_registry import PAGES
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# What app.py imports before it routes to a page
+STARTUP_MODULES = ["page_registry", "session_memory"]
+BASELINE_MODULES = ["streamlit"]
+
+def import_times(modules, repeat=3):
+    """Return {module name: self import time in ms} for importing modules in a fresh interpreter
+
+    Each import is run `repeat` times and the fastest run is kept.
+    """
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "; ".join(f"import {m}" for m in modules)],
+            cwd=REPO_DIR,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{result.stderr.strip().splitlines()[-1]}")
+        times = {}
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            if not line.startswith("import time:") or "imported package" in line:
+                continue
+            self_us, _, name = line[len("import time:"):].split("|")
+            times[name.strip()] = int(self_us) / 1000
+        if best is None or sum(times.values()) < sum(best.values()):
+            best = times
+    return best
+
+def page_report(repeat=3):
+    """Return rows of (name, modules, extra ms, {top-level package: ms}) for startup and every page"""
+    baseline = import_times(BASELINE_MODULES, repeat)
+    targets = {"startup": STARTUP_MODULES}
+    for name, page in PAGES.items():
+        targets[name] = STARTUP_MODULES + [page["module"]]
+    rows = []
+    for name, modules in targets.items():
+        times = import_times(BASELINE_MODULES + modules, repeat)
+        packages = defaultdict(float)
+        for module, ms in times.items():
+            if module not in baseline:
+                packages[module.split(".")[0]] += ms
+        rows.append((name, modules[-1], sum(packages.values()), dict(packages)))
+    return rows
+
+def parse_budgets(values):
+    budgets = {}
+    for value in values:
+        name, _, ms = value.partition("=")
+        if name not in PAGES and name != "startup":
+            raise SystemExit(f"Unknown page in budget: {name!r}")
+        budgets[name] = float(ms)
+    return budgets
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", action="append", default=[], metavar="PAGE=MS",
+                        help="fail if the page (or 'startup') imports take longer than MS")
+    parser.add_argument("--top", type=int, default=0, help="list the N heaviest packages for each page")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the fastest is kept")
+    args = parser.parse_args()
+    budgets = parse_budgets(args.budget)
+
+    over_budget = []
+    print(f"{'Page':<24} {'Module':<28} {'Import (ms)':>12} {'Budget':>8}")
+    for name, module, total, packages in page_report(args.repeat):
+        budget = budgets.get(name)
+        flag = ""
+        if budget is not None and total > budget:
+            over_budget.append(name)
+            flag = "  OVER"
+        print(f"{name:<24} {module:<28} {total:>12.1f} {budget if budget is not None else '':>8}{flag}")
+        for package, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"{'':<26}{package:<28} {ms:>10.1f}")
+
+    if over_budget:
+        print(f"\nOver budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
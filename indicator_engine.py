@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+# Vectorized technical indicators over a price panel (dates x tickers).
+# Every indicator is computed for all tickers at once with NumPy, so comparing
+# 50 retailers costs about the same as comparing 5.
+
+def _window_sum(values, window):
+    """Rolling sum over the last `window` rows plus the count of non-NaN values in it"""
+    filled = np.where(np.isnan(values), 0.0, values)
+    sums = np.cumsum(filled, axis=0)
+    counts = np.cumsum(~np.isnan(values), axis=0)
+    sums[window:] = sums[window:] - sums[:-window]
+    counts[window:] = counts[window:] - counts[:-window]
+    return sums, counts
+
+def rolling_mean(values, window):
+    """Rolling mean per column; NaN until a full window of valid values is available"""
+    sums, counts = _window_sum(values, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts == window, sums / window, np.nan)
+
+def rolling_std(values, window):
+    """Rolling sample standard deviation per column (ddof=1, like pandas)"""
+    sums, counts = _window_sum(values, window)
+    squares, _ = _window_sum(values ** 2, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = (squares - sums ** 2 / window) / (window - 1)
+    return np.where(counts == window, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+def simple_returns(values):
+    """Period-over-period returns per column; the first row is NaN"""
+    returns = np.full_like(values, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns[1:] = values[1:] / values[:-1] - 1
+    return returns
+
+def rsi(values, window=14):
+    """Relative Strength Index per column, using simple rolling averages like visualization.calculate_rsi"""
+    delta = np.full_like(values, np.nan)
+    delta[1:] = values[1:] - values[:-1]
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    avg_gain = rolling_mean(gain, window)
+    avg_loss = rolling_mean(loss, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+def drawdown(values):
+    """Drawdown from the running peak per column (0 at a new high, negative below it)"""
+    peak = np.fmax.accumulate(values, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return values / peak - 1
+
+def compute_indicator_panels(prices, ma_windows=(20, 50, 200), rsi_window=14, vol_window=20, periods_per_year=252):
+    """Compute every indicator for a dates x tickers price panel
+
+    Returns a dict of indicator name -> dates x tickers DataFrame.
+    """
+    values = prices.to_numpy(dtype=float)
+    returns = simple_returns(values)
+    arrays = {"Close": values}
+    for window in ma_windows:
+        arrays[f"MA{window}"] = rolling_mean(values, window)
+    arrays["RSI"] = rsi(values, rsi_window)
+    arrays["Return"] = returns
+    arrays["Volatility"] = rolling_std(returns, vol_window) * np.sqrt(periods_per_year)
+    arrays["Drawdown"] = drawdown(values)
+    return {
+        name: pd.DataFrame(array, index=prices.index, columns=prices.columns)
+        for name, array in arrays.items()
+    }
+
+def compute_panel_indicators(prices, ma_windows=(20, 50, 200), rsi_window=14, vol_window=20, periods_per_year=252):
+    """Compute every indicator for a price panel as a tidy DataFrame
+
+    One row per (Date, Ticker) with a column per indicator, ready for
+    px.line(..., x="Date", y=<indicator>, color="Ticker").
+    """
+    panels = compute_indicator_panels(prices, ma_windows, rsi_window, vol_window, periods_per_year)
+    n_dates, n_tickers = prices.shape
+    tidy = pd.DataFrame({
+        "Date": np.repeat(prices.index.to_numpy(), n_tickers),
+        "Ticker": np.tile(prices.columns.to_numpy(), n_dates)
+    })
+    for name, panel in panels.items():
+        tidy[name] = panel.to_numpy().ravel()
+    return tidy
+
+def latest_indicators(prices, **kwargs):
+    """Return the most recent value of every indicator, one row per ticker"""
+    panels = compute_indicator_panels(prices, **kwargs)
+    return pd.DataFrame({
+        name: panel.ffill().iloc[-1] for name, panel in panels.items()
+    })
@@ -3,8 +3,13 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+import random
 import time
 from datetime import datetime, timedelta
+from search_index import NgramIndex
+
+# Item search index per source location, kept across reruns
+_item_indexes = {}
 
 def show_inventory_transfer():
     """Display the inventory transfer wizard interface"""
@@ -186,16 +191,17 @@ def show_item_selection():
     
     with col3:
         sort_options = ["Stock Level (High to Low)", "Stock Level (Low to High)", "SKU (A-Z)", "Product Name (A-Z)"]
+        if search_term:
+            sort_options = ["Best Match"] + sort_options
         sort_by = st.selectbox("Sort By", sort_options)
     
     # Filter the data based on search and category
     filtered_df = inventory_data.copy()
     
     if search_term:
-        filtered_df = filtered_df[
-            filtered_df["SKU"].str.contains(search_term, case=False) | 
-            filtered_df["Product Name"].str.contains(search_term, case=False)
-        ]
+        # Ranked row labels of the items whose SKU or product name matches
+        matches = item_search_index(st.session_state.source_location, inventory_data).search(search_term)
+        filtered_df = filtered_df.loc[matches]
     
     if selected_category != "All Categories":
         filtered_df = filtered_df[filtered_df["Category"] == selected_category]
@@ -720,6 +726,17 @@ def show_transfer_complete():
                     del st.session_state[key]
             st.rerun()
 
+def item_search_index(location_name, inventory_data):
+    """Return the SKU and product name search index of a location's inventory
+    
+    Items are indexed by row label the first time they are seen; later calls
+    only add new rows.
+    """
+    index = _item_indexes.setdefault(location_name, NgramIndex())
+    if len(index) != len(inventory_data):
+        index.add_many(zip(inventory_data.index, inventory_data["SKU"], inventory_data["Product Name"]))
+    return index
+
 def generate_sample_inventory(location_name):
     """Generate sample inventory data based on location"""
     
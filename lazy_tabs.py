@@ -0,0 +1,41 @@
+import streamlit as st
+
+# st.tabs runs the body of every tab on every rerun and only hides the
+# inactive ones in the browser, so a page pays for the data loading, charts
+# and widgets of all of its tabs at once. lazy_tabs shows the tab strip as a
+# horizontal selector, remembers the selection in session state and lets the
+# page run only the selected tab's body.
+#
+# Streamlit cannot replay a previously rendered element tree, so switching
+# back to a tab runs its body again; what makes that cheap is the data layer
+# behind it (market data gateway, memoized figures, cached stores).
+
+def lazy_tabs(labels, key):
+    """Drop-in replacement for st.tabs that runs only the selected tab
+
+    Returns one flag per label, True only for the selected tab:
+
+        tabs = lazy_tabs(["Overview", "Details"], key="report_tab")
+        if tabs[0]:
+            show_overview()
+        if tabs[1]:
+            show_details()
+
+    The selection survives the selector not being rendered (e.g. while the
+    user is on another page).
+    """
+    labels = list(labels)
+    selected_key = f"{key}_selected"
+    selected = st.session_state.get(selected_key)
+    if selected not in labels:
+        selected = labels[0]
+    selected = st.radio(
+        "Section",
+        labels,
+        index=labels.index(selected),
+        horizontal=True,
+        label_visibility="collapsed",
+        key=key
+    )
+    st.session_state[selected_key] = selected
+    return [label == selected for label in labels]
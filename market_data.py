@@ -0,0 +1,197 @@
+import threading
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, wait
+from app_config import cache_path
+from market_data_cache import MarketDataCache, period_to_start
+from bar_store import BarStore
+from fundamentals_cache import FundamentalsCache
+from seasonal_cube import SeasonalCube
+from shared_price_store import SharedPriceStore
+from market_data_providers import get_provider
+from single_flight import SingleFlight
+
+# Market data gateway: every price history and fundamentals lookup in the app goes through here
+
+INFO_MAX_WORKERS = 8
+INFO_TIMEOUT = 10  # seconds to wait for the whole batch of Ticker.info lookups
+
+_info_executor = ThreadPoolExecutor(max_workers=INFO_MAX_WORKERS, thread_name_prefix="ticker-info")
+
+# Concurrent sessions asking for the same data share one upstream call
+_history_flight = SingleFlight()
+_info_flight = SingleFlight()
+
+_provider = None
+_market_cache = None
+_fundamentals_cache = None
+_seasonal_cube = None
+_bar_store = None
+_shared_store = None
+_setup_lock = threading.Lock()
+
+def get_market_provider():
+    """Return the configured market data provider (see app_config.MARKET_DATA_PROVIDER)"""
+    global _provider
+    with _setup_lock:
+        if _provider is None:
+            _provider = get_provider()
+    return _provider
+
+def get_market_cache():
+    """Return the process-wide OHLCV cache, backed by the configured provider"""
+    global _market_cache
+    provider = get_market_provider()
+    with _setup_lock:
+        if _market_cache is None:
+            # One cache file per provider so replayed or synthetic bars never mix with live ones
+            _market_cache = MarketDataCache(provider.download, cache_path(f"market_data_{provider.name}.sqlite"))
+    return _market_cache
+
+def get_fundamentals_cache():
+    """Return the process-wide Ticker.info cache, backed by the configured provider"""
+    global _fundamentals_cache
+    provider = get_market_provider()
+    with _setup_lock:
+        if _fundamentals_cache is None:
+            _fundamentals_cache = FundamentalsCache(provider.info, cache_path(f"fundamentals_{provider.name}.json"))
+    return _fundamentals_cache
+
+def get_seasonal_cube():
+    """Return the process-wide seasonal return cube, fed from the OHLCV cache"""
+    global _seasonal_cube
+    provider = get_market_provider()
+    with _setup_lock:
+        if _seasonal_cube is None:
+            _seasonal_cube = SeasonalCube(
+                _loaded_price_panel,
+                cache_path(f"seasonal_cube_{provider.name}.sqlite")
+            )
+    return _seasonal_cube
+
+def get_bar_store():
+    """Return the process-wide multi-resolution bar store, fed from the OHLCV cache"""
+    global _bar_store
+    with _setup_lock:
+        if _bar_store is None:
+            _bar_store = BarStore(lambda ticker, start, end, interval: get_history(ticker, start, end, interval))
+    return _bar_store
+
+def get_shared_store():
+    """Return this process's handle on the memory-mapped price store shared by all workers"""
+    global _shared_store
+    provider = get_market_provider()
+    with _setup_lock:
+        if _shared_store is None:
+            _shared_store = SharedPriceStore(cache_path(f"price_store_{provider.name}"))
+    return _shared_store
+
+def get_histories(tickers, start=None, end=None, interval="1d", period=None):
+    """Return OHLCV history for several tickers, fetched in one batched download"""
+    tickers = list(tickers)
+    key = (tuple(tickers), str(start), str(end), interval, period)
+    return _history_flight.do(
+        key, get_market_cache().get_histories, tickers, start, end, interval, period
+    )
+
+def get_history(ticker, start=None, end=None, interval="1d", period=None):
+    """Return OHLCV history for a single ticker"""
+    return get_histories([ticker], start, end, interval, period)[ticker]
+
+def get_bars(ticker, start=None, end=None, interval="1d", period=None):
+    """Return OHLCV bars at any interval in bar_store.INTERVALS, resampled from cached base bars"""
+    return get_bar_store().get_bars(ticker, start, end, interval, period)
+
+def get_shared_history(ticker, start=None, end=None, period=None):
+    """Return daily bars, closed ones from the shared memory-mapped store
+
+    The store is first brought up to date from the OHLCV cache: a backfill
+    when the request starts before the synced range, otherwise only the days
+    closed since the last sync. The synced range only advances when closed
+    bars were written, so a sync that came back empty is retried. Closed bars
+    are a read-only view shared with every other session and worker process
+    on the host; today's still-forming bar comes from the OHLCV cache and is
+    appended to a copy.
+    """
+    store = get_shared_store()
+    now = pd.Timestamp.now()
+    start = pd.Timestamp(start) if start is not None else period_to_start(period or "1y", now)
+    closed_before = now.normalize()
+
+    manifest = store.manifest(ticker) or {}
+    covered_from, covered_to = manifest.get("covered_from"), manifest.get("covered_to")
+    if covered_from is None or start.value < covered_from:
+        bars = get_history(ticker, start=start)
+        closed = bars[bars.index < closed_before]
+        if len(closed):
+            store.append(ticker, closed, covered_from=start, covered_to=closed_before)
+    elif closed_before.value > covered_to:
+        last_ts = manifest.get("last_ts")
+        bars = get_history(ticker, start=pd.Timestamp(last_ts or covered_to))
+        closed = bars[bars.index < closed_before]
+        if last_ts is not None:
+            closed = closed[closed.index.asi8 > last_ts]
+        if len(closed):
+            store.append(ticker, closed, covered_to=closed_before)
+
+    history = store.read(ticker, start=start, end=end)
+    if end is None or pd.Timestamp(end) > closed_before:
+        today = get_history(ticker, start=closed_before, end=end)
+        today = today[today.index >= max(start, closed_before)]
+        if len(today):
+            history = pd.concat([history, today])
+    return history
+
+def get_price_panel(tickers, start=None, end=None, interval="1d", period=None, field="Adj Close"):
+    """Return one price field for several tickers as a dates x tickers DataFrame"""
+    histories = get_histories(tickers, start, end, interval, period)
+    return pd.DataFrame({ticker: frame[field] for ticker, frame in histories.items()})
+
+def _loaded_price_panel(tickers, start, end):
+    """Adjusted closes for the seasonal cube, leaving out tickers whose download failed
+
+    A ticker counts as loaded when the OHLCV cache covers the whole range,
+    even if it had no bars there (before it was listed).
+    """
+    panel = get_price_panel(tickers, start=start, end=end)
+    cache = get_market_cache()
+    loaded = []
+    for ticker in panel.columns:
+        covered = cache.coverage(ticker)
+        if covered is not None and covered[0] <= start and covered[1] >= end:
+            loaded.append(ticker)
+    return panel[loaded]
+
+def fetch_info(ticker, fields=None):
+    """Return the Ticker.info fundamentals dictionary for one ticker
+
+    Served from the fundamentals cache; only a ticker that has never been
+    seen blocks on Yahoo. Entries whose requested fields are past their TTL
+    are refreshed in the background.
+    """
+    fields = tuple(fields) if fields is not None else None
+    return _info_flight.do((ticker, fields), get_fundamentals_cache().get, ticker, fields)
+
+def fetch_info_many(tickers, fields=None, timeout=INFO_TIMEOUT):
+    """Fetch Ticker.info for several tickers concurrently
+
+    Lookups run on a bounded thread pool. Tickers whose lookup fails or does
+    not finish within the timeout map to None.
+    """
+    futures = {ticker: _info_executor.submit(fetch_info, ticker, fields) for ticker in dict.fromkeys(tickers)}
+    wait(futures.values(), timeout=timeout)
+
+    results = {}
+    for ticker, future in futures.items():
+        if future.done() and future.exception() is None:
+            results[ticker] = future.result()
+        else:
+            future.cancel()
+            results[ticker] = None
+    return results
+
+def get_gateway_stats():
+    """Return single-flight counters for history and fundamentals requests"""
+    return {
+        "history": _history_flight.stats(),
+        "info": _info_flight.stats()
+    }
@@ -0,0 +1,280 @@
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from app_config import cache_path
+
+# Column names as returned by yfinance mapped to the SQLite column names
+BAR_COLUMNS = {
+    "Open": "open",
+    "High": "high",
+    "Low": "low",
+    "Close": "close",
+    "Adj Close": "adj_close",
+    "Volume": "volume"
+}
+
+# How long the newest stored bar is considered current before the tail is refetched
+REFRESH_AFTER = {
+    "1m": pd.Timedelta(minutes=1),
+    "2m": pd.Timedelta(minutes=2),
+    "5m": pd.Timedelta(minutes=5),
+    "15m": pd.Timedelta(minutes=15),
+    "30m": pd.Timedelta(minutes=30),
+    "60m": pd.Timedelta(hours=1),
+    "1h": pd.Timedelta(hours=1),
+    "1d": pd.Timedelta(hours=1),
+    "1wk": pd.Timedelta(hours=6),
+    "1mo": pd.Timedelta(days=1)
+}
+
+# Earliest date requested for period="max"
+MAX_HISTORY_START = pd.Timestamp("1970-01-02")
+
+# Relative change of a stored bar's Adj Close / Close ratio that means a
+# dividend or split moved the adjustment basis since it was stored
+ADJUSTMENT_TOLERANCE = 1e-4
+
+def period_to_start(period, now=None):
+    """Convert a yfinance period string (1mo, 1y, ytd, max, ...) to a start timestamp"""
+    now = now if now is not None else pd.Timestamp.now()
+    if period == "max":
+        return MAX_HISTORY_START
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1)
+    units = {
+        "d": lambda n: pd.DateOffset(days=n),
+        "wk": lambda n: pd.DateOffset(weeks=n),
+        "mo": lambda n: pd.DateOffset(months=n),
+        "y": lambda n: pd.DateOffset(years=n)
+    }
+    for suffix, offset in units.items():
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return (now - offset(int(period[:-len(suffix)]))).normalize()
+    raise ValueError(f"Unsupported period: {period}")
+
+def empty_bars():
+    """An OHLCV frame without rows that still has a DatetimeIndex, so date filters work on it"""
+    return pd.DataFrame(columns=list(BAR_COLUMNS), index=pd.DatetimeIndex([], name="Date"), dtype=float)
+
+def normalize_bars(frame, ticker=None):
+    """Flatten a yfinance frame to a tz-naive index and the standard OHLCV columns"""
+    if frame is None or frame.empty:
+        return empty_bars()
+    if isinstance(frame.columns, pd.MultiIndex):
+        # yfinance returns (Price, Ticker) columns, even for a single ticker
+        if ticker is None:
+            frame = frame.droplevel(1, axis=1)
+        elif ticker in frame.columns.get_level_values(1):
+            frame = frame.xs(ticker, axis=1, level=1)
+        elif ticker in frame.columns.get_level_values(0):
+            frame = frame.xs(ticker, axis=1, level=0)
+        else:
+            return empty_bars()
+    frame = frame[[col for col in BAR_COLUMNS if col in frame.columns]].copy()
+    if "Adj Close" not in frame.columns and "Close" in frame.columns:
+        frame["Adj Close"] = frame["Close"]
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    frame.index = index
+    frame.index.name = "Date"
+    return frame.dropna(how="all")
+
+class MarketDataCache:
+    """Persistent OHLCV store keyed by ticker and interval that only fetches missing bars"""
+
+    def __init__(self, downloader, path=None, refresh_after=None):
+        # downloader(tickers, start, end, interval) -> {ticker: DataFrame}; a
+        # ticker missing from the result failed, an empty frame has no bars
+        self.downloader = downloader
+        self.path = path or cache_path("market_data.sqlite")
+        self.refresh_after = dict(REFRESH_AFTER, **(refresh_after or {}))
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS bars (
+                    ticker TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    ts INTEGER NOT NULL,
+                    open REAL, high REAL, low REAL, close REAL, adj_close REAL, volume REAL,
+                    PRIMARY KEY (ticker, interval, ts)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS coverage (
+                    ticker TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    start_ts INTEGER NOT NULL,
+                    end_ts INTEGER NOT NULL,
+                    PRIMARY KEY (ticker, interval)
+                )
+            """)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def coverage(self, ticker, interval="1d"):
+        """Return the (start, end) range already fetched for a ticker, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT start_ts, end_ts FROM coverage WHERE ticker = ? AND interval = ?",
+                (ticker, interval)
+            ).fetchone()
+        if row is None:
+            return None
+        return pd.Timestamp(row[0]), pd.Timestamp(row[1])
+
+    def last_bar(self, ticker, interval="1d"):
+        """Return the timestamp of the newest stored bar, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT MAX(ts) FROM bars WHERE ticker = ? AND interval = ?",
+                (ticker, interval)
+            ).fetchone()
+        return pd.Timestamp(row[0]) if row[0] is not None else None
+
+    def missing_ranges(self, ticker, start, end, interval="1d"):
+        """Return the (start, end) ranges that must be downloaded to answer a request"""
+        covered = self.coverage(ticker, interval)
+        if covered is None:
+            return [(start, end)]
+
+        covered_start, covered_end = covered
+        ranges = []
+        if start < covered_start:
+            ranges.append((start, covered_start))
+        refresh_after = self.refresh_after.get(interval, pd.Timedelta(minutes=15))
+        if end - covered_end > refresh_after:
+            # Refetch from the newest stored bar since it may have been a partial bar
+            last = self.last_bar(ticker, interval)
+            ranges.append((min(last, covered_end) if last is not None else covered_end, end))
+        return ranges
+
+    def adjustment_changed(self, ticker, frame, interval="1d"):
+        """Whether downloaded bars that are already stored have a different Adj Close / Close ratio
+
+        Adjusted closes are relative to the latest dividend or split, so after
+        one every stored bar is on an old basis and appending new bars would
+        put a false return at the join.
+        """
+        frame = normalize_bars(frame, ticker)
+        if frame.empty:
+            return False
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT ts, close, adj_close FROM bars WHERE ticker = ? AND interval = ? AND ts >= ? AND ts <= ?",
+                (ticker, interval, frame.index[0].value, frame.index[-1].value)
+            ).fetchall()
+        if not rows:
+            return False
+        stored = pd.DataFrame(rows, columns=["ts", "close", "adj_close"]).set_index("ts")
+        fresh = frame.set_axis(frame.index.asi8)[["Close", "Adj Close"]].reindex(stored.index)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            change = (fresh["Adj Close"] / fresh["Close"]) / (stored["adj_close"] / stored["close"]) - 1
+        return bool((change.abs() > ADJUSTMENT_TOLERANCE).any())
+
+    def store(self, ticker, frame, start, end, interval="1d", replace=False):
+        """Upsert downloaded bars and extend the covered range
+
+        An empty frame still marks the range covered: the download succeeded
+        and there are no bars, e.g. before a ticker was listed. With replace
+        the ticker's stored bars and coverage are dropped in the same
+        transaction first.
+        """
+        frame = normalize_bars(frame, ticker)
+        rows = [
+            (ticker, interval, ts.value) + tuple(
+                None if pd.isna(value) else float(value) for value in values
+            )
+            for ts, values in zip(frame.index, frame.reindex(columns=list(BAR_COLUMNS)).itertuples(index=False))
+        ]
+        with self._lock, self._connect() as conn:
+            if replace:
+                conn.execute("DELETE FROM bars WHERE ticker = ? AND interval = ?", (ticker, interval))
+                conn.execute("DELETE FROM coverage WHERE ticker = ? AND interval = ?", (ticker, interval))
+            conn.executemany(
+                "INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute("""
+                INSERT INTO coverage VALUES (?, ?, ?, ?)
+                ON CONFLICT (ticker, interval) DO UPDATE SET
+                    start_ts = MIN(start_ts, excluded.start_ts),
+                    end_ts = MAX(end_ts, excluded.end_ts)
+            """, (ticker, interval, pd.Timestamp(start).value, pd.Timestamp(end).value))
+
+    def read(self, ticker, start=None, end=None, interval="1d"):
+        """Read stored bars in [start, end) as a yfinance-style DataFrame"""
+        start = pd.Timestamp(start) if start is not None else MAX_HISTORY_START
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp.max
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT ts, {', '.join(BAR_COLUMNS.values())} FROM bars "
+                "WHERE ticker = ? AND interval = ? AND ts >= ? AND ts < ? ORDER BY ts",
+                (ticker, interval, start.value, end.value)
+            ).fetchall()
+        frame = pd.DataFrame(rows, columns=["Date"] + list(BAR_COLUMNS))
+        frame["Date"] = pd.to_datetime(frame["Date"])
+        return frame.set_index("Date").astype(float)
+
+    def get_histories(self, tickers, start=None, end=None, interval="1d", period=None):
+        """Return bars for several tickers, downloading only what is not cached yet
+
+        Tickers missing the same date range are fetched together in a single
+        multi-ticker download instead of one request per ticker.
+        """
+        now = pd.Timestamp.now()
+        if start is None:
+            start = period_to_start(period or "1y", now)
+        start = pd.Timestamp(start)
+        end = min(pd.Timestamp(end), now) if end is not None else now
+
+        pending = {}
+        for ticker in dict.fromkeys(tickers):
+            for fetch_range in self.missing_ranges(ticker, start, end, interval):
+                pending.setdefault(fetch_range, []).append(ticker)
+
+        for (fetch_start, fetch_end), group in pending.items():
+            frames = self.downloader(group, fetch_start, fetch_end, interval)
+            rebased = []
+            for ticker in group:
+                if frames.get(ticker) is None:
+                    # Failed download: nothing is marked covered, so it is retried
+                    continue
+                if self.adjustment_changed(ticker, frames[ticker], interval):
+                    rebased.append(ticker)
+                else:
+                    self.store(ticker, frames[ticker], fetch_start, fetch_end, interval)
+            if rebased:
+                self.refetch(rebased, fetch_end, interval)
+
+        return {ticker: self.read(ticker, start, end, interval) for ticker in tickers}
+
+    def get_history(self, ticker, start=None, end=None, interval="1d", period=None):
+        """Return bars for a ticker, downloading only what is not cached yet"""
+        return self.get_histories([ticker], start, end, interval, period)[ticker]
+
+    def refetch(self, tickers, end, interval="1d"):
+        """Replace the stored history of tickers whose adjustment basis changed with a fresh download"""
+        ranges = {}
+        for ticker in tickers:
+            covered = self.coverage(ticker, interval)
+            ranges.setdefault(covered[0] if covered else MAX_HISTORY_START, []).append(ticker)
+        for start, group in ranges.items():
+            frames = self.downloader(group, start, end, interval)
+            for ticker in group:
+                if frames.get(ticker) is None:
+                    continue
+                self.store(ticker, frames[ticker], start, end, interval, replace=True)
+
+    def clear(self, ticker=None):
+        """Drop cached bars for one ticker, or everything"""
+        with self._lock, self._connect() as conn:
+            if ticker is None:
+                conn.execute("DELETE FROM bars")
+                conn.execute("DELETE FROM coverage")
+            else:
+                conn.execute("DELETE FROM bars WHERE ticker = ?", (ticker,))
+                conn.execute("DELETE FROM coverage WHERE ticker = ?", (ticker,))
@@ -0,0 +1,271 @@
+import json
+import os
+import time
+import zlib
+import numpy as np
+import pandas as pd
+import app_config
+from market_data_cache import BAR_COLUMNS, normalize_bars
+
+# Interchangeable sources of market data. Every provider implements:
+#   download(tickers, start, end, interval) -> {ticker: OHLCV DataFrame}
+#     (tickers whose download failed are left out; an empty frame means no bars)
+#   info(ticker) -> Ticker.info style dict
+
+class YFinanceProvider:
+    """Live market data from Yahoo Finance"""
+
+    name = "yfinance"
+
+    def download(self, tickers, start, end, interval="1d"):
+        """Download OHLCV bars for several tickers in one request"""
+        import yfinance as yf
+        frame = yf.download(
+            list(tickers),
+            start=start,
+            end=end,
+            interval=interval,
+            auto_adjust=False,
+            progress=False,
+            group_by="column"
+        )
+        frames = {}
+        for ticker in tickers:
+            bars = normalize_bars(frame, ticker)
+            if bars.empty:
+                # yf.download gives an empty column both for a failed request and
+                # for a range without prices; only the single-ticker call tells them apart
+                bars = self._download_one(ticker, start, end, interval)
+                if bars is None:
+                    continue
+            frames[ticker] = bars
+        return frames
+
+    def _download_one(self, ticker, start, end, interval):
+        """Bars of one ticker; an empty frame if Yahoo has no prices in the range, None if the request failed"""
+        import warnings
+        import yfinance as yf
+        from yfinance import exceptions
+        no_prices = tuple(
+            getattr(exceptions, name) for name in ("YFPricesMissingError", "YFTzMissingError", "YFTickerMissingError")
+            if hasattr(exceptions, name)
+        )
+        try:
+            with warnings.catch_warnings():
+                # raise_errors is deprecated in newer yfinance but still honoured
+                warnings.simplefilter("ignore", DeprecationWarning)
+                frame = yf.Ticker(ticker).history(
+                    start=start, end=end, interval=interval, auto_adjust=False, raise_errors=True
+                )
+        except no_prices:
+            return normalize_bars(None)
+        except Exception:
+            return None
+        return normalize_bars(frame)
+
+    def info(self, ticker):
+        """Fetch the Ticker.info fundamentals dictionary"""
+        import yfinance as yf
+        return yf.Ticker(ticker).info
+
+class ReplayProvider:
+    """Serve recorded CSV/Parquet fixtures with a configurable artificial latency
+
+    Fixtures live in one directory as <TICKER>_<interval>.csv (or .parquet)
+    and optional <TICKER>.info.json files, as written by record_fixtures().
+    """
+
+    name = "replay"
+
+    def __init__(self, fixtures_dir, latency=0.0):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self._frames = {}
+
+    def _load(self, ticker, interval):
+        key = (ticker, interval)
+        if key not in self._frames:
+            base = os.path.join(self.fixtures_dir, f"{ticker}_{interval}")
+            if os.path.exists(base + ".parquet"):
+                frame = pd.read_parquet(base + ".parquet")
+            elif os.path.exists(base + ".csv"):
+                frame = pd.read_csv(base + ".csv", index_col=0, parse_dates=True)
+            else:
+                frame = None
+            self._frames[key] = normalize_bars(frame)
+        return self._frames[key]
+
+    def download(self, tickers, start, end, interval="1d"):
+        """Return the recorded bars in [start, end) after sleeping for the configured latency"""
+        time.sleep(self.latency)
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        result = {}
+        for ticker in tickers:
+            frame = self._load(ticker, interval)
+            result[ticker] = frame[(frame.index >= start) & (frame.index < end)]
+        return result
+
+    def info(self, ticker):
+        """Return the recorded info dict, or an empty dict if none was recorded"""
+        time.sleep(self.latency)
+        path = os.path.join(self.fixtures_dir, f"{ticker}.info.json")
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+# Bar spacing used by the synthetic generator for intraday intervals
+INTRADAY_STEPS = {
+    "1m": "1min", "2m": "2min", "5m": "5min", "15m": "15min",
+    "30m": "30min", "60m": "60min", "1h": "60min"
+}
+DAY_NS = 86_400_000_000_000
+# Trading periods per year used to scale drift and volatility
+PERIODS_PER_YEAR = {"1d": 252, "1wk": 52, "1mo": 12}
+
+def _hash_uniform(seed, keys):
+    """Deterministic uniform(0, 1) values from (seed, key) pairs using splitmix64"""
+    with np.errstate(over="ignore"):
+        z = keys.astype(np.uint64) ^ np.uint64(seed)
+        z = z + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    return ((z >> np.uint64(11)).astype(np.float64) + 0.5) / float(1 << 53)
+
+def _hash_normal(seed, keys):
+    """Deterministic standard normal values from (seed, key) pairs (Box-Muller)"""
+    u1 = _hash_uniform(seed, keys)
+    u2 = _hash_uniform(seed ^ 0x5DEECE66D, keys)
+    return np.sqrt(-2.0 * np.log(u1)) * np.cos(2.0 * np.pi * u2)
+
+class SyntheticProvider:
+    """Generate geometric Brownian motion price histories of any length
+
+    Every bar is derived from a hash of (seed, ticker, timestamp), so the same
+    request always returns the same bars and separately fetched ranges join
+    up without gaps, which keeps the incremental cache consistent.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, seed=0, drift=0.05, volatility=0.30, start_price=50.0, anchor="1970-01-02"):
+        self.seed = seed
+        self.drift = drift
+        self.volatility = volatility
+        self.start_price = start_price
+        self.anchor = pd.Timestamp(anchor)
+
+    def _ticker_seed(self, ticker):
+        return (zlib.crc32(ticker.encode()) << 16) ^ self.seed
+
+    def _daily_closes(self, seed, end):
+        """Closing prices on every business day from the anchor up to end"""
+        # Business days as day numbers since the epoch (1970-01-01 was a Thursday)
+        days = np.arange(self.anchor.value // DAY_NS, pd.Timestamp(end).value // DAY_NS + 1)
+        days = days[(days + 3) % 7 < 5]
+        dates = pd.DatetimeIndex(days * DAY_NS)
+        dt = 1 / 252
+        shocks = _hash_normal(seed, days)
+        log_returns = (self.drift - 0.5 * self.volatility ** 2) * dt + self.volatility * np.sqrt(dt) * shocks
+        return pd.Series(self.start_price * np.exp(np.cumsum(log_returns)), index=dates)
+
+    def _bars(self, ticker, start, end, interval):
+        seed = self._ticker_seed(ticker)
+        daily = self._daily_closes(seed, end)
+        if interval in INTRADAY_STEPS:
+            # Intraday path: random walk within each session starting from the previous close
+            days = daily.index[(daily.index >= start.normalize()) & (daily.index < end)]
+            session = pd.timedelta_range("9h30min", "15h59min", freq=INTRADAY_STEPS[interval])
+            index = pd.DatetimeIndex((days.values[:, None] + session.values[None, :]).ravel())
+            step_vol = self.volatility * np.sqrt(1 / (252 * len(session)))
+            shocks = step_vol * _hash_normal(seed, index.asi8).reshape(len(days), len(session))
+            prev_close = daily.shift(1).fillna(self.start_price).reindex(days).to_numpy()
+            close = prev_close[:, None] * np.exp(np.cumsum(shocks, axis=1))
+            # Each session opens at the previous day's close
+            open_ = np.concatenate([prev_close[:, None], close[:, :-1]], axis=1).ravel()
+            close = close.ravel()
+            periods = 252 * len(session)
+        else:
+            close_series = daily if interval == "1d" else daily.resample(
+                {"1wk": "W-FRI", "1mo": "ME"}.get(interval, "W-FRI")
+            ).last()
+            index = close_series.index
+            close = close_series.to_numpy()
+            open_ = np.concatenate([[self.start_price], close[:-1]])
+            periods = PERIODS_PER_YEAR.get(interval, 252)
+
+        keys = index.asi8
+        spread = self.volatility / np.sqrt(periods)
+        high = np.maximum(open_, close) * (1 + spread * _hash_uniform(seed ^ 1, keys))
+        low = np.minimum(open_, close) * (1 - spread * _hash_uniform(seed ^ 2, keys))
+        volume = np.round(1_000_000 * np.exp(_hash_normal(seed ^ 3, keys) * 0.5))
+        frame = pd.DataFrame({
+            "Open": open_, "High": high, "Low": low,
+            "Close": close, "Adj Close": close, "Volume": volume
+        }, index=index)
+        frame.index.name = "Date"
+        return frame[(frame.index >= start) & (frame.index < end)]
+
+    def download(self, tickers, start, end, interval="1d"):
+        """Generate OHLCV bars for several tickers in [start, end)"""
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        return {ticker: self._bars(ticker, start, end, interval) for ticker in tickers}
+
+    def info(self, ticker):
+        """Return a synthetic Ticker.info dict consistent with the generated prices"""
+        bars = self._bars(ticker, pd.Timestamp.now() - pd.Timedelta(days=400), pd.Timestamp.now(), "1d")
+        last_year = bars.iloc[-252:]
+        price = float(bars["Close"].iloc[-1])
+        return {
+            "symbol": ticker,
+            "shortName": f"{ticker} (synthetic)",
+            "sector": "Synthetic",
+            "industry": "Synthetic",
+            "currentPrice": price,
+            "regularMarketPrice": price,
+            "regularMarketChangePercent": float(bars["Close"].pct_change().iloc[-1] * 100),
+            "regularMarketOpen": float(bars["Open"].iloc[-1]),
+            "regularMarketDayHigh": float(bars["High"].iloc[-1]),
+            "regularMarketDayLow": float(bars["Low"].iloc[-1]),
+            "volume": int(bars["Volume"].iloc[-1]),
+            "marketCap": int(price * 100_000_000),
+            "fiftyTwoWeekLow": float(last_year["Low"].min()),
+            "fiftyTwoWeekHigh": float(last_year["High"].max()),
+            "trailingPE": 15.0,
+            "beta": 1.0
+        }
+
+def get_provider(name=None):
+    """Build the market data provider selected by MARKET_DATA_PROVIDER"""
+    name = name or app_config.MARKET_DATA_PROVIDER
+    if name == "yfinance":
+        return YFinanceProvider()
+    if name == "replay":
+        return ReplayProvider(app_config.MARKET_DATA_FIXTURES_DIR, app_config.MARKET_DATA_REPLAY_LATENCY)
+    if name == "synthetic":
+        return SyntheticProvider(seed=app_config.MARKET_DATA_SYNTHETIC_SEED)
+    raise ValueError(f"Unknown market data provider: {name}")
+
+def record_fixtures(tickers, start, end, fixtures_dir, interval="1d", provider=None):
+    """Record bars and info dicts from a provider (live Yahoo by default) for the replay provider"""
+    provider = provider or YFinanceProvider()
+    os.makedirs(fixtures_dir, exist_ok=True)
+    for ticker, frame in provider.download(tickers, start, end, interval).items():
+        frame.reindex(columns=list(BAR_COLUMNS)).to_csv(os.path.join(fixtures_dir, f"{ticker}_{interval}.csv"))
+        with open(os.path.join(fixtures_dir, f"{ticker}.info.json"), "w") as f:
+            json.dump(provider.info(ticker), f, default=str)
+
+if __name__ == "__main__":
+    import argparse
+    from market_data_cache import period_to_start
+
+    parser = argparse.ArgumentParser(description="Record market data fixtures for the replay provider")
+    parser.add_argument("tickers", nargs="+")
+    parser.add_argument("--period", default="5y")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--out", default=app_config.MARKET_DATA_FIXTURES_DIR)
+    args = parser.parse_args()
+
+    record_fixtures(args.tickers, period_to_start(args.period), pd.Timestamp.now(), args.out, args.interval)
+    print(f"Recorded {len(args.tickers)} tickers to {args.out}")
@@ -0,0 +1,73 @@
+import threading
+import time
+import pandas as pd
+from market_data import get_histories, get_seasonal_cube
+from market_data_cache import period_to_start
+from retail_universe import COMPARISON_PERIODS, SEASONAL_YEARS, normalize_prices, universe_tickers
+from seasonal_cube import last_closed_month
+
+# Seconds between scheduled refreshes of the warm retail universe
+REFRESH_INTERVAL = 15 * 60
+
+_snapshot = {}
+_snapshot_lock = threading.Lock()
+_warmup_thread = None
+_warmup_lock = threading.Lock()
+
+def warm_universe():
+    """Prefetch the retail universe, precompute its normalized prices and extend the seasonal cube"""
+    tickers = universe_tickers()
+    histories = get_histories(tickers, period=f"{SEASONAL_YEARS}y")
+    prices = pd.DataFrame({ticker: frame["Adj Close"] for ticker, frame in histories.items()})
+
+    now = pd.Timestamp.now()
+    normalized = {
+        period: normalize_prices(prices.loc[period_to_start(period, now):])
+        for period in COMPARISON_PERIODS.values()
+    }
+    # Only months closed since the last refresh are aggregated
+    last_month = last_closed_month(now)
+    get_seasonal_cube().update(tickers, last_month - SEASONAL_YEARS * 12 + 1, last_month)
+
+    with _snapshot_lock:
+        _snapshot.update({
+            "prices": prices,
+            "normalized": normalized,
+            "updated_at": now
+        })
+
+def _warmup_loop(refresh_interval):
+    while True:
+        try:
+            warm_universe()
+        except Exception:
+            # A failed refresh keeps the previous snapshot; try again next cycle
+            pass
+        time.sleep(refresh_interval)
+
+def start_warmup(refresh_interval=REFRESH_INTERVAL):
+    """Start the background warm-up thread once per process"""
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(
+                target=_warmup_loop, args=(refresh_interval,), name="market-warmup", daemon=True
+            )
+            _warmup_thread.start()
+
+def _columns(table, tickers):
+    # Only serve from the snapshot when every requested ticker is in it
+    if table is None or not set(tickers) <= set(table.columns):
+        return None
+    return table[list(tickers)]
+
+def get_warm_normalized(tickers, period):
+    """Return precomputed normalized prices for the tickers and period, or None if not warm"""
+    with _snapshot_lock:
+        table = _snapshot.get("normalized", {}).get(period)
+    return _columns(table, tickers)
+
+def warmup_status():
+    """Return when the warm snapshot was last refreshed, or None"""
+    with _snapshot_lock:
+        return _snapshot.get("updated_at")
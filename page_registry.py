@@ -0,0 +1,93 @@
+import importlib
+import streamlit as st
+
+# Every page the app can route to. A page's module is imported the first time
+# the page is shown, so the public landing pages never pay for pandas, plotly
+# or the market-data stack, and a page's heavy dependencies load only when
+# someone opens it. Python keeps imported modules, so each import happens
+# once per process.
+#
+# "roles" limits who may open a page; anyone else gets the "denied" warning
+# and the "fallback" page instead.
+#
+# "warmup" marks the market pages: the first time one is shown, after it has
+# rendered, the background prefetch of the retail universe is started (once
+# per process), so the other pages never load the market-data stack for it.
+
+LICENSED_ROLES = ("licensed", "emperor")
+EMPEROR_ROLES = ("emperor",)
+
+EMPEROR_DENIED = "⚠️ Only the Emperor has access to this command interface."
+
+PAGES = {
+    "onboarding": {"module": "onboarding", "function": "show_onboarding"},
+    "product_catalog": {"module": "product_catalog", "function": "show_product_catalog"},
+    "product_detail": {"module": "product_detail", "function": "show_product_detail"},
+    "order_booking": {"module": "order_booking", "function": "show_order_booking"},
+    "order_confirmation": {"module": "order_confirmation", "function": "show_order_confirmation"},
+    "merchandiser_agent": {"module": "merchandiser_agent", "function": "show_merchandiser_agent"},
+    "retailer_analysis": {"module": "retailer_analysis", "function": "show_retailer_analysis", "warmup": True},
+    "stock_analysis": {"module": "stock_analysis", "function": "show_stock_analysis", "warmup": True},
+    "visualization": {"module": "visualization", "function": "show_visualization"},
+    "retail_screener": {"module": "retail_screener", "function": "show_retail_screener", "warmup": True},
+    "hsn_transaction_system": {"module": "hsn_transaction_system", "function": "show_hsn_transaction_system"},
+    # Empire Ecosystem pages
+    "empire_os_landing": {"module": "empire_os_landing", "function": "show_empire_os_landing"},
+    "vsr_landing": {"module": "virtual_silk_road_landing", "function": "show_virtual_silk_road_landing"},
+    "synergyze_landing": {"module": "synergyze_landing", "function": "show_synergyze_landing"},
+    # Private access dashboards
+    "virtual_silk_road": {
+        "module": "virtual_silk_road",
+        "function": "show_virtual_silk_road",
+        "roles": LICENSED_ROLES,
+        "denied": "⚠️ You need licensed access to view the Emperor's Virtual Silk Road dashboard.",
+        "fallback": "vsr_landing"
+    },
+    # Emperor control dashboards
+    "empire_os_dashboard": {
+        "module": "empire_os_dashboard",
+        "function": "show_empire_os_dashboard",
+        "roles": EMPEROR_ROLES,
+        "denied": EMPEROR_DENIED,
+        "fallback": "empire_os_landing"
+    },
+    "license_management": {
+        "module": "empire_os_dashboard",
+        "function": "show_license_dashboard",
+        "roles": EMPEROR_ROLES,
+        "denied": EMPEROR_DENIED,
+        "fallback": "empire_os_landing"
+    },
+    "session_memory": {
+        "module": "session_memory",
+        "function": "show_session_memory_admin",
+        "roles": EMPEROR_ROLES,
+        "denied": EMPEROR_DENIED,
+        "fallback": "empire_os_landing"
+    }
+}
+
+# Shown for unknown page names
+DEFAULT_PAGE = "vsr_landing"
+
+def load_page(name):
+    """Import a page's module if needed and return its render function"""
+    page = PAGES[name]
+    return getattr(importlib.import_module(page["module"]), page["function"])
+
+def show_page(name, user_role):
+    """Render a page, enforcing its access roles"""
+    page = PAGES.get(name)
+    if page is None:
+        # Fallback to landing page if an unknown page is requested
+        return show_page(DEFAULT_PAGE, user_role)
+    roles = page.get("roles")
+    if roles and user_role not in roles:
+        # Redirect unauthorized users
+        st.warning(page["denied"])
+        return show_page(page["fallback"], user_role)
+    result = load_page(name)()
+    if page.get("warmup"):
+        from market_warmup import start_warmup
+        start_warmup()
+    return result
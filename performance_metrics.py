@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+from indicator_engine import drawdown, rolling_mean, rolling_std, simple_returns
+
+# Performance statistics for a price panel (dates x tickers). Returns are
+# computed once and every statistic is a NumPy reduction over that array, so
+# ranking dozens of tickers costs about the same as summarizing one.
+
+# Metrics returned by performance_metrics, in display order
+METRIC_COLUMNS = [
+    "Total Return", "Annualized Return", "Volatility", "Sharpe", "Sortino",
+    "Max Drawdown", "Calmar", "Beta", "Time to Recovery", "Current Drawdown"
+]
+
+# Metrics where a lower value ranks better
+LOWER_IS_BETTER = {"Volatility", "Time to Recovery"}
+
+def _as_panel(prices):
+    return prices.to_frame() if isinstance(prices, pd.Series) else prices
+
+def _nan_mean(values, axis=0):
+    counts = np.sum(~np.isnan(values), axis=axis)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, np.nansum(values, axis=axis) / counts, np.nan), counts
+
+def _beta(returns, benchmark_returns):
+    """Beta of every column against one benchmark return series, on the rows where both are valid"""
+    benchmark = np.broadcast_to(benchmark_returns[:, None], returns.shape)
+    valid = ~np.isnan(returns) & ~np.isnan(benchmark)
+    r = np.where(valid, returns, np.nan)
+    b = np.where(valid, benchmark, np.nan)
+    mean_r, counts = _nan_mean(r)
+    mean_b, _ = _nan_mean(b)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covariance = np.nansum((r - mean_r) * (b - mean_b), axis=0) / (counts - 1)
+        variance = np.nansum((b - mean_b) ** 2, axis=0) / (counts - 1)
+        return np.where(counts > 1, covariance / variance, np.nan)
+
+def _time_to_recovery(values, drawdowns):
+    """Periods from the deepest trough back to the prior peak; NaN if not yet recovered"""
+    n_rows, n_cols = values.shape
+    filled = np.where(np.isnan(drawdowns), np.inf, drawdowns)
+    trough = np.argmin(filled, axis=0)
+    peak_value = np.fmax.accumulate(values, axis=0)[trough, np.arange(n_cols)]
+    rows = np.arange(n_rows)[:, None]
+    recovered = (rows > trough) & (values >= peak_value)
+    first = np.argmax(recovered, axis=0)
+    never = ~recovered.any(axis=0) | np.isinf(filled.min(axis=0)) | (filled.min(axis=0) == 0)
+    return np.where(never, np.nan, first - trough).astype(float)
+
+def performance_metrics(prices, benchmark=None, periods_per_year=252, risk_free_rate=0.0):
+    """Compute the performance statistics of every price column in one pass
+
+    prices is a dates x tickers panel (or a single Series); benchmark is an
+    optional price Series used for beta. Returns, volatility and drawdowns
+    are fractions (0.12 = 12%), Time to Recovery is in periods. Returns one
+    row per ticker with the columns in METRIC_COLUMNS.
+    """
+    panel = _as_panel(prices)
+    values = panel.to_numpy(dtype=float)
+    returns = simple_returns(values)
+    excess = returns - risk_free_rate / periods_per_year
+
+    mean_return, counts = _nan_mean(returns)
+    mean_excess, _ = _nan_mean(excess)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        volatility = np.nanstd(returns, axis=0, ddof=1) * np.sqrt(periods_per_year)
+        downside = np.sqrt(_nan_mean(np.minimum(excess, 0.0) ** 2)[0]) * np.sqrt(periods_per_year)
+    annualized_return = mean_return * periods_per_year
+    annualized_excess = mean_excess * periods_per_year
+
+    drawdowns = drawdown(values)
+    max_drawdown = np.nanmin(drawdowns, axis=0) if len(values) else np.full(values.shape[1], np.nan)
+
+    first_valid = np.argmax(~np.isnan(values), axis=0)
+    last_valid = len(values) - 1 - np.argmax(~np.isnan(values[::-1]), axis=0)
+    columns = np.arange(values.shape[1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        total_return = values[last_valid, columns] / values[first_valid, columns] - 1
+        sharpe = annualized_excess / volatility
+        sortino = annualized_excess / downside
+        calmar = annualized_return / np.abs(max_drawdown)
+
+    if benchmark is not None:
+        benchmark_values = benchmark.reindex(panel.index).to_numpy(dtype=float)
+        beta = _beta(returns, simple_returns(benchmark_values[:, None])[:, 0])
+    else:
+        beta = np.full(values.shape[1], np.nan)
+
+    metrics = pd.DataFrame({
+        "Total Return": total_return,
+        "Annualized Return": annualized_return,
+        "Volatility": volatility,
+        "Sharpe": sharpe,
+        "Sortino": sortino,
+        "Max Drawdown": max_drawdown,
+        "Calmar": calmar,
+        "Beta": beta,
+        "Time to Recovery": _time_to_recovery(values, drawdowns),
+        "Current Drawdown": drawdowns[last_valid, columns]
+    }, index=panel.columns)
+    # Tickers with fewer than two returns have no meaningful statistics
+    metrics.loc[counts < 2] = np.nan
+    return metrics.replace([np.inf, -np.inf], np.nan)
+
+def drawdown_series(prices):
+    """Drawdown from the running peak for every column, as fractions"""
+    panel = _as_panel(prices)
+    return pd.DataFrame(drawdown(panel.to_numpy(dtype=float)), index=panel.index, columns=panel.columns)
+
+def rolling_sharpe(prices, window=63, periods_per_year=252, risk_free_rate=0.0):
+    """Annualized Sharpe ratio over a rolling window of returns for every column"""
+    panel = _as_panel(prices)
+    excess = simple_returns(panel.to_numpy(dtype=float)) - risk_free_rate / periods_per_year
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sharpe = rolling_mean(excess, window) / rolling_std(excess, window) * np.sqrt(periods_per_year)
+    return pd.DataFrame(sharpe, index=panel.index, columns=panel.columns)
+
+def rank_tickers(metrics, by="Sharpe"):
+    """Sort a performance_metrics table best-first on one metric and add its rank"""
+    ascending = by in LOWER_IS_BETTER
+    ranked = metrics.sort_values(by, ascending=ascending, na_position="last")
+    ranked.insert(0, "Rank", ranked[by].rank(ascending=ascending, method="min"))
+    return ranked
@@ -0,0 +1,203 @@
+import re
+import numpy as np
+import pandas as pd
+import streamlit as st
+from indicator_engine import compute_indicator_panels
+from market_data import fetch_info_many, get_price_panel
+from retail_universe import ALL_RETAILERS, universe_tickers
+
+# Retail-universe screener. Every ticker's screen fields are gathered into one
+# table, each condition compiles to a NumPy boolean mask over its columns and
+# the masks are combined, so a screen over hundreds of tickers is a handful of
+# array operations.
+
+# Fundamentals used by the screener: Ticker.info key -> (screen field, scale)
+FUNDAMENTAL_FIELDS = {
+    "marketCap": ("Market Cap ($B)", 1e-9),
+    "trailingPE": ("P/E", 1.0),
+    "revenueGrowth": ("Revenue Growth", 100.0),
+    "profitMargins": ("Profit Margin", 100.0),
+    "dividendYield": ("Dividend Yield", 100.0)
+}
+
+# Screen fields and what they mean; percentages are in percent (5 = 5%)
+SCREEN_FIELDS = {
+    "Price": "Latest adjusted close",
+    "MA20": "20-day moving average",
+    "MA50": "50-day moving average",
+    "MA200": "200-day moving average",
+    "RSI": "14-day Relative Strength Index",
+    "Volatility": "20-day annualized volatility (%)",
+    "Return 1M": "Return over the last 21 trading days (%)",
+    "Return 3M": "Return over the last 63 trading days (%)",
+    "Drawdown": "Decline from the 1-year high (%)",
+    "Drawdown 3M": "Decline from the 3-month high (%)",
+    "Market Cap ($B)": "Market capitalization in billions",
+    "P/E": "Trailing price/earnings",
+    "Revenue Growth": "Year-over-year revenue growth (%)",
+    "Profit Margin": "Profit margin (%)",
+    "Dividend Yield": "Dividend yield (%)"
+}
+
+OPERATORS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal
+}
+
+DEFAULT_CONDITIONS = "Price > MA200\nRSI < 70\nDrawdown 3M < 15"
+
+_CONDITION_PATTERN = re.compile(r"^\s*(.+?)\s*(>=|<=|==|!=|>|<)\s*(.+?)\s*%?\s*$")
+
+def parse_condition(text):
+    """Parse "Field op value" or "Field op Field" into (field, operator, operand)
+
+    Raises ValueError for unknown fields or operators.
+    """
+    match = _CONDITION_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Cannot read condition: {text!r}")
+    field, operator, operand = match.groups()
+    if field not in SCREEN_FIELDS:
+        raise ValueError(f"Unknown field {field!r} in condition {text!r}")
+    if operand in SCREEN_FIELDS:
+        return field, operator, operand
+    try:
+        return field, operator, float(operand)
+    except ValueError:
+        raise ValueError(f"Unknown field or number {operand!r} in condition {text!r}") from None
+
+def compile_condition(condition):
+    """Compile a parsed condition into a function of the screen table returning a boolean mask
+
+    Tickers missing either side of the comparison never pass.
+    """
+    field, operator, operand = condition
+    compare = OPERATORS[operator]
+
+    def mask(columns):
+        left = columns[field]
+        right = columns[operand] if isinstance(operand, str) else operand
+        with np.errstate(invalid="ignore"):
+            return compare(left, right) & ~np.isnan(left) & ~np.isnan(right)
+    return mask
+
+def build_screen_table(prices, infos=None):
+    """Compute every screen field for a dates x tickers price panel plus fundamentals
+
+    infos maps ticker -> Ticker.info dict (or None). Returns one row per ticker.
+    """
+    panels = compute_indicator_panels(prices, ma_windows=(20, 50, 200))
+    # Every indicator takes its last valid value, so a missing last print (a halt,
+    # a late quote) does not blank out the ticker
+    last = {name: panel.ffill().to_numpy()[-1] for name, panel in panels.items()}
+    values = prices.ffill().to_numpy(dtype=float)
+    latest = values[-1]
+
+    def lookback_return(days):
+        base = values[-days - 1] if len(values) > days else values[0]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (latest / base - 1) * 100
+
+    def decline_from_high(days):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (1 - latest / np.nanmax(values[-days:], axis=0)) * 100
+
+    table = pd.DataFrame({
+        "Price": latest,
+        "MA20": last["MA20"],
+        "MA50": last["MA50"],
+        "MA200": last["MA200"],
+        "RSI": last["RSI"],
+        "Volatility": last["Volatility"] * 100,
+        "Return 1M": lookback_return(21),
+        "Return 3M": lookback_return(63),
+        "Drawdown": decline_from_high(252),
+        "Drawdown 3M": decline_from_high(63)
+    }, index=prices.columns)
+
+    infos = infos or {}
+    for key, (field, scale) in FUNDAMENTAL_FIELDS.items():
+        raw = [(infos.get(ticker) or {}).get(key) for ticker in prices.columns]
+        table[field] = pd.to_numeric(pd.Series(raw, index=prices.columns), errors="coerce").to_numpy() * scale
+    return table
+
+def run_screen(table, conditions, match="all", rank_by=None, ascending=False):
+    """Return the rows of the screen table passing the conditions, best first
+
+    match is "all" (every condition) or "any" (at least one).
+    """
+    columns = {field: table[field].to_numpy(dtype=float) for field in table.columns if field in SCREEN_FIELDS}
+    masks = [compile_condition(condition)(columns) for condition in conditions]
+    if masks:
+        combine = np.logical_and if match == "all" else np.logical_or
+        passed = combine.reduce(masks)
+    else:
+        passed = np.ones(len(table), dtype=bool)
+    result = table[passed]
+    if rank_by:
+        order = np.argsort(result[rank_by].to_numpy(dtype=float) * (1 if ascending else -1), kind="stable")
+        result = result.iloc[order]
+    return result
+
+def _categories():
+    categories = {}
+    for category, tickers in ALL_RETAILERS.items():
+        for ticker in tickers:
+            categories.setdefault(ticker, category)
+    return categories
+
+def show_retail_screener():
+    """Display the retail-universe screener"""
+    st.title("Retail Universe Screener")
+    st.markdown("Screen the ECG retail universe on technical and fundamental conditions.")
+
+    with st.expander("Available fields"):
+        st.table(pd.DataFrame({"Meaning": SCREEN_FIELDS}))
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        condition_text = st.text_area(
+            "Conditions (one per line, e.g. RSI < 30 or Price > MA200):",
+            value=DEFAULT_CONDITIONS,
+            height=140
+        )
+    with col2:
+        match = st.radio("Match", ["all", "any"], format_func=lambda m: f"{m.title()} conditions", horizontal=True)
+        rank_by = st.selectbox("Rank by", list(SCREEN_FIELDS), index=list(SCREEN_FIELDS).index("Return 3M"))
+        ascending = st.checkbox("Lowest first", value=rank_by in ("Drawdown", "Drawdown 3M", "Volatility", "P/E"))
+        extra = st.text_input("Additional tickers (comma separated):", "")
+
+    conditions = []
+    for line in condition_text.splitlines():
+        if line.strip():
+            try:
+                conditions.append(parse_condition(line))
+            except ValueError as e:
+                st.error(str(e))
+                return
+
+    tickers = universe_tickers() + [t.strip().upper() for t in extra.split(",") if t.strip()]
+    tickers = list(dict.fromkeys(tickers))
+
+    with st.spinner("Screening..."):
+        try:
+            prices = get_price_panel(tickers, period="1y")
+            prices = prices.dropna(axis=1, how="all")
+            infos = fetch_info_many(prices.columns, fields=list(FUNDAMENTAL_FIELDS))
+            table = build_screen_table(prices, infos)
+        except Exception as e:
+            st.error(f"Error loading screener data: {e}")
+            return
+
+    result = run_screen(table, conditions, match, rank_by, ascending)
+    result.insert(0, "Category", result.index.map(_categories()).fillna("Custom"))
+
+    st.subheader(f"{len(result)} of {len(table)} tickers match")
+    if result.empty:
+        st.info("No tickers match these conditions.")
+        return
+    st.dataframe(result.style.format(precision=2, na_rep="N/A"), use_container_width=True)
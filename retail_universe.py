@@ -0,0 +1,44 @@
+# Retailers offered in the ECG Retailer Comparison, by category
+ALL_RETAILERS = {
+    "Department Stores": ["M", "KSS", "DDS", "JWN"],
+    "Big Box": ["WMT", "TGT"],
+    "Specialty Apparel": ["GPS", "URBN", "ANF", "AEO", "LEVI"],
+    "Luxury": ["TPR", "CPRI", "RL"],
+    "Off-Price": ["TJX", "ROST", "BURL"],
+    "Athletic": ["NKE", "UAA", "LULU"],
+    "E-commerce": ["AMZN", "ETSY", "W"],
+    "Indices": ["XRT", "RTH", "VCR"]
+}
+
+# Department store proxies for JC Penney and its parent company
+PROXY_TICKERS = ["M", "KSS", "DDS", "JWN", "XRT"]
+PARENT_TICKER = "SPG"
+
+# Retail sector ETF used as the benchmark for beta
+BENCHMARK_TICKER = "XRT"
+
+# Time periods offered in the retailer comparison
+COMPARISON_PERIODS = {
+    "1 Month": "1mo",
+    "3 Months": "3mo",
+    "6 Months": "6mo",
+    "Year to Date": "ytd",
+    "1 Year": "1y",
+    "3 Years": "3y",
+    "5 Years": "5y"
+}
+
+# Years of history used for the seasonal analysis
+SEASONAL_YEARS = 5
+
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+QUARTER_NAMES = ["Q1", "Q2", "Q3", "Q4"]
+
+def universe_tickers():
+    """Return every ticker of the retail universe, without duplicates"""
+    tickers = [ticker for tickers in ALL_RETAILERS.values() for ticker in tickers]
+    return list(dict.fromkeys(tickers + PROXY_TICKERS + [PARENT_TICKER]))
+
+def normalize_prices(prices):
+    """Rebase every price column to 100 at its first row"""
+    return prices / prices.iloc[0] * 100
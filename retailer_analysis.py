@@ -1,11 +1,20 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import yfinance as yf
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
-from visualization import calculate_moving_averages, calculate_rsi, create_candlestick_chart, create_technical_chart, create_rsi_chart
+from market_data import get_history, get_histories, get_price_panel, get_seasonal_cube, fetch_info_many
+from indicator_engine import latest_indicators
+from performance_metrics import METRIC_COLUMNS, performance_metrics, rank_tickers
+from correlation_engine import CORRELATION_WINDOWS, cluster_order, get_rolling_covariance, rolling_correlation, top_pairs
+from seasonal_cube import MEASURES as SEASONAL_MEASURES, last_closed_month
+from market_data_cache import period_to_start
+from market_warmup import get_warm_normalized
+from retail_universe import ALL_RETAILERS, BENCHMARK_TICKER, PROXY_TICKERS, COMPARISON_PERIODS, SEASONAL_YEARS, normalize_prices
+from visualization import create_candlestick_chart, create_technical_chart, create_rsi_chart
+from figure_encoding import render_chart
+from lazy_tabs import lazy_tabs
 
 def show_retailer_analysis():
     """Display the ECG Market Health Check for major clothing retailers"""
@@ -21,18 +30,18 @@ def show_retailer_analysis():
     """, unsafe_allow_html=True)
     
     # Create layout
-    tabs = st.tabs(["JC Penney Analysis", "ECG Retailer Comparison", "Industry Market Pulse"])
+    tabs = lazy_tabs(["JC Penney Analysis", "ECG Retailer Comparison", "Industry Market Pulse"], key="retailer_analysis_tab")
     
     # JC Penney Analysis tab
-    with tabs[0]:
+    if tabs[0]:
         show_jcpenney_analysis()
     
     # ECG Retailer Comparison tab
-    with tabs[1]:
+    if tabs[1]:
         show_retailer_comparison()
     
     # Industry Market Pulse tab
-    with tabs[2]:
+    if tabs[2]:
         show_industry_trends()
     
     # Market insights
@@ -140,7 +149,7 @@ def show_jcpenney_analysis():
                     recent_date = min(end_date, datetime.now().date())
                     start_preview = (datetime.strptime(str(recent_date), "%Y-%m-%d") - timedelta(days=30)).date()
                     
-                    spg_preview = yf.download("SPG", start=start_preview, end=recent_date)
+                    spg_preview = get_history("SPG", start=start_preview, end=recent_date)
                     if not spg_preview.empty:
                         # Create a simple preview chart
                         fig = px.line(
@@ -149,7 +158,7 @@ def show_jcpenney_analysis():
                             labels={"value": "Price ($)", "variable": ""},
                             template="plotly_dark"
                         )
-                        st.plotly_chart(fig, use_container_width=True)
+                        render_chart(fig, use_container_width=True)
                         st.caption("Click 'Simon Property Group (SPG) Analysis' above for detailed analysis")
                 except:
                     pass
@@ -172,21 +181,17 @@ def show_jcpenney_analysis():
             with st.spinner("Fetching SPG data..."):
                 try:
                     # Get SPG data
-                    spg_data = yf.download("SPG", start=spg_start_date, end=spg_end_date)
+                    spg_data = get_history("SPG", start=spg_start_date, end=spg_end_date)
                     
                     if not spg_data.empty:
                         # Display basic info
                         display_stock_info(spg_data, "SPG")
                         
-                        # Create technical analysis charts
-                        spg_data_ma = calculate_moving_averages(spg_data)
-                        spg_data_ma['RSI'] = calculate_rsi(spg_data)
-                        
-                        # Display charts
+                        # Display technical analysis charts (indicators are computed and memoized inside the chart builders)
                         st.subheader("Technical Analysis")
-                        st.plotly_chart(create_candlestick_chart(spg_data, "Simon Property Group Price (SPG)"), use_container_width=True)
-                        st.plotly_chart(create_technical_chart(spg_data_ma, "Simon Property Group with Moving Averages"), use_container_width=True)
-                        st.plotly_chart(create_rsi_chart(spg_data_ma, "Simon Property Group RSI"), use_container_width=True)
+                        render_chart(create_candlestick_chart(spg_data, "Simon Property Group Price (SPG)"), use_container_width=True)
+                        render_chart(create_technical_chart(spg_data, "Simon Property Group with Moving Averages"), use_container_width=True)
+                        render_chart(create_rsi_chart(spg_data, "Simon Property Group RSI"), use_container_width=True)
                         
                         # Relationship to JC Penney
                         st.subheader("Relationship to JC Penney")
@@ -222,7 +227,7 @@ def show_jcpenney_analysis():
         # Select comparison retailers
         retailers = st.multiselect(
             "Select retailers for comparison:",
-            ["M", "KSS", "DDS", "JWN", "XRT"],
+            PROXY_TICKERS,
             default=["M", "KSS", "JWN", "XRT"],
             help="M: Macy's, KSS: Kohl's, DDS: Dillard's, JWN: Nordstrom, XRT: S&P Retail ETF"
         )
@@ -232,8 +237,9 @@ def show_jcpenney_analysis():
             if proxy_start_date < proxy_end_date:
                 with st.spinner("Fetching retailer data..."):
                     try:
-                        # Get data
-                        retailer_data = yf.download(retailers, start=proxy_start_date, end=proxy_end_date)['Adj Close']
+                        # Get data for all retailers in one batched download
+                        retailer_histories = get_histories(retailers, start=proxy_start_date, end=proxy_end_date)
+                        retailer_data = pd.DataFrame({ticker: frame['Adj Close'] for ticker, frame in retailer_histories.items()})
                         
                         if not retailer_data.empty:
                             # Normalize data
@@ -255,7 +261,7 @@ def show_jcpenney_analysis():
                                 hovermode="x unified"
                             )
                             
-                            st.plotly_chart(fig, use_container_width=True)
+                            render_chart(fig, use_container_width=True)
                             
                             # Industry analysis
                             st.subheader("Department Store Industry Analysis")
@@ -284,8 +290,8 @@ def show_jcpenney_analysis():
                                     curr_price = retailer_data[ticker].iloc[-1]
                                     perf = (normalized_data[ticker].iloc[-1] - 100)
                                     
-                                    # Get volume data
-                                    vol_data = yf.download(ticker, start=proxy_end_date - timedelta(days=5), end=proxy_end_date)
+                                    # Get volume data for the last 5 days of the already fetched history
+                                    vol_data = retailer_histories[ticker].loc[pd.Timestamp(proxy_end_date - timedelta(days=5)):]
                                     avg_vol = vol_data['Volume'].mean() if not vol_data.empty else 0
                                     
                                     # Add to performance data
@@ -328,46 +334,24 @@ def show_retailer_comparison():
     
     st.subheader("ECG Retailer Comparison Analysis")
     
-    # Select retailers for comparison
-    all_retailers = {
-        "Department Stores": ["M", "KSS", "DDS", "JWN"],
-        "Big Box": ["WMT", "TGT"],
-        "Specialty Apparel": ["GPS", "URBN", "ANF", "AEO", "LEVI"],
-        "Luxury": ["TPR", "CPRI", "RL"],
-        "Off-Price": ["TJX", "ROST", "BURL"],
-        "Athletic": ["NKE", "UAA", "LULU"],
-        "E-commerce": ["AMZN", "ETSY", "W"],
-        "Indices": ["XRT", "RTH", "VCR"]
-    }
-    
     # Retailer selection
     st.markdown("Select retailers to compare across different categories")
     
     selected_retailers = []
-    for category, tickers in all_retailers.items():
+    for category, tickers in ALL_RETAILERS.items():
         with st.expander(f"{category} Retailers"):
             for ticker in tickers:
                 if st.checkbox(ticker, key=f"compare_{ticker}"):
                     selected_retailers.append(ticker)
     
     # Time period selection
-    periods = {
-        "1 Month": "1mo",
-        "3 Months": "3mo",
-        "6 Months": "6mo",
-        "Year to Date": "ytd",
-        "1 Year": "1y",
-        "3 Years": "3y",
-        "5 Years": "5y"
-    }
-    
-    selected_period = st.selectbox("Select Time Period", list(periods.keys()))
-    period = periods[selected_period]
+    selected_period = st.selectbox("Select Time Period", list(COMPARISON_PERIODS.keys()))
+    period = COMPARISON_PERIODS[selected_period]
     
     # Analysis type
     analysis_type = st.radio(
         "Select Analysis Type",
-        ["Price Performance", "Key Metrics", "Seasonal Analysis"],
+        ["Price Performance", "Key Metrics", "Correlation", "Seasonal Analysis"],
         horizontal=True
     )
     
@@ -377,14 +361,16 @@ def show_retailer_comparison():
             
             with st.spinner("Fetching price data..."):
                 try:
-                    # Get data
-                    price_data = yf.download(selected_retailers, period=period)['Adj Close']
+                    # Get data; the benchmark comes along in the same batched download
+                    panel = get_price_panel(list(dict.fromkeys(selected_retailers + [BENCHMARK_TICKER])), period=period)
+                    benchmark = panel[BENCHMARK_TICKER] if BENCHMARK_TICKER in panel else None
+                    price_data = panel[[ticker for ticker in selected_retailers if ticker in panel]]
                     
                     if not price_data.empty:
-                        # Normalize data for better visualization
-                        norm_price_data = price_data.copy()
-                        for col in norm_price_data.columns:
-                            norm_price_data[col] = norm_price_data[col] / norm_price_data[col].iloc[0] * 100
+                        # Normalize data for better visualization (precomputed by the warm-up job when available)
+                        norm_price_data = get_warm_normalized(selected_retailers, period)
+                        if norm_price_data is None:
+                            norm_price_data = normalize_prices(price_data)
                         
                         # Plot normalized performance
                         fig = px.line(
@@ -400,25 +386,44 @@ def show_retailer_comparison():
                             hovermode="x unified"
                         )
                         
-                        st.plotly_chart(fig, use_container_width=True)
-                        
-                        # Calculate performance metrics
-                        returns = price_data.pct_change().dropna()
+                        render_chart(fig, use_container_width=True)
                         
-                        # Volatility
-                        volatility = returns.std() * np.sqrt(252)  # Annualized volatility
+                        # Performance ranking, computed for all selected retailers in one vectorized pass
+                        st.subheader("Performance Ranking")
                         
-                        # Total return
-                        total_return = (price_data.iloc[-1] / price_data.iloc[0] - 1) * 100
-                        
-                        # Create metrics table
+                        rank_by = st.selectbox("Rank by", METRIC_COLUMNS, index=METRIC_COLUMNS.index("Sharpe"))
+                        metrics = rank_tickers(performance_metrics(price_data, benchmark=benchmark), by=rank_by)
+                        format_pct = lambda x: f"{x * 100:.2f}%" if pd.notna(x) else "N/A"
+                        format_ratio = lambda x: f"{x:.2f}" if pd.notna(x) else "N/A"
                         metrics_df = pd.DataFrame({
-                            "Total Return (%)": total_return.map(lambda x: f"{x:.2f}%"),
-                            "Annualized Volatility (%)": volatility.map(lambda x: f"{x*100:.2f}%"),
-                            "Current Price ($)": price_data.iloc[-1].map(lambda x: f"${x:.2f}")
+                            "Rank": metrics["Rank"].map(lambda x: f"{x:.0f}" if pd.notna(x) else "-"),
+                            "Total Return (%)": metrics["Total Return"].map(format_pct),
+                            "Annualized Volatility (%)": metrics["Volatility"].map(format_pct),
+                            "Sharpe": metrics["Sharpe"].map(format_ratio),
+                            "Sortino": metrics["Sortino"].map(format_ratio),
+                            "Calmar": metrics["Calmar"].map(format_ratio),
+                            "Max Drawdown (%)": metrics["Max Drawdown"].map(format_pct),
+                            f"Beta vs {BENCHMARK_TICKER}": metrics["Beta"].map(format_ratio),
+                            "Time to Recovery (days)": metrics["Time to Recovery"].map(lambda x: f"{x:.0f}" if pd.notna(x) else "Not recovered"),
+                            "Current Price ($)": price_data.ffill().iloc[-1].reindex(metrics.index).map(lambda x: f"${x:.2f}")
                         })
                         
                         st.table(metrics_df)
+                        
+                        # Technical snapshot, computed for all selected retailers in one vectorized pass
+                        st.subheader("Technical Snapshot")
+                        
+                        latest = latest_indicators(price_data)
+                        format_pct = lambda x: f"{x:.2f}%" if pd.notna(x) else "N/A"
+                        technical_df = pd.DataFrame({
+                            "Price vs 50-day MA": ((latest["Close"] / latest["MA50"] - 1) * 100).map(format_pct),
+                            "Price vs 200-day MA": ((latest["Close"] / latest["MA200"] - 1) * 100).map(format_pct),
+                            "RSI (14)": latest["RSI"].map(lambda x: f"{x:.1f}" if pd.notna(x) else "N/A"),
+                            "20-day Volatility (Annualized)": (latest["Volatility"] * 100).map(format_pct),
+                            "Drawdown from Peak": (latest["Drawdown"] * 100).map(format_pct)
+                        })
+                        
+                        st.table(technical_df)
                     else:
                         st.warning("No price data available for the selected retailers and time period.")
                 except Exception as e:
@@ -438,11 +443,18 @@ def show_retailer_comparison():
                     "Profit Margin (%)": []
                 }
                 
+                # Look up all tickers concurrently instead of one after another
+                infos = fetch_info_many(
+                    selected_retailers,
+                    fields=["marketCap", "trailingPE", "dividendYield", "revenueGrowth", "profitMargins"]
+                )
+                
                 for ticker in selected_retailers:
                     try:
                         # Get stock info
-                        stock = yf.Ticker(ticker)
-                        info = stock.info
+                        info = infos[ticker]
+                        if info is None:
+                            raise LookupError(f"No fundamentals returned for {ticker}")
                         
                         # Add basic info
                         metrics["Ticker"].append(ticker)
@@ -489,71 +501,130 @@ def show_retailer_comparison():
                 else:
                     st.warning("No metrics data available for the selected retailers.")
         
+        elif analysis_type == "Correlation":
+            st.subheader("Return Correlation")
+            
+            window_label = st.select_slider("Correlation window", options=list(CORRELATION_WINDOWS), value="3 Months (63d)")
+            window = CORRELATION_WINDOWS[window_label]
+            
+            with st.spinner("Computing correlations..."):
+                try:
+                    # Enough history for the window even when a short period is selected
+                    history_period = period if period_to_start(period) <= period_to_start("1y") else "1y"
+                    panel = get_price_panel(list(dict.fromkeys(selected_retailers + [BENCHMARK_TICKER])), period=history_period)
+                    price_data = panel[[ticker for ticker in selected_retailers if ticker in panel]]
+                    
+                    if price_data.shape[1] >= 2 and len(price_data) > window:
+                        # The engine for this window is cached and only takes the bars it has not seen
+                        engine = get_rolling_covariance(price_data, window)
+                        corr = engine.correlation()
+                        order, _ = cluster_order(corr)
+                        ordered = corr.loc[order, order]
+                        
+                        fig = px.imshow(
+                            ordered,
+                            x=order,
+                            y=order,
+                            zmin=-1,
+                            zmax=1,
+                            color_continuous_scale="RdBu_r",
+                            labels=dict(color="Correlation"),
+                            title=f"Return Correlation, Last {window} Trading Days (clustered)",
+                            text_auto=".2f" if len(order) <= 15 else False
+                        )
+                        fig.update_layout(height=max(400, 30 * len(order)))
+                        render_chart(fig, use_container_width=True)
+                        
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            st.markdown("**Move Together Most**")
+                            st.dataframe(top_pairs(corr, 5).style.format({"Correlation": "{:.2f}"}), hide_index=True)
+                        with col2:
+                            st.markdown("**Most Independent**")
+                            st.dataframe(top_pairs(corr, 5, ascending=True).style.format({"Correlation": "{:.2f}"}), hide_index=True)
+                        
+                        if BENCHMARK_TICKER in panel:
+                            rolling = rolling_correlation(price_data, panel[BENCHMARK_TICKER], window).dropna(how="all")
+                            fig = px.line(
+                                rolling,
+                                title=f"Rolling {window}-day Correlation with {BENCHMARK_TICKER}",
+                                labels={"value": "Correlation", "variable": "Retailer"},
+                                template="plotly_dark"
+                            )
+                            fig.update_layout(height=400, yaxis=dict(range=[-1, 1]), hovermode="x unified")
+                            render_chart(fig, use_container_width=True)
+                        
+                        st.caption(
+                            "Retailers that move together share demand drivers; spreading production "
+                            "capacity across weakly correlated names reduces concentration risk."
+                        )
+                    else:
+                        st.warning("Select at least two retailers with enough price history for the chosen window.")
+                except Exception as e:
+                    st.error(f"Error computing correlations: {e}")
+        
         else:  # Seasonal Analysis
             st.subheader("Seasonal Performance Analysis")
             
             with st.spinner("Analyzing seasonal patterns..."):
                 try:
-                    # Get 5 years of historical data for seasonal analysis
-                    end_date = datetime.now()
-                    start_date = end_date - timedelta(days=5*365)
+                    # The seasonal cube holds closed-month aggregates; only months it has not seen yet are fetched
+                    history_years = st.select_slider(
+                        "Years of history", options=[SEASONAL_YEARS, 10, 15, 20], value=SEASONAL_YEARS
+                    )
+                    cube = get_seasonal_cube()
+                    last_month = last_closed_month()
+                    cube.update(selected_retailers, last_month - history_years * 12 + 1, last_month)
                     
-                    seasonal_data = yf.download(selected_retailers, start=start_date, end=end_date)['Adj Close']
+                    available_years = cube.years(selected_retailers)
+                    seasonal_tables = None
+                    if available_years is not None:
+                        first_year, last_year = available_years
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            year_window = st.slider(
+                                "Years", min_value=first_year, max_value=last_year,
+                                value=(max(first_year, last_year - SEASONAL_YEARS + 1), last_year)
+                            ) if last_year > first_year else (first_year, last_year)
+                        with col2:
+                            measure = st.radio(
+                                "Measure", list(SEASONAL_MEASURES),
+                                format_func=SEASONAL_MEASURES.get, horizontal=True
+                            )
+                        seasonal_tables = cube.slice(selected_retailers, year_window[0], year_window[1], measure)
                     
-                    if not seasonal_data.empty:
-                        # Add month column for grouping
-                        returns_data = seasonal_data.pct_change().dropna()
-                        returns_data['Month'] = returns_data.index.month
-                        
-                        # Calculate average monthly returns
-                        monthly_returns = {}
-                        month_names = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-                        
-                        for ticker in selected_retailers:
-                            ticker_returns = returns_data.groupby('Month')[ticker].mean() * 100  # Convert to percentage
-                            monthly_returns[ticker] = ticker_returns.values
-                        
-                        # Create seasonal heatmap data
-                        seasonal_df = pd.DataFrame(monthly_returns, index=month_names)
+                    if seasonal_tables is not None and not seasonal_tables[0].empty:
+                        # Average monthly returns
+                        seasonal_df, quarterly_df = seasonal_tables
+                        month_names = list(seasonal_df.index)
                         
                         # Create heatmap
                         fig = px.imshow(
                             seasonal_df.T,
-                            labels=dict(x="Month", y="Retailer", color="Avg. Monthly Return (%)"),
+                            labels=dict(x="Month", y="Retailer", color=SEASONAL_MEASURES[measure]),
                             x=month_names,
                             y=seasonal_df.columns,
                             color_continuous_scale="RdBu_r",
-                            title="Average Monthly Returns by Retailer (%)"
+                            title=f"{SEASONAL_MEASURES[measure]} by Month and Retailer ({year_window[0]}-{year_window[1]})"
                         )
                         
                         fig.update_layout(height=500)
-                        st.plotly_chart(fig, use_container_width=True)
+                        render_chart(fig, use_container_width=True)
                         
                         # Quarterly analysis
                         st.subheader("Quarterly Performance Patterns")
                         
-                        # Create quarterly data
-                        returns_data['Quarter'] = returns_data.index.quarter
-                        quarterly_returns = {}
-                        quarter_names = ["Q1", "Q2", "Q3", "Q4"]
-                        
-                        for ticker in selected_retailers:
-                            ticker_returns = returns_data.groupby('Quarter')[ticker].mean() * 100
-                            quarterly_returns[ticker] = ticker_returns.values
-                        
-                        quarterly_df = pd.DataFrame(quarterly_returns, index=quarter_names)
-                        
                         # Create quarterly bar chart
                         fig = px.bar(
                             quarterly_df,
-                            title="Average Quarterly Returns (%)",
+                            title=f"{SEASONAL_MEASURES[measure]} by Quarter",
                             labels={"value": "Return (%)", "variable": "Retailer"},
                             barmode="group",
                             template="plotly_dark"
                         )
                         
                         fig.update_layout(height=500)
-                        st.plotly_chart(fig, use_container_width=True)
+                        render_chart(fig, use_container_width=True)
                         
                         # Seasonal insights
                         st.markdown("""
@@ -629,7 +700,7 @@ def show_industry_trends():
             height=500
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
         
         # Sales trends by category
         st.subheader("Sales Trends by Category")
@@ -654,7 +725,7 @@ def show_industry_trends():
         )
         
         fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
         
         # Seasonal sales patterns
         st.subheader("Seasonal Sales Patterns")
@@ -678,7 +749,7 @@ def show_industry_trends():
         )
         
         fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
     
     elif trend_categories == "E-commerce vs. Physical":
         # E-commerce trends
@@ -703,7 +774,7 @@ def show_industry_trends():
         )
         
         fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
         
         # Channel performance
         st.subheader("Channel Performance Metrics")
@@ -770,7 +841,7 @@ def show_industry_trends():
             legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5)
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
         
         # Income group spending analysis
         st.subheader("Spending by Income Segment")
@@ -797,7 +868,7 @@ def show_industry_trends():
         )
         
         fig.update_layout(height=450)
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
         
         # Consumer behavior insights
         st.markdown("""
@@ -855,7 +926,7 @@ def show_industry_trends():
             yaxis2=dict(title="Inventory Turns", overlaying="y", side="right")
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
         
         # Lead time analysis
         st.subheader("Production & Shipping Lead Times")
@@ -902,7 +973,7 @@ def show_industry_trends():
         )
         
         fig.update_layout(height=450)
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
         
         # Supply chain insights
         st.info("""
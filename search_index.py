@@ -0,0 +1,151 @@
+import re
+import threading
+from array import array
+import numpy as np
+
+# Trigram search over short text records (SKUs, product names, HSN codes).
+#
+# Every record's fields are lowercased and broken into overlapping trigrams;
+# each trigram keeps a posting list of the records containing it. Records get
+# increasing internal ids, so appending keeps every posting list sorted and
+# adding a record never touches existing ones. A query token of three or more
+# characters is looked up by its trigrams and matches anywhere in a field;
+# one- and two-character tokens match the start of a word. Candidates from
+# the intersected posting lists are then checked against the text, so
+# trigrams that happen to co-occur out of order never produce a false match.
+#
+# Query cost depends on the posting lists of the query's trigrams, not on how
+# many records were added before.
+
+WORD_PREFIX = "\x01"
+# Joins a record's fields (and brackets them) in the text that is verified
+FIELD_SEPARATOR = "\x00"
+
+_TOKEN = re.compile(r"[^\W_]+", re.UNICODE)
+
+# Ranking, best first
+EXACT, FIELD_PREFIX, WORD_PREFIXES, SUBSTRING = 4, 3, 2, 1
+
+def normalize(text):
+    return " ".join(str(text).lower().split())
+
+def record_grams(fields):
+    """Every trigram of the fields plus one- and two-character word prefixes"""
+    grams = set()
+    for field in fields:
+        for i in range(len(field) - 2):
+            grams.add(field[i:i + 3])
+        for word in _TOKEN.findall(field):
+            grams.add(WORD_PREFIX + word[:1])
+            grams.add(WORD_PREFIX + word[:2])
+    return grams
+
+def query_grams(token):
+    if len(token) >= 3:
+        return {token[i:i + 3] for i in range(len(token) - 2)}
+    return {WORD_PREFIX + token}
+
+def _scorer(query, tokens):
+    """Return a function ranking a record's joined text for the query (0 if it does not match)
+
+    Short tokens need no check: their word-prefix gram only occurs in records
+    where a word starts with them.
+    """
+    long_tokens = [token for token in tokens if len(token) >= 3]
+    word_starts = [re.compile(r"(?<![^\W_])" + re.escape(token)) for token in tokens]
+    field_start = FIELD_SEPARATOR + query
+
+    def score(text):
+        if not all(token in text for token in long_tokens):
+            return 0
+        if (field_start + FIELD_SEPARATOR) in text:
+            return EXACT
+        if field_start in text:
+            return FIELD_PREFIX
+        if all(pattern.search(text) for pattern in word_starts):
+            return WORD_PREFIXES
+        return SUBSTRING
+    return score
+
+class NgramIndex:
+    """Incrementally updated trigram index for substring and word-prefix search"""
+
+    def __init__(self):
+        self._keys = []
+        self._texts = []
+        self._ids = {}
+        self._postings = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, key):
+        return key in self._ids
+
+    def add(self, key, *fields):
+        """Index a record under key; adding an existing key replaces its fields"""
+        fields = tuple(normalize(field) for field in fields if field is not None)
+        text = FIELD_SEPARATOR + FIELD_SEPARATOR.join(fields) + FIELD_SEPARATOR
+        with self._lock:
+            previous = self._ids.get(key)
+            if previous is not None:
+                if self._texts[previous] == text:
+                    return
+                # The old entry stays in its posting lists but no longer verifies
+                self._texts[previous] = None
+            doc = len(self._keys)
+            self._keys.append(key)
+            self._texts.append(text)
+            self._ids[key] = doc
+            for gram in record_grams(fields):
+                postings = self._postings.get(gram)
+                if postings is None:
+                    postings = self._postings[gram] = array("q")
+                postings.append(doc)
+
+    def add_many(self, records):
+        """Index (key, field, ...) tuples"""
+        for key, *fields in records:
+            self.add(key, *fields)
+
+    def search(self, query, limit=None):
+        """Return the keys of records matching every word of the query, best match first
+
+        Ranking: whole field equals the query, field starts with it, every
+        query word starts a word, then plain substring matches; ties go to
+        the shorter record, then the most recently added one.
+        """
+        return [key for key, _ in self.ranked(query, limit)]
+
+    def ranked(self, query, limit=None):
+        """Like search, but return (key, rank) pairs; rank is EXACT, FIELD_PREFIX, WORD_PREFIXES or SUBSTRING"""
+        query = normalize(query)
+        tokens = query.split()
+        if not tokens:
+            return []
+        with self._lock:
+            grams = set().union(*(query_grams(token) for token in tokens))
+            postings = [self._postings.get(gram) for gram in grams]
+            if any(p is None for p in postings):
+                return []
+            postings.sort(key=len)
+            candidates = np.frombuffer(postings[0], dtype=np.int64)
+            for p in postings[1:]:
+                if not len(candidates):
+                    break
+                candidates = np.intersect1d(candidates, np.frombuffer(p, dtype=np.int64), assume_unique=True)
+            # Views over a posting list would stop add() from growing it
+            docs = candidates[::-1].tolist()
+            del candidates
+            texts = self._texts
+            keys = self._keys
+            score = _scorer(query, tokens)
+            scored = []
+            for doc in docs:
+                text = texts[doc]
+                rank = score(text) if text is not None else 0
+                if rank:
+                    scored.append((-rank, len(text), -doc))
+        scored.sort()
+        return [(keys[-doc], -rank) for rank, _, doc in scored[:limit]]
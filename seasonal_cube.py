@@ -0,0 +1,199 @@
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from app_config import cache_path
+from retail_universe import MONTH_NAMES, QUARTER_NAMES
+
+# Persistent ticker x year x month return aggregates for the seasonal analysis.
+# Only closed months are stored, so a stored month never changes; each refresh
+# downloads just the months that closed since the last one. Any year window is
+# answered from the stored aggregates without touching raw prices.
+
+# Seasonal measures offered by SeasonalCube.slice
+MEASURES = {
+    "avg_daily": "Average daily return (%)",
+    "avg_monthly": "Average monthly return (%)"
+}
+
+def month_index(timestamp):
+    """Months since year 0 for a timestamp (used as the cube's month key)"""
+    return timestamp.year * 12 + timestamp.month - 1
+
+def month_start(index):
+    """First day of the month with the given month index"""
+    return pd.Timestamp(year=index // 12, month=index % 12 + 1, day=1)
+
+def last_closed_month(now=None):
+    """Month index of the most recent month that has ended"""
+    now = now if now is not None else pd.Timestamp.now()
+    return month_index(now) - 1
+
+def monthly_aggregates(prices, first_month, last_month):
+    """Aggregate daily returns of a dates x tickers panel into one row per (ticker, year, month)
+
+    Only months in [first_month, last_month] are returned. The panel should
+    start a few days before first_month so its first daily return is known.
+    """
+    returns = prices.sort_index().pct_change(fill_method=None)
+    months = returns.index.year * 12 + returns.index.month - 1
+    returns = returns[(months >= first_month) & (months <= last_month)]
+    if returns.empty:
+        return pd.DataFrame(columns=["ticker", "year", "month", "return_sum", "log_return_sum", "days"])
+
+    values = returns.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        logs = np.where(valid, np.log1p(values), 0.0)
+    grouped = pd.DataFrame(
+        np.hstack([np.where(valid, values, 0.0), logs, valid.astype(float)]),
+        index=returns.index.year * 12 + returns.index.month - 1
+    ).groupby(level=0).sum()
+
+    n_tickers = len(prices.columns)
+    sums, log_sums, days = np.split(grouped.to_numpy(), 3, axis=1)
+    rows = pd.DataFrame({
+        "ticker": np.tile(prices.columns.to_numpy(), len(grouped)),
+        "year": np.repeat(grouped.index.to_numpy() // 12, n_tickers),
+        "month": np.repeat(grouped.index.to_numpy() % 12 + 1, n_tickers),
+        "return_sum": sums.ravel(),
+        "log_return_sum": log_sums.ravel(),
+        "days": days.ravel().astype(int)
+    })
+    return rows[rows["days"] > 0]
+
+class SeasonalCube:
+    """Persistent seasonal return aggregates that only ever add newly closed months"""
+
+    def __init__(self, price_loader, path=None):
+        # price_loader(tickers, start, end) -> dates x tickers DataFrame of adjusted closes;
+        # tickers whose prices failed to load are left out of the columns
+        self.price_loader = price_loader
+        self.path = path or cache_path("seasonal_cube.sqlite")
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS seasonal (
+                    ticker TEXT NOT NULL,
+                    year INTEGER NOT NULL,
+                    month INTEGER NOT NULL,
+                    return_sum REAL NOT NULL,
+                    log_return_sum REAL NOT NULL,
+                    days INTEGER NOT NULL,
+                    PRIMARY KEY (ticker, year, month)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS coverage (
+                    ticker TEXT PRIMARY KEY,
+                    first_month INTEGER NOT NULL,
+                    last_month INTEGER NOT NULL
+                )
+            """)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def coverage(self, ticker):
+        """Return the (first, last) month indices already aggregated for a ticker, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT first_month, last_month FROM coverage WHERE ticker = ?", (ticker,)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def missing_ranges(self, ticker, first_month, last_month):
+        """Return the (first, last) month ranges that must be aggregated to answer a request"""
+        covered = self.coverage(ticker)
+        if covered is None:
+            return [(first_month, last_month)] if first_month <= last_month else []
+        ranges = []
+        if first_month < covered[0]:
+            ranges.append((first_month, covered[0] - 1))
+        if last_month > covered[1]:
+            ranges.append((covered[1] + 1, last_month))
+        return ranges
+
+    def store(self, rows, tickers, first_month, last_month):
+        """Insert aggregated months and extend the covered range of every ticker"""
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO seasonal VALUES (?, ?, ?, ?, ?, ?)",
+                rows.itertuples(index=False, name=None)
+            )
+            conn.executemany("""
+                INSERT INTO coverage VALUES (?, ?, ?)
+                ON CONFLICT (ticker) DO UPDATE SET
+                    first_month = MIN(first_month, excluded.first_month),
+                    last_month = MAX(last_month, excluded.last_month)
+            """, [(ticker, first_month, last_month) for ticker in tickers])
+
+    def update(self, tickers, first_month, last_month=None):
+        """Aggregate every closed month in [first_month, last_month] not stored yet
+
+        Tickers missing the same months are loaded together in one price panel.
+        Every ticker the loader returned is marked covered for the whole range,
+        including months before it was listed, so those are not requested
+        again; tickers whose load failed are retried on the next update.
+        """
+        last_month = min(last_month if last_month is not None else last_closed_month(), last_closed_month())
+        pending = {}
+        for ticker in dict.fromkeys(tickers):
+            for month_range in self.missing_ranges(ticker, first_month, last_month):
+                pending.setdefault(month_range, []).append(ticker)
+
+        for (range_first, range_last), group in pending.items():
+            # A few days of the previous month give the first day's return
+            start = month_start(range_first) - pd.Timedelta(days=10)
+            end = month_start(range_last + 1)
+            prices = self.price_loader(group, start, end)
+            loaded = [ticker for ticker in group if ticker in prices.columns]
+            prices = prices.reindex(columns=loaded)
+            self.store(monthly_aggregates(prices, range_first, range_last), loaded, range_first, range_last)
+        return len(pending)
+
+    def read(self, tickers, start_year=None, end_year=None):
+        """Return the stored (ticker, year, month) aggregates for the tickers and years"""
+        tickers = list(dict.fromkeys(tickers))
+        query = (
+            "SELECT ticker, year, month, return_sum, log_return_sum, days FROM seasonal "
+            f"WHERE ticker IN ({', '.join('?' * len(tickers))}) AND year >= ? AND year <= ?"
+        )
+        with self._connect() as conn:
+            rows = conn.execute(
+                query, tickers + [start_year if start_year is not None else 0, end_year if end_year is not None else 9999]
+            ).fetchall()
+        return pd.DataFrame(rows, columns=["ticker", "year", "month", "return_sum", "log_return_sum", "days"])
+
+    def years(self, tickers):
+        """Return the (first, last) years with stored data for any of the tickers, or None"""
+        cube = self.read(tickers)
+        if cube.empty:
+            return None
+        return int(cube["year"].min()), int(cube["year"].max())
+
+    def slice(self, tickers, start_year=None, end_year=None, measure="avg_daily"):
+        """Return (monthly, quarterly) seasonal tables in percent for the tickers and years
+
+        Both tables are indexed by month/quarter name with one column per ticker.
+        measure "avg_daily" averages daily returns over every day of the month
+        (or quarter); "avg_monthly" averages the compounded return of each
+        month (or quarter) across the years.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        cube = self.read(tickers, start_year, end_year)
+        cube["quarter"] = (cube["month"] - 1) // 3 + 1
+
+        tables = []
+        for period, names in (("month", MONTH_NAMES), ("quarter", QUARTER_NAMES)):
+            if measure == "avg_daily":
+                totals = cube.groupby([period, "ticker"])[["return_sum", "days"]].sum()
+                values = totals["return_sum"] / totals["days"]
+            else:
+                per_year = cube.groupby([period, "ticker", "year"])["log_return_sum"].sum()
+                values = np.expm1(per_year).groupby(level=[0, 1]).mean()
+            table = (values * 100).unstack("ticker").reindex(index=range(1, len(names) + 1), columns=tickers)
+            table.index = names
+            tables.append(table.dropna(how="all"))
+        return tuple(tables)
@@ -0,0 +1,300 @@
+import os
+import sys
+import threading
+import time
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from app_config import SESSION_IDLE_SECONDS, SESSION_MEMORY_BUDGET, SESSION_SPILL_MIN_BYTES
+
+# Per-session memory accounting for st.session_state.
+#
+# Every rerun measures the session's state. When it is over budget, the
+# largest DataFrames (top-level values, or values inside a dict such as
+# stock_data["history"]) are moved to a process-wide cache keyed by content
+# hash and replaced by a FrameRef, so sessions looking at the same data share
+# one copy. Sessions pin the frames they reference; a session idle for longer
+# than SESSION_IDLE_SECONDS loses its pins and unpinned frames are dropped.
+# Code reading a value that may have been spilled calls resolve().
+#
+# manage_session() runs before every page, including the landing pages that
+# never touch pandas, so pandas and NumPy are only looked up once something
+# else has imported them: until then no session can hold a frame or array.
+
+EVICTION_CHECK_SECONDS = 60
+# Records of evicted sessions stay on the admin page this long, then are forgotten
+FORGET_SESSION_SECONDS = 4 * SESSION_IDLE_SECONDS
+
+class FrameRef:
+    """Reference to a DataFrame held in the shared frame cache"""
+
+    __slots__ = ("key", "nbytes", "shape")
+
+    def __init__(self, key, nbytes, shape):
+        self.key = key
+        self.nbytes = nbytes
+        self.shape = shape
+
+    def __repr__(self):
+        return f"FrameRef({self.key[:8]}, {self.shape[0]}x{self.shape[1]}, {self.nbytes / 1e6:.1f} MB)"
+
+_frames = {}    # key -> {"frame", "nbytes", "pins": set of session ids}
+_sessions = {}  # session id -> accounting record
+_lock = threading.Lock()
+_last_eviction = 0.0
+
+def _frame_types():
+    pd = sys.modules.get("pandas")
+    return (pd.DataFrame, pd.Series) if pd else ()
+
+def _array_type():
+    np = sys.modules.get("numpy")
+    return np.ndarray if np else ()
+
+def _is_mapped(array):
+    import numpy as np
+    # Views of memory-mapped files (e.g. the shared price store) live in the OS page cache
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+def frame_bytes(frame):
+    """Return (private, shared) bytes of a DataFrame or Series"""
+    private, shared = frame.index.nbytes, 0
+    columns = frame.items() if frame.ndim == 2 else [(frame.name, frame)]
+    for _, column in columns:
+        values = column.to_numpy()
+        if values.dtype == object:
+            private += int(column.memory_usage(index=False, deep=True))
+        elif _is_mapped(values):
+            shared += values.nbytes
+        else:
+            private += values.nbytes
+    return private, shared
+
+def estimate_size(value, _seen=None):
+    """Return (private, shared) bytes held by a session-state value, following containers"""
+    _seen = _seen if _seen is not None else set()
+    if id(value) in _seen:
+        return 0, 0
+    _seen.add(id(value))
+    if isinstance(value, FrameRef):
+        return sys.getsizeof(value), value.nbytes
+    if isinstance(value, _frame_types()):
+        return frame_bytes(value)
+    if isinstance(value, _array_type()):
+        return (0, value.nbytes) if _is_mapped(value) else (value.nbytes, 0)
+    private, shared = sys.getsizeof(value), 0
+    if isinstance(value, dict):
+        items = [item for pair in value.items() for item in pair]
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = value
+    elif hasattr(value, "__dict__") and not isinstance(value, type):
+        items = list(vars(value).values())
+    else:
+        items = []
+    for item in items:
+        item_private, item_shared = estimate_size(item, _seen)
+        private += item_private
+        shared += item_shared
+    return private, shared
+
+def _spill(session_id, frame):
+    from frame_memo import frame_hash
+    key = frame_hash(frame)
+    nbytes = frame_bytes(frame)[0]
+    with _lock:
+        entry = _frames.setdefault(key, {"frame": frame, "nbytes": nbytes, "pins": set()})
+        entry["pins"].add(session_id)
+    return FrameRef(key, nbytes, frame.shape if frame.ndim == 2 else (len(frame), 1))
+
+def resolve(value):
+    """Return the frame behind a FrameRef (None if it was evicted); other values pass through"""
+    if not isinstance(value, FrameRef):
+        return value
+    with _lock:
+        entry = _frames.get(value.key)
+    return entry["frame"] if entry else None
+
+def _spill_candidates(state):
+    """Yield (private bytes, container, key) for every DataFrame a session could spill"""
+    frame_types = _frame_types()
+    if not frame_types:
+        return
+    for name, value in state.items():
+        if isinstance(value, frame_types):
+            yield frame_bytes(value)[0], state, name
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if isinstance(item, frame_types):
+                    yield frame_bytes(item)[0], value, key
+
+def release_session(session_id):
+    """Drop a session's pins; frames no other session pins are freed"""
+    with _lock:
+        for key in [key for key, entry in _frames.items() if session_id in entry["pins"]]:
+            _frames[key]["pins"].discard(session_id)
+            if not _frames[key]["pins"]:
+                del _frames[key]
+        record = _sessions.get(session_id)
+        if record:
+            record["evicted"] = True
+
+def evict_idle_sessions(idle_seconds=SESSION_IDLE_SECONDS, forget_seconds=FORGET_SESSION_SECONDS):
+    """Release the pinned frames of every session idle for longer than idle_seconds
+
+    Records of evicted sessions idle for longer than forget_seconds are
+    deleted, so the table does not grow with every session ever seen.
+    """
+    now = time.time()
+    with _lock:
+        for session_id in [
+            session_id for session_id, record in _sessions.items()
+            if record.get("evicted") and now - record["last_seen"] > forget_seconds
+        ]:
+            del _sessions[session_id]
+        idle = [
+            session_id for session_id, record in _sessions.items()
+            if now - record["last_seen"] > idle_seconds and not record.get("evicted")
+        ]
+    for session_id in idle:
+        release_session(session_id)
+    return len(idle)
+
+def manage_session(budget=SESSION_MEMORY_BUDGET):
+    """Measure this session's state, spill large frames when over budget and evict idle sessions
+
+    Call once per rerun, before any page reads session state.
+    """
+    global _last_eviction
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return None
+    session_id = ctx.session_id
+    state = st.session_state
+
+    spilled = 0
+    private, shared = estimate_size({key: state[key] for key in state.keys()})
+    if private > budget:
+        # Largest first until the session is back under budget
+        for nbytes, container, key in sorted(_spill_candidates(state), key=lambda c: c[0], reverse=True):
+            if private <= budget or nbytes < SESSION_SPILL_MIN_BYTES:
+                break
+            ref = _spill(session_id, container[key])
+            if container is state:
+                state[key] = ref
+            else:
+                container[key] = ref
+            private -= nbytes
+            shared += ref.nbytes
+            spilled += 1
+
+    refs = sum(
+        isinstance(value, FrameRef) or (isinstance(value, dict) and sum(isinstance(item, FrameRef) for item in value.values()))
+        for value in state.values()
+    )
+    with _lock:
+        _sessions[session_id] = {
+            "last_seen": time.time(),
+            "private_bytes": private,
+            "shared_bytes": shared,
+            "keys": len(state.keys()),
+            "frame_refs": refs,
+            "user_role": state.get("user_role", "public"),
+            "page": state.get("page"),
+            "evicted": False
+        }
+        run_eviction = time.time() - _last_eviction > EVICTION_CHECK_SECONDS
+        if run_eviction:
+            _last_eviction = time.time()
+    if run_eviction:
+        evict_idle_sessions()
+    return spilled
+
+def process_rss():
+    """Resident set size of this process in bytes (Linux), or None"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def memory_report():
+    """Return (sessions DataFrame, shared cache summary dict)"""
+    import pandas as pd
+    now = time.time()
+    with _lock:
+        sessions = pd.DataFrame([
+            dict(
+                {"Session": session_id[:8], "Idle (s)": round(now - record["last_seen"])},
+                **{key: value for key, value in record.items() if key != "last_seen"}
+            )
+            for session_id, record in _sessions.items()
+        ])
+        shared = {
+            "frames": len(_frames),
+            "bytes": sum(entry["nbytes"] for entry in _frames.values()),
+            "pins": sum(len(entry["pins"]) for entry in _frames.values())
+        }
+    return sessions, shared
+
+def show_session_memory_admin():
+    """Display per-session memory and cache statistics (Emperor only)"""
+    import pandas as pd
+    from frame_memo import memo_stats
+    from market_data import get_bar_store, get_gateway_stats
+    from figure_encoding import payload_report
+
+    st.title("Session Memory")
+
+    rss = process_rss()
+    sessions, shared = memory_report()
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Worker RSS", f"{rss / 1e6:,.0f} MB" if rss else "N/A")
+    col2.metric("Sessions", len(sessions))
+    col3.metric("Shared Frames", f"{shared['frames']} ({shared['bytes'] / 1e6:,.1f} MB)")
+    col4.metric("Session Budget", f"{SESSION_MEMORY_BUDGET / 1e6:,.0f} MB")
+
+    st.subheader("Sessions")
+    if sessions.empty:
+        st.info("No sessions recorded yet.")
+    else:
+        sessions["Private (MB)"] = sessions.pop("private_bytes") / 1e6
+        sessions["Shared (MB)"] = sessions.pop("shared_bytes") / 1e6
+        st.dataframe(
+            sessions.sort_values("Private (MB)", ascending=False).style.format(
+                {"Private (MB)": "{:.2f}", "Shared (MB)": "{:.2f}"}
+            ),
+            hide_index=True,
+            use_container_width=True
+        )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Evict Idle Sessions Now", use_container_width=True):
+            st.success(f"Released {evict_idle_sessions()} idle session(s).")
+    with col2:
+        if st.button("Evict All Other Sessions", use_container_width=True):
+            own = get_script_run_ctx().session_id
+            with _lock:
+                others = [session_id for session_id in _sessions if session_id != own]
+            for session_id in others:
+                release_session(session_id)
+            st.success(f"Released {len(others)} session(s).")
+
+    # Cache statistics from the rest of the app
+    st.subheader("Market Data Gateway")
+    st.dataframe(pd.DataFrame(get_gateway_stats()).T, use_container_width=True)
+
+    st.subheader("Memoized Builders")
+    st.dataframe(pd.DataFrame(memo_stats()).T, use_container_width=True)
+
+    st.subheader("Resampled Bar Levels")
+    st.json(get_bar_store().stats)
+
+    payloads = payload_report()
+    if payloads:
+        st.subheader("Recent Chart Payloads")
+        st.dataframe(pd.DataFrame(payloads), hide_index=True, use_container_width=True)
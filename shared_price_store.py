@@ -0,0 +1,176 @@
+import fcntl
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from app_config import cache_path
+from market_data_cache import BAR_COLUMNS, normalize_bars
+
+# Memory-mapped price histories shared by every worker process on a host.
+#
+# Layout: <root>/<interval>/<TICKER>/manifest.json plus a generation directory
+# g<N>/ holding one raw little-endian file per column (ts.i8, close.f8, ...).
+# Readers map the column files read-only and only look at the first `rows`
+# rows named by the manifest, so the OS page cache holds one copy of each
+# history no matter how many processes and sessions read it.
+#
+# Writers take a per-ticker file lock. New bars are appended past the
+# published rows, flushed, and then made visible by atomically replacing the
+# manifest. History that has to change (a backfill before the first stored
+# bar) is written to a new generation directory and published the same way;
+# processes still mapping the old generation keep a valid view.
+
+COLUMN_FILES = dict({"ts": "i8"}, **{name: "f8" for name in BAR_COLUMNS.values()})
+
+def _merge_bound(stored, new, pick):
+    values = [value for value in (stored, pd.Timestamp(new).value if new is not None else None) if value is not None]
+    return pick(values) if values else None
+
+class SharedPriceStore:
+    """Append-only, memory-mapped OHLCV store shared between processes"""
+
+    def __init__(self, root=None):
+        self.root = root or cache_path("price_store")
+        self._views = {}
+        self._views_lock = threading.Lock()
+
+    def _dir(self, ticker, interval):
+        return os.path.join(self.root, interval, ticker)
+
+    def manifest(self, ticker, interval="1d"):
+        """Return the published manifest for a ticker, or None if nothing is stored"""
+        try:
+            with open(os.path.join(self._dir(ticker, interval), "manifest.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _publish(self, ticker, interval, manifest):
+        directory = self._dir(ticker, interval)
+        tmp_path = os.path.join(directory, "manifest.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(directory, "manifest.json"))
+
+    @contextmanager
+    def _writer(self, ticker, interval):
+        directory = self._dir(ticker, interval)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield directory
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _column_arrays(frame):
+        frame = frame.reindex(columns=list(BAR_COLUMNS))
+        arrays = {"ts": frame.index.asi8.astype("<i8")}
+        for column, name in BAR_COLUMNS.items():
+            arrays[name] = frame[column].to_numpy(dtype="<f8")
+        return arrays
+
+    def _write_columns(self, generation_dir, arrays, published_rows):
+        for name, dtype in COLUMN_FILES.items():
+            path = os.path.join(generation_dir, f"{name}.{dtype}")
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                # Anything past the published rows is debris from an interrupted write
+                f.truncate(published_rows * 8)
+                f.seek(published_rows * 8)
+                f.write(arrays[name].tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+    def append(self, ticker, frame, interval="1d", covered_from=None, covered_to=None):
+        """Append bars newer than the last stored one and publish them
+
+        If the frame starts before the first stored bar, the whole history is
+        rewritten into a new generation instead. covered_from/covered_to record
+        the range the caller has synced (so a ticker with no bars yet in part
+        of it is not re-synced every time). Returns the number of rows written.
+        """
+        frame = normalize_bars(frame, ticker).sort_index()
+        frame = frame[~frame.index.duplicated(keep="last")]
+        with self._writer(ticker, interval) as directory:
+            manifest = self.manifest(ticker, interval)
+            rows = manifest["rows"] if manifest else 0
+            if manifest and rows and len(frame) and frame.index[0].value < manifest["first_ts"]:
+                # Backfill: write the complete history as a new generation
+                existing = self.read(ticker, interval)
+                frame = pd.concat([frame, existing[existing.index > frame.index[-1]]])
+                generation, rows = manifest["generation"] + 1, 0
+            else:
+                generation = manifest["generation"] if manifest else 0
+                if manifest and rows:
+                    frame = frame[frame.index.asi8 > manifest["last_ts"]]
+
+            generation_dir = os.path.join(directory, f"g{generation}")
+            os.makedirs(generation_dir, exist_ok=True)
+            if len(frame):
+                self._write_columns(generation_dir, self._column_arrays(frame), rows)
+
+            previous = manifest or {}
+            new_manifest = {
+                "generation": generation,
+                "rows": rows + len(frame),
+                "first_ts": frame.index[0].value if rows == 0 and len(frame) else previous.get("first_ts"),
+                "last_ts": frame.index[-1].value if len(frame) else previous.get("last_ts"),
+                "covered_from": _merge_bound(previous.get("covered_from"), covered_from, min),
+                "covered_to": _merge_bound(previous.get("covered_to"), covered_to, max),
+                "version": previous.get("version", 0) + 1
+            }
+            self._publish(ticker, interval, new_manifest)
+
+            if manifest and generation != manifest["generation"]:
+                # Readers still mapping the old files keep them until they unmap
+                shutil.rmtree(os.path.join(directory, f"g{manifest['generation']}"), ignore_errors=True)
+            return len(frame)
+
+    def _open(self, ticker, interval):
+        """Return (manifest, {column: read-only memmap}) for the published rows, reusing open maps"""
+        manifest = self.manifest(ticker, interval)
+        if not manifest or not manifest["rows"]:
+            return manifest, None
+        key = (ticker, interval)
+        with self._views_lock:
+            cached = self._views.get(key)
+            if cached and cached[0]["version"] == manifest["version"]:
+                return cached
+            generation_dir = os.path.join(self._dir(ticker, interval), f"g{manifest['generation']}")
+            columns = {
+                name: np.memmap(os.path.join(generation_dir, f"{name}.{dtype}"), dtype=f"<{dtype}", mode="r", shape=(manifest["rows"],))
+                for name, dtype in COLUMN_FILES.items()
+            }
+            self._views[key] = (manifest, columns)
+            return manifest, columns
+
+    def read(self, ticker, interval="1d", start=None, end=None):
+        """Return stored bars in [start, end) as a DataFrame backed by read-only memory maps
+
+        The frame shares memory with the mapped files; it must not be modified in place.
+        """
+        _, columns = self._open(ticker, interval)
+        if columns is None:
+            return pd.DataFrame(columns=list(BAR_COLUMNS), index=pd.DatetimeIndex([], name="Date"), dtype=float)
+        ts = columns["ts"]
+        lo = np.searchsorted(ts, pd.Timestamp(start).value) if start is not None else 0
+        hi = np.searchsorted(ts, pd.Timestamp(end).value) if end is not None else len(ts)
+        index = pd.DatetimeIndex(np.asarray(ts[lo:hi]).view("M8[ns]"), name="Date")
+        return pd.DataFrame(
+            {column: np.asarray(columns[name][lo:hi]) for column, name in BAR_COLUMNS.items()},
+            index=index,
+            copy=False
+        )
+
+    def tickers(self, interval="1d"):
+        """Return every ticker with published bars for an interval"""
+        directory = os.path.join(self.root, interval)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory) if self.manifest(name, interval))
@@ -0,0 +1,71 @@
+import threading
+
+class _Call:
+    """An upstream call in progress that other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """Collapse identical concurrent calls into one execution
+
+    While a call for a key is in flight, further calls with the same key wait
+    for it and receive its result (or its exception) instead of repeating it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._executed = 0
+        self._collapsed = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) for key unless an identical call is already running"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._collapsed += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """Return counters for executed, collapsed and currently in-flight calls"""
+        with self._lock:
+            requests = self._executed + self._collapsed
+            return {
+                "requests": requests,
+                "executed": self._executed,
+                "collapsed": self._collapsed,
+                "collapse_ratio": self._collapsed / requests if requests else 0.0,
+                "in_flight": len(self._calls)
+            }
+
+    def reset_stats(self):
+        """Reset the counters (calls in flight are not affected)"""
+        with self._lock:
+            self._executed = 0
+            self._collapsed = 0
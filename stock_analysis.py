@@ -1,22 +1,33 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
 import plotly.graph_objects as go
+from market_data import get_bars, get_history, get_shared_history, fetch_info
+from bar_store import INTERVAL_LABELS, available_intervals
+from streaming_indicators import LiveIndicators
+from figure_encoding import render_chart
 
-def fetch_stock_data(ticker, period="1y"):
-    """Fetch stock data using yfinance"""
+# Seconds between live-refresh updates on the Stock Analysis page
+LIVE_REFRESH_SECONDS = 60
+
+def fetch_stock_data(ticker, period="1y", interval="1d"):
+    """Fetch stock data through the market data gateway"""
     try:
-        stock = yf.Ticker(ticker)
         # Get general info
-        info = stock.info
+        info = fetch_info(ticker)
         
-        # Get historical data
-        hist = stock.history(period=period)
+        # Daily closed bars come from the store shared by all sessions and workers, with
+        # today's bar appended; other intervals are resampled from cached base bars
+        if interval == "1d":
+            hist = get_shared_history(ticker, period=period)
+        else:
+            hist = get_bars(ticker, period=period, interval=interval)
         
         return {
             "info": info,
             "history": hist,
-            "ticker": ticker
+            "ticker": ticker,
+            "period": period,
+            "interval": interval
         }
     except Exception as e:
         st.error(f"Error fetching data for {ticker}: {str(e)}")
@@ -72,6 +83,40 @@ def display_stock_info(stock_data):
         for label, value in metrics.items():
             st.text(f"{label}: {value}")
 
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def show_live_indicators(ticker):
+    """Show indicators that are updated incrementally from newly closed bars"""
+    live = st.session_state.get('live_indicators')
+    if live is None or st.session_state.get('live_ticker') != ticker:
+        # Seed once from two years of history; afterwards only new bars are fed in
+        live = LiveIndicators()
+        history = get_history(ticker, period="2y")
+    else:
+        history = get_history(ticker, start=live.last_timestamp)
+    
+    # Only closed bars update the indicators; today's bar is still changing
+    new_bars = live.update_frame(history[history.index < pd.Timestamp.now().normalize()])
+    st.session_state.live_indicators = live
+    st.session_state.live_ticker = ticker
+    
+    values = live.values()
+    format_price = lambda x: f"${x:.2f}" if x is not None else "N/A"
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("20-day MA", format_price(values["MA20"]))
+    col2.metric("50-day MA", format_price(values["MA50"]))
+    col3.metric("200-day MA", format_price(values["MA200"]))
+    col4.metric("RSI (Wilder, 14)", f"{values['RSI']:.1f}" if values["RSI"] is not None else "N/A")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("20-day EMA", format_price(values["EMA20"]))
+    col2.metric("52 Week High", format_price(values["52 Week High"]))
+    col3.metric("52 Week Low", format_price(values["52 Week Low"]))
+    col4.metric("Avg Volume (10d)", f"{values['Avg Volume (10d)']:,.0f}" if values["Avg Volume (10d)"] is not None else "N/A")
+    
+    last_bar = live.last_timestamp.strftime('%Y-%m-%d') if live.last_timestamp is not None else "N/A"
+    st.caption(f"Last closed bar: {last_bar} | {new_bars} new bar(s) this update | refreshes every {LIVE_REFRESH_SECONDS}s")
+
 def show_stock_analysis():
     """Show the stock analysis page"""
     st.title("Stock Analysis")
@@ -109,17 +154,27 @@ def show_stock_analysis():
         if custom_ticker:
             ticker = custom_ticker.upper()
     
-    # Time period selection
-    period = st.select_slider(
-        "Select time period:",
-        options=["1mo", "3mo", "6mo", "1y", "2y", "5y", "max"],
-        value="1y"
-    )
+    # Time period and bar interval selection
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        period = st.select_slider(
+            "Select time period:",
+            options=["5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "max"],
+            value="1y"
+        )
+    with col2:
+        intervals = available_intervals(period)
+        interval = st.selectbox(
+            "Bar interval:",
+            intervals,
+            index=intervals.index("1d"),
+            format_func=INTERVAL_LABELS.get
+        )
     
     # Fetch data button
     if st.button("Analyze Stock", use_container_width=True):
         with st.spinner(f"Fetching data for {ticker}..."):
-            stock_data = fetch_stock_data(ticker, period)
+            stock_data = fetch_stock_data(ticker, period, interval)
             
             if stock_data:
                 st.session_state.stock_data = stock_data
@@ -148,7 +203,7 @@ def show_stock_analysis():
                 ))
                 
                 fig.update_layout(
-                    title=f"{ticker} Stock Price - {period}",
+                    title=f"{ticker} Stock Price - {period} ({INTERVAL_LABELS[interval]} bars)",
                     xaxis_title="Date",
                     yaxis_title="Price (USD)",
                     template="plotly_dark",
@@ -156,10 +211,15 @@ def show_stock_analysis():
                     hovermode="x unified"
                 )
                 
-                st.plotly_chart(fig, use_container_width=True)
+                render_chart(fig, use_container_width=True)
                 
                 # Option to proceed to visualizations
                 st.success("Stock data loaded successfully. Proceed to visualizations for more detailed analysis.")
                 if st.button("Proceed to Visualizations", use_container_width=True):
                     st.session_state.page = 'visualization'
                     st.rerun()
+    
+    # Live-refresh mode keeps indicators current without rescanning the full history
+    if st.toggle("Live refresh", help="Update indicators as new bars close, without recomputing the whole history"):
+        st.subheader(f"Live Indicators: {ticker}")
+        show_live_indicators(ticker)
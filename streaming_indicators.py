@@ -0,0 +1,241 @@
+import math
+from collections import deque
+import pandas as pd
+
+# Incremental indicators for live bar updates. Each update costs O(1)
+# (amortized for the rolling extremes), so a new bar never rescans history.
+# Every indicator can be saved with to_state() and restored with from_state().
+#
+# Missing inputs (NaN) follow pandas: SMA is undefined while a NaN is in its
+# window, like rolling(window).mean(); EMA carries its value over a gap and
+# decays the old weight like ewm(adjust=False).mean(); the rolling extremes
+# skip NaN like rolling(window, min_periods=1); RSI measures the next change
+# from the last valid price.
+
+class SMA:
+    """Simple moving average over the last `window` values (None while any of them is NaN)"""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.missing = 0
+
+    def update(self, value):
+        self.values.append(value)
+        if math.isnan(value):
+            self.missing += 1
+        else:
+            self.total += value
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if math.isnan(old):
+                self.missing -= 1
+            else:
+                self.total -= old
+        return self.value
+
+    @property
+    def value(self):
+        if len(self.values) < self.window or self.missing:
+            return None
+        return self.total / self.window
+
+    def to_state(self):
+        return {"type": "SMA", "window": self.window, "values": list(self.values)}
+
+    @classmethod
+    def from_state(cls, state):
+        indicator = cls(state["window"])
+        # JSON has no NaN, so missing values may come back as None
+        indicator.values = deque(math.nan if value is None else value for value in state["values"])
+        # Recomputing the sum on restore also drops accumulated rounding error
+        indicator.total = math.fsum(value for value in indicator.values if not math.isnan(value))
+        indicator.missing = sum(math.isnan(value) for value in indicator.values)
+        return indicator
+
+class EMA:
+    """Exponential moving average with smoothing 2 / (span + 1), seeded with the first value"""
+
+    def __init__(self, span):
+        self.span = span
+        self.alpha = 2 / (span + 1)
+        self.current = None
+        # Weight of the current value relative to a new one; decays over missing values
+        self.old_weight = 1.0
+
+    def update(self, value):
+        if self.current is None:
+            if not math.isnan(value):
+                self.current = value
+            return self.current
+        self.old_weight *= 1 - self.alpha
+        if not math.isnan(value):
+            self.current = (self.old_weight * self.current + self.alpha * value) / (self.old_weight + self.alpha)
+            self.old_weight = 1.0
+        return self.current
+
+    @property
+    def value(self):
+        return self.current
+
+    def to_state(self):
+        return {"type": "EMA", "span": self.span, "current": self.current, "old_weight": self.old_weight}
+
+    @classmethod
+    def from_state(cls, state):
+        indicator = cls(state["span"])
+        indicator.current = state["current"]
+        indicator.old_weight = state.get("old_weight", 1.0)
+        return indicator
+
+class WilderRSI:
+    """Relative Strength Index with Wilder's smoothing"""
+
+    def __init__(self, window=14):
+        self.window = window
+        self.previous = None
+        self.count = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def update(self, price):
+        if math.isnan(price):
+            return self.value
+        if self.previous is not None:
+            change = price - self.previous
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            self.count += 1
+            if self.count <= self.window:
+                # Seed with the plain average of the first `window` changes
+                self.avg_gain += gain / self.window
+                self.avg_loss += loss / self.window
+            else:
+                self.avg_gain += (gain - self.avg_gain) / self.window
+                self.avg_loss += (loss - self.avg_loss) / self.window
+        self.previous = price
+        return self.value
+
+    @property
+    def value(self):
+        if self.count < self.window:
+            return None
+        if self.avg_loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+
+    def to_state(self):
+        return {
+            "type": "WilderRSI", "window": self.window, "previous": self.previous,
+            "count": self.count, "avg_gain": self.avg_gain, "avg_loss": self.avg_loss
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        indicator = cls(state["window"])
+        indicator.previous = state["previous"]
+        indicator.count = state["count"]
+        indicator.avg_gain = state["avg_gain"]
+        indicator.avg_loss = state["avg_loss"]
+        return indicator
+
+class RollingMax:
+    """Maximum of the last `window` values using a monotonic deque"""
+
+    def __init__(self, window):
+        self.window = window
+        self.seen = 0
+        self.candidates = deque()  # (position, value), values decreasing
+
+    def _dominates(self, new, old):
+        return new >= old
+
+    def update(self, value):
+        if not math.isnan(value):
+            while self.candidates and self._dominates(value, self.candidates[-1][1]):
+                self.candidates.pop()
+            self.candidates.append((self.seen, value))
+        self.seen += 1
+        if self.candidates and self.candidates[0][0] <= self.seen - 1 - self.window:
+            self.candidates.popleft()
+        return self.value
+
+    @property
+    def value(self):
+        return self.candidates[0][1] if self.candidates else None
+
+    def to_state(self):
+        return {
+            "type": type(self).__name__, "window": self.window, "seen": self.seen,
+            "candidates": [list(candidate) for candidate in self.candidates]
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        indicator = cls(state["window"])
+        indicator.seen = state["seen"]
+        indicator.candidates = deque(tuple(candidate) for candidate in state["candidates"])
+        return indicator
+
+class RollingMin(RollingMax):
+    """Minimum of the last `window` values using a monotonic deque"""
+
+    def _dominates(self, new, old):
+        return new <= old
+
+INDICATOR_TYPES = {cls.__name__: cls for cls in (SMA, EMA, WilderRSI, RollingMax, RollingMin)}
+
+def indicator_from_state(state):
+    """Restore any indicator from its to_state() dict"""
+    return INDICATOR_TYPES[state["type"]].from_state(state)
+
+# Input column per LiveIndicators entry; anything not listed follows the close
+INPUT_FIELDS = {"52 Week High": "High", "52 Week Low": "Low", "Avg Volume (10d)": "Volume"}
+
+class LiveIndicators:
+    """The indicator set shown in the Stock Analysis live-refresh mode"""
+
+    def __init__(self, indicators=None, last_timestamp=None):
+        self.indicators = indicators or {
+            "MA20": SMA(20),
+            "MA50": SMA(50),
+            "MA200": SMA(200),
+            "EMA20": EMA(20),
+            "RSI": WilderRSI(14),
+            "52 Week High": RollingMax(252),
+            "52 Week Low": RollingMin(252),
+            "Avg Volume (10d)": SMA(10)
+        }
+        self.last_timestamp = last_timestamp
+
+    def update_bar(self, timestamp, bar):
+        """Feed one closed OHLCV bar (a mapping with Close, High, Low and Volume)"""
+        for name, indicator in self.indicators.items():
+            indicator.update(float(bar[INPUT_FIELDS.get(name, "Close")]))
+        self.last_timestamp = timestamp
+
+    def update_frame(self, frame):
+        """Feed every bar of a history frame newer than the last one seen"""
+        if self.last_timestamp is not None:
+            frame = frame[frame.index > self.last_timestamp]
+        for timestamp, bar in zip(frame.index, frame[["Close", "High", "Low", "Volume"]].to_dict("records")):
+            self.update_bar(timestamp, bar)
+        return len(frame)
+
+    def values(self):
+        """Return the current value of every indicator (None while still warming up)"""
+        return {name: indicator.value for name, indicator in self.indicators.items()}
+
+    def to_state(self):
+        """Return a JSON-serializable snapshot of every indicator"""
+        return {
+            "last_timestamp": self.last_timestamp.isoformat() if self.last_timestamp is not None else None,
+            "indicators": {name: indicator.to_state() for name, indicator in self.indicators.items()}
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Restore an indicator set saved with to_state()"""
+        indicators = {name: indicator_from_state(s) for name, s in state["indicators"].items()}
+        last_timestamp = pd.Timestamp(state["last_timestamp"]) if state["last_timestamp"] else None
+        return cls(indicators, last_timestamp)
@@ -1,7 +1,51 @@
+import functools
+import io
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
+
+@functools.lru_cache(maxsize=1)
+def _roi_chart():
+    """Render the sample ROI chart once per process as PNG bytes"""
+    # matplotlib and numpy load on first use so the page header paints without waiting for them
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    
+    # Sample ROI data
+    months = range(1, 13)
+    investment = [5000] * 12
+    cumulative_investment = np.cumsum(investment)
+    
+    # Savings grow over time
+    savings = [0, 500, 2000, 4000, 7000, 11000, 16000, 22000, 29000, 37000, 46000, 56000]
+    
+    # Plot cumulative investment
+    ax.plot(months, cumulative_investment, 'r-', linewidth=2, label='Cumulative Investment')
+    
+    # Plot cumulative savings
+    ax.plot(months, savings, 'g-', linewidth=2, label='Cumulative Savings')
+    
+    # Fill the area where savings exceed investment
+    break_even_point = np.argwhere(np.array(savings) >= np.array(cumulative_investment))[0][0]
+    ax.fill_between(months[break_even_point:], cumulative_investment[break_even_point:], 
+                    savings[break_even_point:], color='green', alpha=0.3)
+    
+    # Add break-even annotation
+    ax.axvline(x=break_even_point + 1, color='black', linestyle='--')
+    ax.text(break_even_point + 1.2, max(savings)/2, f'Break Even: Month {break_even_point + 1}', 
+            verticalalignment='center')
+    
+    # Set labels and title
+    ax.set_xlabel('Months')
+    ax.set_ylabel('Amount ($)')
+    ax.set_title('Typical Synergyze License ROI')
+    ax.legend()
+    ax.grid(True, linestyle='--', alpha=0.7)
+    
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight", dpi=200)
+    plt.close(fig)
+    return buffer.getvalue()
 
 def show_synergyze_landing():
     """Display the public landing page for Synergyze - The licenses sold through the Virtual Silk Road"""
@@ -136,41 +180,7 @@ def show_synergyze_landing():
         st.markdown("### Calculate Your Synergyze ROI")
         
         # Create a simple ROI chart
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Sample ROI data
-        months = range(1, 13)
-        investment = [5000] * 12
-        cumulative_investment = np.cumsum(investment)
-        
-        # Savings grow over time
-        savings = [0, 500, 2000, 4000, 7000, 11000, 16000, 22000, 29000, 37000, 46000, 56000]
-        
-        # Plot cumulative investment
-        ax.plot(months, cumulative_investment, 'r-', linewidth=2, label='Cumulative Investment')
-        
-        # Plot cumulative savings
-        ax.plot(months, savings, 'g-', linewidth=2, label='Cumulative Savings')
-        
-        # Fill the area where savings exceed investment
-        break_even_point = np.argwhere(np.array(savings) >= np.array(cumulative_investment))[0][0]
-        ax.fill_between(months[break_even_point:], cumulative_investment[break_even_point:], 
-                        savings[break_even_point:], color='green', alpha=0.3)
-        
-        # Add break-even annotation
-        ax.axvline(x=break_even_point + 1, color='black', linestyle='--')
-        ax.text(break_even_point + 1.2, max(savings)/2, f'Break Even: Month {break_even_point + 1}', 
-                verticalalignment='center')
-        
-        # Set labels and title
-        ax.set_xlabel('Months')
-        ax.set_ylabel('Amount ($)')
-        ax.set_title('Typical Synergyze License ROI')
-        ax.legend()
-        ax.grid(True, linestyle='--', alpha=0.7)
-        
-        # Display the chart
-        st.pyplot(fig)
+        st.image(_roi_chart(), use_container_width=True)
     
     with roi_col2:
         st.markdown("### Average Client Results")
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+from bar_store import BarStore, base_interval, resample_ohlcv
+
+# Resampled levels against pandas resample, and incremental levels against a full rebuild
+
+AGGREGATION = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Adj Close": "last", "Volume": "sum"}
+
+def make_minute_bars(days=5, seed=2):
+    rng = np.random.default_rng(seed)
+    sessions = pd.bdate_range("2024-03-04", periods=days)
+    index = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(day + pd.Timedelta(hours=9, minutes=30), periods=390, freq="min") for day in sessions
+    ]), name="Date")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, len(index))))
+    return pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.0005, len(index))), "High": close * 1.001, "Low": close * 0.999,
+        "Close": close, "Adj Close": close, "Volume": rng.integers(100, 1000, len(index)).astype(float)
+    }, index=index)
+
+def make_daily_bars(n=300):
+    bars = make_minute_bars(days=1).iloc[:n]
+    return bars.set_axis(pd.bdate_range("2023-01-02", periods=n, name="Date"))
+
+def pandas_resample(bars, rule, **kwargs):
+    return bars.resample(rule, **kwargs).agg(AGGREGATION).dropna(subset=["Open"])
+
+@pytest.mark.parametrize("interval, rule, kwargs", [
+    ("5m", "5min", {}),
+    ("15m", "15min", {"offset": "30min"}),
+    ("1h", "1h", {"offset": "30min"}),
+    ("1d", "1D", {})
+])
+def test_intraday_resampling_matches_pandas(interval, rule, kwargs):
+    bars = make_minute_bars()
+    pd.testing.assert_frame_equal(resample_ohlcv(bars, interval), pandas_resample(bars, rule, **kwargs), check_freq=False)
+
+def test_weekly_bars_start_on_monday():
+    bars = make_daily_bars()
+    weekly = resample_ohlcv(bars, "1wk")
+    expected = pandas_resample(bars, "W-MON", label="left", closed="left")
+    pd.testing.assert_frame_equal(weekly, expected, check_freq=False)
+    assert (weekly.index.dayofweek == 0).all()
+
+def test_base_interval_picks_the_finest_feed_that_reaches_back():
+    now = pd.Timestamp("2024-06-03 12:00")
+    assert base_interval("15m", now - pd.Timedelta(days=3), now) == "1m"
+    assert base_interval("15m", now - pd.Timedelta(days=30), now) == "5m"
+    assert base_interval("1h", now - pd.Timedelta(days=365), now) == "1h"
+    assert base_interval("1m", now - pd.Timedelta(days=30), now) is None
+    assert base_interval("1wk", now - pd.Timedelta(days=3), now) == "1d"
+
+class GrowingLoader:
+    """Serves the first `visible` bars of a fixed history"""
+
+    def __init__(self, bars, visible):
+        self.bars = bars
+        self.visible = visible
+
+    def __call__(self, ticker, start, end, interval):
+        return self.bars.iloc[:self.visible].copy()
+
+def test_new_and_revised_bars_extend_the_cached_level():
+    bars = make_daily_bars()
+    loader = GrowingLoader(bars, 200)
+    store = BarStore(loader)
+    start = bars.index[0]
+    first = store.get_bars("AAA", start=start, interval="1wk")
+    pd.testing.assert_frame_equal(first, resample_ohlcv(bars.iloc[:200], "1wk"))
+    store.get_bars("AAA", start=start, interval="1wk")
+
+    loader.visible = 237
+    grown = store.get_bars("AAA", start=start, interval="1wk")
+    pd.testing.assert_frame_equal(grown, resample_ohlcv(bars.iloc[:237], "1wk"))
+
+    # The last bar was partial: its close and volume change
+    bars.iloc[236, bars.columns.get_loc("Close")] += 1.5
+    bars.iloc[236, bars.columns.get_loc("Volume")] += 10
+    revised = store.get_bars("AAA", start=start, interval="1wk")
+    pd.testing.assert_frame_equal(revised, resample_ohlcv(bars.iloc[:237], "1wk"))
+    assert store.stats == {"hits": 1, "extended": 2, "built": 1}
+
+def test_shorter_history_is_rebuilt():
+    bars = make_daily_bars()
+    loader = GrowingLoader(bars, 200)
+    store = BarStore(loader)
+    store.get_bars("AAA", start=bars.index[0], interval="1wk")
+    loader.visible = 150
+    shrunk = store.get_bars("AAA", start=bars.index[0], interval="1wk")
+    pd.testing.assert_frame_equal(shrunk, resample_ohlcv(bars.iloc[:150], "1wk"))
+    assert store.stats["built"] == 2
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import correlation_engine
+from correlation_engine import MAX_ENGINES, RollingCovariance, get_rolling_covariance
+
+# The incremental engine against pandas on the same window
+
+WINDOW = 21
+
+def make_returns(rows=80, seed=1):
+    rng = np.random.default_rng(seed)
+    returns = pd.DataFrame(rng.normal(0, 0.02, (rows, 4)), index=pd.bdate_range("2024-01-01", periods=rows),
+                           columns=list("ABCD"))
+    returns.iloc[5:9, 2] = np.nan
+    return returns
+
+def assert_matches_pandas(engine, returns):
+    window = returns.iloc[-WINDOW:]
+    np.testing.assert_allclose(engine.correlation(), window.corr(), atol=1e-12)
+    np.testing.assert_allclose(engine.covariance(), window.cov(), atol=1e-12)
+
+def test_rows_fed_one_at_a_time_match_pandas():
+    returns = make_returns()
+    engine = RollingCovariance(returns.columns, WINDOW)
+    engine.update_frame(returns.iloc[:40])
+    for end in range(41, len(returns) + 1):
+        engine.update_frame(returns.iloc[:end])
+    assert_matches_pandas(engine, returns)
+
+def test_revised_last_row_is_replaced():
+    returns = make_returns()
+    engine = RollingCovariance(returns.columns, WINDOW)
+    engine.update_frame(returns.iloc[:60])
+    # Today's partial bar is refetched with different values
+    revised = returns.iloc[:60].copy()
+    revised.iloc[-1] *= 1.5
+    engine.update_frame(revised)
+    assert_matches_pandas(engine, revised)
+    # The next day arrives together with the final values of the revised day
+    engine.update_frame(returns.iloc[:61])
+    assert_matches_pandas(engine, returns.iloc[:61])
+
+def make_prices(returns):
+    return (1 + returns.fillna(0)).cumprod() * 100
+
+def test_revised_older_row_rebuilds_the_shared_engine():
+    prices = make_prices(make_returns())
+    get_rolling_covariance(prices.iloc[:60], WINDOW)
+    revised = prices.copy()
+    revised.iloc[50] *= 1.2
+    engine = get_rolling_covariance(revised.iloc[:61], WINDOW)
+    expected = revised.iloc[:61].pct_change(fill_method=None).iloc[-WINDOW:]
+    np.testing.assert_allclose(engine.correlation(), expected.corr(), atol=1e-12)
+
+def test_engine_cache_keeps_the_most_recent_selections():
+    prices = make_prices(make_returns())
+    for window in range(2, MAX_ENGINES + 12):
+        get_rolling_covariance(prices, window)
+    assert len(correlation_engine._engines) == MAX_ENGINES
+    assert (tuple(prices.columns), MAX_ENGINES + 11) in correlation_engine._engines
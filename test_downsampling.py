@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+from downsampling import downsample_ohlc, lttb_indices
+
+# Downsampling against per-bucket pandas aggregation
+
+def make_bars(n=1000, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.002, n)), "High": close * 1.01, "Low": close * 0.99,
+        "Close": close, "Volume": rng.integers(1_000, 100_000, n).astype(float)
+    }, index=pd.bdate_range("2020-01-01", periods=n))
+
+def test_candles_match_grouped_aggregation():
+    bars = make_bars()
+    candles = downsample_ohlc(bars, 300)
+    buckets = np.searchsorted(candles.index.asi8, bars.index.asi8, side="right") - 1
+    expected = bars.groupby(buckets).agg({"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"})
+    np.testing.assert_allclose(candles.to_numpy(), expected.to_numpy())
+
+def test_volume_is_summed_on_the_candle_buckets():
+    bars = make_bars()
+    volume = downsample_ohlc(bars[["Volume"]], 300)
+    candles = downsample_ohlc(bars, 300)
+    assert volume.index.equals(candles.index)
+    np.testing.assert_array_equal(volume["Volume"].to_numpy(), candles["Volume"].to_numpy())
+    assert volume["Volume"].sum() == bars["Volume"].sum()
+
+def test_lttb_keeps_the_ends_and_the_extremes():
+    y = np.sin(np.linspace(0, 20, 2000))
+    y[1234] = 5.0
+    kept = lttb_indices(np.arange(2000), y, 100)
+    assert len(kept) == 100 and kept[0] == 0 and kept[-1] == 1999
+    assert 1234 in kept
+    assert np.all(np.diff(kept) > 0)
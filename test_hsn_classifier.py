@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from hsn_classifier import HsnClassifier, TfidfVectorizer, text_ngrams
+
+# Classifier scoring against a dense brute-force cosine over the same TF-IDF vectors
+
+TEXTS = [
+    "Men's or boys' trousers of cotton, not knitted", "Denim jeans", "Cotton chinos",
+    "T-shirts, singlets and other vests, knitted", "Printed cotton tee",
+    "Women's blouses and shirts", "Silk blouse",
+    "Handbags with outer surface of leather", "Leather tote bag",
+    "Footwear with outer soles of rubber", "Running shoes", "Sweaters, pullovers and cardigans"
+]
+CODES = ["6203", "6203", "6203", "6109", "6109", "6206", "6206", "4202", "4202", "6403", "6403", "6110"]
+QUERIES = ["blue denim jean", "printed t-shirts", "leather handbag", "womens silk blouse", "runing shoe", "wool sweater", "zzz"]
+
+class StubMaster:
+    def get(self, code):
+        return {"code": code, "description": f"Heading {code}"}
+
+def dense(rows, columns, weights, n_rows, n_columns):
+    matrix = np.zeros((n_rows, n_columns))
+    np.add.at(matrix, (rows, columns), weights)
+    return matrix
+
+def brute_force_scores(classifier, queries):
+    vocabulary = len(classifier.vectorizer.vocabulary)
+    order = sorted(range(len(TEXTS)), key=lambda i: CODES[i])
+    texts = dense(*classifier.vectorizer.transform([TEXTS[i] for i in order]), len(TEXTS), vocabulary)
+    codes = np.array([CODES[i] for i in order])
+    cosine = dense(*classifier.vectorizer.transform(queries), len(queries), vocabulary) @ texts.T
+    return np.column_stack([cosine[:, codes == code].max(axis=1) for code in classifier.codes])
+
+@pytest.fixture
+def classifier():
+    return HsnClassifier(TEXTS, CODES, StubMaster())
+
+def test_text_ngrams():
+    assert text_ngrams("Jean") == [" j", "je", "ea", "an", "n ", " je", "jea", "ean", "an ", " jea", "jean", "ean ", " jean "]
+    assert text_ngrams("a-b") == [" a", "a ", " a ", " b", "b ", " b "]
+    assert text_ngrams("MEN'S") == text_ngrams("men s")
+    assert text_ngrams("") == [] and text_ngrams(None) == text_ngrams("none")
+
+def test_vectors_are_unit_length_and_drop_common_grams():
+    vectorizer = TfidfVectorizer(TEXTS)
+    rows, columns, weights = vectorizer.transform(TEXTS)
+    np.testing.assert_allclose(np.bincount(rows, weights=weights ** 2), 1.0)
+    assert all(sum(gram in set(text_ngrams(text)) for text in TEXTS) <= 0.35 * len(TEXTS) for gram in vectorizer.vocabulary)
+
+def test_scores_match_dense_cosine(classifier):
+    np.testing.assert_allclose(classifier.scores(QUERIES), brute_force_scores(classifier, QUERIES), atol=1e-12)
+
+def test_top_k_matches_dense_ranking(classifier):
+    expected = brute_force_scores(classifier, QUERIES)
+    indices, scores = classifier.top_k(QUERIES, k=3)
+    np.testing.assert_allclose(scores, -np.sort(-expected, axis=1)[:, :3], atol=1e-12)
+    np.testing.assert_allclose(np.take_along_axis(expected, indices, axis=1), scores, atol=1e-12)
+    assert list(classifier.codes[indices[:5, 0]]) == ["6203", "6109", "4202", "6206", "6403"]
+
+@pytest.mark.parametrize("max_pairs", [1, 7, 40, 10 ** 9])
+def test_batches_match_unbatched_scores(classifier, max_pairs):
+    batches = list(classifier._batches(QUERIES, max_pairs))
+    assert sum(count for count, *_ in batches) == len(QUERIES)
+    stacked = np.vstack([classifier._scores(rows, columns, weights, count) for count, rows, columns, weights in batches])
+    np.testing.assert_allclose(stacked, classifier.scores(QUERIES), atol=1e-12)
+    if max_pairs == 1:
+        assert len(batches) == len(QUERIES)
+
+def test_classify_many_handles_missing_descriptions(classifier):
+    result = classifier.classify_many(["denim jeans", float("nan"), "", None, "zzz"])
+    assert list(result["Predicted HSN"]) == ["6203", None, None, None, None]
+    assert list(result["Certainty"]) == ["High", None, None, None, None]
+    assert list(result["Prediction Score"][1:]) == [0.0] * 4
+    assert classifier.classify_many([]).empty
+
+def test_classify_returns_master_entries(classifier):
+    matches = classifier.classify("leather handbag", k=2)
+    assert matches[0]["code"] == "4202" and matches[0]["description"] == "Heading 4202"
+    assert matches[0]["score"] >= matches[-1]["score"] > 0
+    assert classifier.classify("zzz") == []
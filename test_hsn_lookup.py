@@ -0,0 +1,62 @@
+import os
+import numpy as np
+import pytest
+from hsn_lookup import DeleteIndex, deletes, edit_distance
+from hsn_master import read_master
+
+# The delete index against a brute-force edit_distance scan of every code
+
+MASTER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "hsn_master.csv")
+DIGITS = "0123456789"
+
+def one_edit(word):
+    """Every string one insertion, deletion, substitution or adjacent transposition away"""
+    edits = {word[:i] + word[i + 1:] for i in range(len(word))}
+    edits |= {word[:i] + d + word[i:] for i in range(len(word) + 1) for d in DIGITS}
+    edits |= {word[:i] + d + word[i + 1:] for i in range(len(word)) for d in DIGITS}
+    edits |= {word[:i] + word[i + 1] + word[i] + word[i + 2:] for i in range(len(word) - 1)}
+    edits.discard(word)
+    return edits
+
+def mutate(word, rng, edits):
+    for _ in range(edits):
+        options = sorted(one_edit(word) - {""})
+        word = options[rng.integers(0, len(options))]
+    return word
+
+@pytest.fixture(scope="module")
+def codes():
+    return sorted({row[0] for row in read_master(MASTER_PATH)})
+
+def test_edit_distance_counts_the_fewest_edits():
+    rng = np.random.default_rng(1)
+    for _ in range(30):
+        word = "".join(rng.choice(list(DIGITS), rng.integers(2, 7)))
+        near = one_edit(word)
+        two = set().union(*(one_edit(w) for w in near)) - near - {word}
+        assert edit_distance(word, word) == 0
+        assert all(edit_distance(word, other) == 1 for other in near)
+        assert all(edit_distance(word, other) == 2 for other in rng.choice(sorted(two), 50))
+    assert edit_distance("6203", "6230") == 1
+    assert edit_distance("ca", "abc") == 2
+
+def test_deletes():
+    assert deletes("123", 1) == {"123", "23", "13", "12"}
+    assert deletes("12", 3) == {"12", "1", "2", ""}
+
+@pytest.mark.parametrize("max_distance", [0, 1, 2])
+def test_search_matches_brute_force_scan(codes, max_distance):
+    index = DeleteIndex(codes, max_distance=2)
+    rng = np.random.default_rng(max_distance)
+    queries = [mutate(codes[i], rng, rng.integers(0, 3)) for i in rng.integers(0, len(codes), 150)]
+    queries += ["6230", "62", "6", "620342999", "00000000", "99"]
+    for query in queries:
+        distances = ((edit_distance(query, code), code) for code in codes)
+        expected = sorted(pair for pair in distances if pair[0] <= max_distance)
+        assert index.search(query, max_distance) == expected, query
+
+def test_search_rejects_non_digits_and_long_input(codes):
+    index = DeleteIndex(codes)
+    assert index.search("62a3") == []
+    assert index.search("6" * 11) == []
+    assert len(index) == len(codes)
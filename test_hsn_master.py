@@ -0,0 +1,81 @@
+import os
+import numpy as np
+import pytest
+from hsn_master import HsnTrie, load_hsn_master, read_master
+
+# Trie queries against brute-force scans of the master rows
+
+MASTER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "hsn_master.csv")
+
+@pytest.fixture(scope="module")
+def rows():
+    return read_master(MASTER_PATH)
+
+@pytest.fixture(scope="module")
+def trie(rows):
+    return HsnTrie.from_rows(rows)
+
+def brute_parent(codes, code):
+    prefixes = [other for other in codes if other != code and code.startswith(other)]
+    return max(prefixes, key=len) if prefixes else None
+
+def test_exact_lookup_and_inherited_rates(trie, rows):
+    by_code = {code: (description, rate) for code, description, rate in rows}
+    for code, (description, rate) in by_code.items():
+        entry = trie.get(code)
+        assert entry["code"] == code and entry["description"] == description
+        # A code without its own rate takes the nearest listed ancestor's
+        ancestor = code
+        while rate is None and ancestor is not None:
+            ancestor = brute_parent(by_code, ancestor)
+            rate = by_code[ancestor][1] if ancestor is not None else None
+        assert entry["gst_rate"] == (pytest.approx(rate) if rate is not None else None)
+    assert trie.get("6203.42") == trie.get("620342")
+    assert trie.get("6299") is None and trie.get("") is None and "62" in trie
+
+def test_hierarchy_matches_brute_force(trie, rows):
+    codes = sorted({row[0] for row in rows})
+    for code in codes:
+        parent = brute_parent(codes, code)
+        assert (trie.parent(code) or {}).get("code") == parent
+        assert [e["code"] for e in trie.children(code)] == [c for c in codes if brute_parent(codes, c) == code]
+        assert [e["code"] for e in trie.path(code)] == sorted(c for c in codes if code.startswith(c))
+    assert [e["code"] for e in trie.chapters()] == [c for c in codes if len(c) == 2]
+
+@pytest.mark.parametrize("prefix", ["6", "62", "620", "6203", "62034", "9", "00"])
+def test_with_prefix_matches_brute_force(trie, rows, prefix):
+    codes = sorted({row[0] for row in rows})
+    assert [e["code"] for e in trie.with_prefix(prefix)] == [c for c in codes if c.startswith(prefix)]
+    assert [e["code"] for e in trie.with_prefix(prefix, level="Heading")] == [
+        c for c in codes if c.startswith(prefix) and len(c) == 4
+    ]
+
+@pytest.mark.parametrize("code", ["62034299", "620342", "6203", "62999999", "0000", "6"])
+def test_longest_prefix_matches_brute_force(trie, rows, code):
+    listed = [row[0] for row in rows if code.startswith(row[0])]
+    expected = max(listed, key=len) if listed else None
+    assert (trie.longest_prefix(code) or {}).get("code") == expected
+
+def test_snapshot_round_trip(trie, tmp_path):
+    path = str(tmp_path / "master.npz")
+    trie.save_snapshot(path, "source-1")
+    loaded = HsnTrie.load_snapshot(path, "source-1")
+    for name, array in trie._arrays.items():
+        np.testing.assert_array_equal(loaded._arrays[name], array)
+    assert loaded.descriptions == trie.descriptions
+    assert loaded.children("62") == trie.children("62")
+    assert HsnTrie.load_snapshot(path, "source-2") is None
+    assert HsnTrie.load_snapshot(str(tmp_path / "missing.npz"), "source-1") is None
+
+def test_snapshot_is_rebuilt_when_the_master_changes(tmp_path):
+    master = tmp_path / "master.csv"
+    snapshot = str(tmp_path / "master.npz")
+    master.write_text("code,description,gst_rate\n62,Apparel,\n6203,Men's suits,12\n", encoding="utf-8")
+    assert load_hsn_master(str(master), snapshot).get("6203")["gst_rate"] == 12
+    assert os.path.exists(snapshot)
+    master.write_text("code,description,gst_rate\n62,Apparel,\n6203,Men's suits,5\n620342,Cotton trousers,\n",
+                      encoding="utf-8")
+    os.utime(master, ns=(os.stat(master).st_atime_ns, os.stat(master).st_mtime_ns + 1_000_000_000))
+    trie = load_hsn_master(str(master), snapshot)
+    assert trie.get("620342")["gst_rate"] == 5
+    assert HsnTrie.load_snapshot(snapshot, "stale") is None
@@ -0,0 +1,85 @@
+import pandas as pd
+from market_data_cache import MarketDataCache
+
+# Offline tests of the OHLCV cache against a stubbed downloader
+
+def make_bars(start, end, listed=None, adjustment=1.0):
+    index = pd.date_range(start, end, freq="D", inclusive="left")
+    if listed is not None:
+        index = index[index >= pd.Timestamp(listed)]
+    close = pd.Series(range(100, 100 + len(index)), index=index, dtype=float)
+    return pd.DataFrame({
+        "Open": close, "High": close + 1, "Low": close - 1,
+        "Close": close, "Adj Close": close * adjustment, "Volume": 1000.0
+    })
+
+class StubDownloader:
+    """Records every call; leaves every ticker out of the first `fail` results (a failed download)"""
+
+    def __init__(self, fail=0, listed=None):
+        self.calls = []
+        self.fail = fail
+        self.listed = listed
+        self.adjustment = 1.0
+
+    def __call__(self, tickers, start, end, interval):
+        self.calls.append((tuple(tickers), pd.Timestamp(start), pd.Timestamp(end)))
+        if len(self.calls) <= self.fail:
+            return {}
+        return {ticker: make_bars(start, end, self.listed, self.adjustment) for ticker in tickers}
+
+def test_repeat_request_is_served_from_disk(tmp_path):
+    downloader = StubDownloader()
+    cache = MarketDataCache(downloader, str(tmp_path / "bars.sqlite"))
+    first = cache.get_history("AAA", "2024-01-01", "2024-03-01")
+    second = cache.get_history("AAA", "2024-01-01", "2024-03-01")
+    assert len(downloader.calls) == 1
+    assert len(first) == 60
+    pd.testing.assert_frame_equal(first, second)
+
+def test_tickers_missing_the_same_range_share_one_download(tmp_path):
+    downloader = StubDownloader()
+    cache = MarketDataCache(downloader, str(tmp_path / "bars.sqlite"))
+    histories = cache.get_histories(["AAA", "BBB"], "2024-01-01", "2024-02-01")
+    assert downloader.calls == [(("AAA", "BBB"), pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01"))]
+    assert all(len(frame) == 31 for frame in histories.values())
+
+def test_earlier_start_only_fetches_the_missing_head(tmp_path):
+    downloader = StubDownloader()
+    cache = MarketDataCache(downloader, str(tmp_path / "bars.sqlite"))
+    cache.get_history("AAA", "2024-02-01", "2024-03-01")
+    frame = cache.get_history("AAA", "2024-01-01", "2024-03-01")
+    assert downloader.calls[1][1:] == (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01"))
+    assert len(frame) == 60
+
+def test_failed_download_is_not_cached(tmp_path):
+    downloader = StubDownloader(fail=1)
+    cache = MarketDataCache(downloader, str(tmp_path / "bars.sqlite"))
+    assert cache.get_history("AAA", "2024-01-01", "2024-03-01").empty
+    assert cache.coverage("AAA") is None
+    frame = cache.get_history("AAA", "2024-01-01", "2024-03-01")
+    assert len(downloader.calls) == 2
+    assert len(frame) == 60
+
+def test_range_before_listing_is_cached_without_bars(tmp_path):
+    downloader = StubDownloader(listed="2024-02-01")
+    cache = MarketDataCache(downloader, str(tmp_path / "bars.sqlite"))
+    cache.get_history("AAA", "2024-02-01", "2024-03-01")
+    cache.get_history("AAA", "2023-01-01", "2024-03-01")
+    frame = cache.get_history("AAA", "2023-01-01", "2024-03-01")
+    assert len(downloader.calls) == 2
+    assert cache.coverage("AAA")[0] == pd.Timestamp("2023-01-01")
+    assert frame.index[0] == pd.Timestamp("2024-02-01")
+
+def test_new_adjustment_basis_refetches_the_history(tmp_path):
+    downloader = StubDownloader()
+    cache = MarketDataCache(downloader, str(tmp_path / "bars.sqlite"), refresh_after={"1d": pd.Timedelta(0)})
+    cache.get_history("AAA", "2024-01-01", "2024-03-01")
+    # A dividend scales every adjusted close before it
+    downloader.adjustment = 0.98
+    frame = cache.get_history("AAA", "2024-01-01", "2024-03-05")
+    assert downloader.calls[-1][1:] == (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-03-05"))
+    pd.testing.assert_series_equal(
+        frame["Adj Close"], make_bars("2024-01-01", "2024-03-05", adjustment=0.98)["Adj Close"],
+        check_names=False, check_freq=False
+    )
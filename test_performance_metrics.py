@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+from performance_metrics import METRIC_COLUMNS, performance_metrics, rank_tickers, rolling_sharpe
+
+# One-pass metrics against a per-ticker pandas reference
+
+PERIODS = 252
+
+def make_prices(n=500, seed=11):
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0004, 0.01, n)
+    returns = np.column_stack([market * beta + rng.normal(0, 0.01, n) for beta in (0.5, 1.0, 1.5, 1.2)])
+    prices = pd.DataFrame(100 * np.cumprod(1 + returns, axis=0), index=pd.bdate_range("2022-01-03", periods=n),
+                          columns=["AAA", "BBB", "CCC", "LATE"])
+    # Listed a year later, and a trading halt
+    prices.iloc[:250, 3] = np.nan
+    prices.iloc[300:303, 1] = np.nan
+    benchmark = pd.Series(100 * np.cumprod(1 + market), index=prices.index)
+    return prices, benchmark
+
+def reference_metrics(prices, benchmark, risk_free_rate):
+    rows = {}
+    benchmark_returns = benchmark.pct_change(fill_method=None)
+    for ticker, series in prices.items():
+        returns = series.pct_change(fill_method=None)
+        excess = returns - risk_free_rate / PERIODS
+        valid = series.dropna()
+        drawdowns = series / series.cummax() - 1
+        annualized = returns.mean() * PERIODS
+        volatility = returns.std() * np.sqrt(PERIODS)
+        downside = np.sqrt((excess.clip(upper=0) ** 2).mean()) * np.sqrt(PERIODS)
+        paired = returns.notna() & benchmark_returns.notna()
+        trough = int(np.nanargmin(drawdowns.to_numpy()))
+        peak = series.cummax().iloc[trough]
+        after = np.flatnonzero(series.to_numpy()[trough + 1:] >= peak)
+        rows[ticker] = {
+            "Total Return": valid.iloc[-1] / valid.iloc[0] - 1,
+            "Annualized Return": annualized,
+            "Volatility": volatility,
+            "Sharpe": excess.mean() * PERIODS / volatility,
+            "Sortino": excess.mean() * PERIODS / downside,
+            "Max Drawdown": drawdowns.min(),
+            "Calmar": annualized / abs(drawdowns.min()),
+            "Beta": returns[paired].cov(benchmark_returns[paired]) / benchmark_returns[paired].var(),
+            "Time to Recovery": after[0] + 1 if len(after) else np.nan,
+            "Current Drawdown": drawdowns[valid.index[-1]]
+        }
+    return pd.DataFrame(rows).T[METRIC_COLUMNS]
+
+@pytest.mark.parametrize("risk_free_rate", [0.0, 0.03])
+def test_metrics_match_pandas_reference(risk_free_rate):
+    prices, benchmark = make_prices()
+    metrics = performance_metrics(prices, benchmark, PERIODS, risk_free_rate)
+    expected = reference_metrics(prices, benchmark, risk_free_rate)
+    pd.testing.assert_frame_equal(metrics, expected.astype(float), check_exact=False, rtol=1e-9)
+
+def test_recovered_drawdown_and_short_histories():
+    prices = pd.DataFrame({
+        "UP": [10.0, 12.0, 9.0, 11.0, 12.5, 13.0],
+        "ONE": [np.nan] * 5 + [5.0]
+    }, index=pd.bdate_range("2024-01-01", periods=6))
+    metrics = performance_metrics(prices)
+    assert metrics.loc["UP", "Time to Recovery"] == 2
+    assert metrics.loc["UP", "Max Drawdown"] == pytest.approx(-0.25)
+    assert metrics.loc["UP", "Current Drawdown"] == 0
+    assert metrics.loc["ONE"].isna().all()
+
+def test_rolling_sharpe_matches_pandas_rolling():
+    prices, _ = make_prices()
+    returns = prices.pct_change(fill_method=None)
+    expected = returns.rolling(63).mean() / returns.rolling(63).std() * np.sqrt(PERIODS)
+    pd.testing.assert_frame_equal(rolling_sharpe(prices, 63, PERIODS), expected, check_exact=False, rtol=1e-6)
+
+def test_rank_tickers_orders_best_first():
+    prices, benchmark = make_prices()
+    metrics = performance_metrics(prices, benchmark)
+    by_sharpe = rank_tickers(metrics, "Sharpe")
+    assert list(by_sharpe.index) == list(metrics["Sharpe"].sort_values(ascending=False).index)
+    assert list(by_sharpe["Rank"]) == [1.0, 2.0, 3.0, 4.0]
+    assert list(rank_tickers(metrics, "Volatility").index) == list(metrics["Volatility"].sort_values().index)
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+from retail_screener import build_screen_table, parse_condition, run_screen
+
+# Screener parsing and masks against plain pandas filtering
+
+def make_prices(n=260, seed=7):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0005, 0.02, (n, 4))
+    return pd.DataFrame(100 * np.exp(np.cumsum(returns, axis=0)), index=pd.bdate_range("2024-01-01", periods=n),
+                        columns=["AAA", "BBB", "CCC", "DDD"])
+
+@pytest.mark.parametrize("text, expected", [
+    ("Price >= 10", ("Price", ">=", 10.0)),
+    ("Price>=10", ("Price", ">=", 10.0)),
+    ("RSI <= 30", ("RSI", "<=", 30.0)),
+    ("RSI < 30", ("RSI", "<", 30.0)),
+    ("P/E != 0", ("P/E", "!=", 0.0)),
+    ("Drawdown 3M < 15%", ("Drawdown 3M", "<", 15.0)),
+    ("Return 1M > -2.5", ("Return 1M", ">", -2.5)),
+    ("  Price > MA200  ", ("Price", ">", "MA200")),
+])
+def test_parse_condition(text, expected):
+    assert parse_condition(text) == expected
+
+@pytest.mark.parametrize("text", ["", "Price", "Price 10", "Prize > 10", "Price > MA300", "Price > ten", "> 10"])
+def test_parse_condition_rejects_bad_input(text):
+    with pytest.raises(ValueError):
+        parse_condition(text)
+
+def test_run_screen_matches_pandas_filter():
+    table = build_screen_table(make_prices())
+    conditions = [parse_condition("Price > MA50"), parse_condition("RSI < 60")]
+    expected_all = table[(table["Price"] > table["MA50"]) & (table["RSI"] < 60)]
+    expected_any = table[(table["Price"] > table["MA50"]) | (table["RSI"] < 60)]
+    assert list(run_screen(table, conditions).index) == sorted(expected_all.index, key=lambda t: list(table.index).index(t))
+    assert set(run_screen(table, conditions, match="any").index) == set(expected_any.index)
+    ranked = run_screen(table, [], rank_by="Return 1M")
+    assert list(ranked.index) == list(table["Return 1M"].sort_values(ascending=False).index)
+
+def test_missing_last_price_keeps_the_moving_averages():
+    prices = make_prices()
+    halted = prices.copy()
+    halted.iloc[-1, 0] = np.nan
+    table = build_screen_table(halted)
+    reference = build_screen_table(prices.iloc[:-1])
+    for field in ("MA20", "MA50", "MA200", "Volatility"):
+        assert table.loc["AAA", field] == pytest.approx(reference.loc["AAA", field])
+    assert "AAA" in run_screen(table, [parse_condition("MA200 > 0")]).index
@@ -0,0 +1,61 @@
+import re
+import numpy as np
+import pytest
+from search_index import EXACT, FIELD_PREFIX, SUBSTRING, WORD_PREFIXES, NgramIndex, normalize
+
+# Trigram index results against a brute-force scan of the records
+
+WORDS = ["cotton", "denim", "jeans", "shirt", "t-shirt", "men's", "women's", "silk", "kurta", "blue", "slim", "fit"]
+
+def make_records(n=400, seed=4):
+    rng = np.random.default_rng(seed)
+    return [
+        (f"SKU-{i:04d}", " ".join(rng.choice(WORDS, rng.integers(1, 5))), f"Brand {rng.integers(0, 20)}")
+        for i in range(n)
+    ]
+
+def brute_force(records, query):
+    """Every record whose text contains each long token and has a word starting with each short one"""
+    tokens = normalize(query).split()
+    matches = []
+    for doc, (key, *fields) in enumerate(records):
+        fields = [normalize(field) for field in fields]
+        text = "\x00" + "\x00".join(fields) + "\x00"
+        words = [word for field in fields for word in re.findall(r"[^\W_]+", field)]
+        if all(token in text if len(token) >= 3 else any(word.startswith(token) for word in words) for token in tokens):
+            matches.append(key)
+    return matches
+
+@pytest.mark.parametrize("query", ["cotton", "otto", "denim jeans", "jeans denim", "t-shirt", "men", "s", "sk",
+                                   "brand 1", "SKU", "wom sil", "kurta blue fit", "zzz", "tton sh"])
+def test_matches_equal_brute_force(query):
+    records = make_records()
+    index = NgramIndex()
+    index.add_many(records)
+    assert set(index.search(query)) == set(brute_force(records, query))
+
+def test_ranking_prefers_exact_then_prefix_then_word_starts():
+    index = NgramIndex()
+    index.add_many([
+        ("substring", "stretch denim"),
+        ("words", "denim blue stretch"),
+        ("prefix-long", "denim stretch fit jeans"),
+        ("prefix", "denim stretch fit"),
+        ("exact", "Denim  Stretch")
+    ])
+    ranked = index.ranked("denim stretch")
+    assert ranked[0] == ("exact", EXACT)
+    assert ranked[1:3] == [("prefix", FIELD_PREFIX), ("prefix-long", FIELD_PREFIX)]
+    assert dict(ranked)["words"] == WORD_PREFIXES
+    assert dict(ranked)["substring"] == WORD_PREFIXES
+    assert index.ranked("nim")[0][1] == SUBSTRING
+    assert index.search("denim stretch", limit=2) == ["exact", "prefix"]
+
+def test_ties_go_to_the_newest_record_and_replaced_fields_stop_matching():
+    index = NgramIndex()
+    index.add_many([("old", "linen shirt"), ("new", "linen shirt")])
+    assert index.search("linen") == ["new", "old"]
+    index.add("old", "wool coat")
+    assert index.search("linen") == ["new"]
+    assert index.search("wool") == ["old"]
+    assert len(index) == 2 and "old" in index
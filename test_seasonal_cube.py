@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+from seasonal_cube import SeasonalCube, month_index
+
+# Offline tests of the seasonal cube against a stubbed price loader
+
+class StubLoader:
+    """Records every call; leaves the tickers in `failed` out, and has no prices before `listed`"""
+
+    def __init__(self, failed=(), listed=None):
+        self.calls = []
+        self.failed = set(failed)
+        self.listed = listed or {}
+
+    def __call__(self, tickers, start, end):
+        self.calls.append(tuple(tickers))
+        index = pd.bdate_range(start, end, inclusive="left")
+        prices = pd.DataFrame({
+            ticker: 100 * np.exp(np.cumsum(np.full(len(index), 0.001)))
+            for ticker in tickers if ticker not in self.failed
+        }, index=index)
+        for ticker, listed in self.listed.items():
+            if ticker in prices:
+                prices.loc[prices.index < pd.Timestamp(listed), ticker] = np.nan
+        return prices
+
+def test_failed_ticker_is_loaded_again(tmp_path):
+    loader = StubLoader(failed={"BBB"})
+    cube = SeasonalCube(loader, str(tmp_path / "cube.sqlite"))
+    first, last = month_index(pd.Timestamp("2023-01-01")), month_index(pd.Timestamp("2023-12-01"))
+    cube.update(["AAA", "BBB"], first, last)
+    assert cube.coverage("AAA") == (first, last)
+    assert cube.coverage("BBB") is None
+
+    loader.failed.clear()
+    cube.update(["AAA", "BBB"], first, last)
+    assert loader.calls[-1] == ("BBB",)
+    assert cube.coverage("BBB") == (first, last)
+    assert len(cube.read(["BBB"])) == 12
+
+def test_months_before_listing_are_not_loaded_again(tmp_path):
+    loader = StubLoader(listed={"BBB": "2023-07-01"})
+    cube = SeasonalCube(loader, str(tmp_path / "cube.sqlite"))
+    first, last = month_index(pd.Timestamp("2023-01-01")), month_index(pd.Timestamp("2023-12-01"))
+    cube.update(["AAA", "BBB"], first, last)
+    assert cube.update(["AAA", "BBB"], first, last) == 0
+    assert len(loader.calls) == 1
+    assert cube.coverage("BBB") == (first, last)
+    assert cube.read(["BBB"])["month"].min() == 7
@@ -0,0 +1,47 @@
+import pandas as pd
+import market_data
+from shared_price_store import SharedPriceStore
+
+# get_shared_history against a stubbed OHLCV history with a bar for every calendar day up to today
+
+class StubHistory:
+    def __init__(self):
+        self.calls = 0
+        self.offline = False
+
+    def __call__(self, ticker, start=None, end=None, interval="1d", period=None):
+        self.calls += 1
+        index = pd.date_range(pd.Timestamp(start), pd.Timestamp.now().normalize(), freq="D", name="Date")
+        if end is not None:
+            index = index[index < pd.Timestamp(end)]
+        if self.offline:
+            index = index[:0]
+        close = pd.Series(range(len(index)), index=index, dtype=float) + index.day
+        return pd.DataFrame({
+            "Open": close, "High": close, "Low": close, "Close": close, "Adj Close": close, "Volume": 1.0
+        })
+
+def use_stubs(monkeypatch, tmp_path):
+    history = StubHistory()
+    store = SharedPriceStore(str(tmp_path / "store"))
+    monkeypatch.setattr(market_data, "get_history", history)
+    monkeypatch.setattr(market_data, "get_shared_store", lambda: store)
+    return history, store
+
+def test_todays_bar_is_appended_but_not_stored(monkeypatch, tmp_path):
+    _, store = use_stubs(monkeypatch, tmp_path)
+    today = pd.Timestamp.now().normalize()
+    frame = market_data.get_shared_history("AAA", start=today - pd.Timedelta(days=10))
+    assert frame.index[-1] == today
+    assert len(frame) == 11
+    assert store.read("AAA").index[-1] == today - pd.Timedelta(days=1)
+
+def test_empty_sync_does_not_advance_the_synced_range(monkeypatch, tmp_path):
+    history, store = use_stubs(monkeypatch, tmp_path)
+    today = pd.Timestamp.now().normalize()
+    history.offline = True
+    market_data.get_shared_history("AAA", start=today - pd.Timedelta(days=10))
+    assert store.manifest("AAA") is None
+    history.offline = False
+    frame = market_data.get_shared_history("AAA", start=today - pd.Timedelta(days=10))
+    assert len(frame) == 11
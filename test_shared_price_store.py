@@ -0,0 +1,67 @@
+import os
+import numpy as np
+import pandas as pd
+from market_data_cache import BAR_COLUMNS
+from shared_price_store import SharedPriceStore
+
+# Shared store reads against the frames that were appended, concatenated with pandas
+
+def make_bars(start, periods, offset=0.0):
+    index = pd.date_range(start, periods=periods, freq="D", name="Date")
+    close = np.arange(periods, dtype=float) + 100 + offset
+    return pd.DataFrame({
+        "Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Adj Close": close * 0.9, "Volume": 1000.0
+    }, index=index)
+
+def test_append_writes_only_newer_bars(tmp_path):
+    store = SharedPriceStore(str(tmp_path))
+    first = make_bars("2024-01-01", 30)
+    assert store.append("AAA", first) == 30
+    # Overlapping download: only the bars after the last stored one are written
+    second = make_bars("2024-01-20", 30, offset=0.5)
+    assert store.append("AAA", second) == 19
+    expected = pd.concat([first, second[second.index > first.index[-1]]])
+    pd.testing.assert_frame_equal(store.read("AAA"), expected[list(BAR_COLUMNS)], check_freq=False)
+    pd.testing.assert_frame_equal(
+        store.read("AAA", start="2024-01-10", end="2024-02-05"),
+        expected.loc["2024-01-10":"2024-02-04"], check_freq=False
+    )
+    manifest = store.manifest("AAA")
+    assert (manifest["generation"], manifest["rows"], manifest["version"]) == (0, 49, 2)
+
+def test_backfill_publishes_a_new_generation(tmp_path):
+    store = SharedPriceStore(str(tmp_path))
+    recent = make_bars("2024-03-01", 20)
+    store.append("AAA", recent)
+    old_view = store.read("AAA")
+    older = make_bars("2024-01-01", 70, offset=-50.0)
+    store.append("AAA", older)
+    expected = pd.concat([older, recent[recent.index > older.index[-1]]])
+    pd.testing.assert_frame_equal(store.read("AAA"), expected, check_freq=False)
+    assert store.manifest("AAA")["generation"] == 1
+    assert sorted(os.listdir(tmp_path / "1d" / "AAA")) == [".lock", "g1", "manifest.json"]
+    # A reader that mapped the old generation keeps a valid view
+    pd.testing.assert_frame_equal(old_view, recent, check_freq=False)
+
+def test_other_readers_see_published_rows_only(tmp_path):
+    writer = SharedPriceStore(str(tmp_path))
+    reader = SharedPriceStore(str(tmp_path))
+    writer.append("AAA", make_bars("2024-01-01", 10))
+    assert len(reader.read("AAA")) == 10
+    # Bytes past the published rows (an interrupted write) are not visible and are overwritten
+    with open(tmp_path / "1d" / "AAA" / "g0" / "close.f8", "ab") as f:
+        f.write(np.full(5, -1.0).tobytes())
+    assert len(reader.read("AAA")) == 10
+    writer.append("AAA", make_bars("2024-01-01", 15))
+    pd.testing.assert_frame_equal(reader.read("AAA"), make_bars("2024-01-01", 15), check_freq=False)
+    assert reader.tickers() == ["AAA"]
+
+def test_covered_range_grows_without_bars(tmp_path):
+    store = SharedPriceStore(str(tmp_path))
+    store.append("AAA", make_bars("2024-01-01", 0), covered_from="2023-01-01", covered_to="2023-06-01")
+    assert store.read("AAA").empty
+    store.append("AAA", make_bars("2024-01-01", 5), covered_from="2023-06-01", covered_to="2024-01-06")
+    manifest = store.manifest("AAA")
+    assert manifest["covered_from"] == pd.Timestamp("2023-01-01").value
+    assert manifest["covered_to"] == pd.Timestamp("2024-01-06").value
+    assert manifest["first_ts"] == pd.Timestamp("2024-01-01").value
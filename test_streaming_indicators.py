@@ -0,0 +1,64 @@
+import json
+import numpy as np
+import pandas as pd
+from streaming_indicators import EMA, SMA, LiveIndicators, RollingMax, RollingMin, WilderRSI, indicator_from_state
+
+# Streaming indicators against pandas on a price series with missing values
+
+def make_prices(n=300, seed=3):
+    rng = np.random.default_rng(seed)
+    prices = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, n))))
+    prices[[0, 40, 41, 42, 150, 299]] = np.nan
+    return prices
+
+def stream(indicator, values):
+    return pd.Series([indicator.update(value) for value in values], dtype=float)
+
+def wilder_rsi(prices, window):
+    """Wilder's RSI over the valid prices, carried over the missing ones"""
+    valid = prices.dropna()
+    change = valid.diff().iloc[1:]
+    gain, loss = change.clip(lower=0), (-change).clip(lower=0)
+    def smooth(series):
+        seeded = pd.concat([pd.Series([series.iloc[:window].mean()]), series.iloc[window:]])
+        return pd.Series(seeded.ewm(alpha=1 / window, adjust=False).mean().to_numpy(), index=series.index[window - 1:])
+    rsi = 100 - 100 / (1 + smooth(gain) / smooth(loss))
+    return rsi.reindex(prices.index).where(prices.index >= rsi.index[0]).ffill()
+
+def test_sma_matches_pandas_rolling_mean():
+    prices = make_prices()
+    np.testing.assert_allclose(stream(SMA(20), prices), prices.rolling(20).mean())
+
+def test_ema_matches_pandas_ewm():
+    prices = make_prices()
+    np.testing.assert_allclose(stream(EMA(20), prices), prices.ewm(span=20, adjust=False).mean())
+
+def test_rolling_extremes_match_pandas():
+    prices = make_prices()
+    np.testing.assert_allclose(stream(RollingMax(30), prices), prices.rolling(30, min_periods=1).max())
+    np.testing.assert_allclose(stream(RollingMin(30), prices), prices.rolling(30, min_periods=1).min())
+
+def test_wilder_rsi_skips_missing_prices():
+    prices = make_prices()
+    np.testing.assert_allclose(stream(WilderRSI(14), prices), wilder_rsi(prices, 14))
+
+def test_state_round_trip_continues_identically():
+    prices = make_prices()
+    for make in (lambda: SMA(20), lambda: EMA(20), lambda: WilderRSI(14), lambda: RollingMax(30), lambda: RollingMin(30)):
+        straight, saved = make(), make()
+        expected = stream(straight, prices)
+        head = stream(saved, prices[:42])
+        restored = indicator_from_state(json.loads(json.dumps(saved.to_state())))
+        tail = stream(restored, prices[42:])
+        np.testing.assert_allclose(pd.concat([head, tail], ignore_index=True), expected)
+
+def test_live_indicators_round_trip():
+    prices = make_prices()
+    frame = pd.DataFrame({"Close": prices, "High": prices, "Low": prices, "Volume": 1.0},
+                         index=pd.bdate_range("2024-01-01", periods=len(prices)))
+    live = LiveIndicators()
+    live.update_frame(frame.iloc[:200])
+    restored = LiveIndicators.from_state(json.loads(json.dumps(live.to_state())))
+    live.update_frame(frame)
+    assert restored.update_frame(frame) == 100
+    assert restored.values() == live.values()
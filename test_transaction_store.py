@@ -0,0 +1,113 @@
+import sqlite3
+import threading
+from datetime import date
+import pandas as pd
+import pytest
+from transaction_store import COLUMNS, SORT_COLUMNS, TransactionStore, ensure_sample_activity
+
+# Transaction store queries against plain Python filtering of the inserted rows
+
+def make_store(tmp_path, codes):
+    store = TransactionStore(str(tmp_path / "transactions.sqlite"))
+    store.add_many(
+        ("2024-01-0%d" % (i % 9 + 1), code, "Product %s" % code, 10, "Inward", "Completed", "Mumbai", 100.0)
+        for i, code in enumerate(codes)
+    )
+    return store
+
+def test_stored_prefix_matches_codes_at_any_depth(tmp_path):
+    store = make_store(tmp_path, ["6203", "6109", "61091000"])
+    assert store.stored_prefix("62034200") == "6203"
+    assert store.stored_prefix("6203") == "6203"
+    assert store.stored_prefix("61091000") == "61091000"
+    assert store.stored_prefix("6109") == "6109"
+    assert store.stored_prefix("6204") is None
+    assert store.stored_prefix("62") is None
+
+def test_lookup_by_stored_prefix_finds_the_heading_rows(tmp_path):
+    store = make_store(tmp_path, ["6203", "6203", "6109"])
+    page = store.query(search=store.stored_prefix("62034200"), limit=5)
+    assert list(page["HSN Code"]) == ["6203", "6203"]
+
+def test_summary_totals_match_pandas(tmp_path):
+    store = TransactionStore(str(tmp_path / "transactions.sqlite"))
+    ensure_sample_activity(store, today=date(2024, 3, 31), days=10, rows_per_day=20, seed=3)
+    rows = store.query(limit=10_000)
+    expected = rows.groupby("HSN Code").agg(count=("Value", "size"), quantity=("Quantity", "sum"), value=("Value", "sum"))
+    summary = store.summary("HSN Code")
+    assert set(summary) == set(expected.index)
+    for code, (count, quantity, value) in summary.items():
+        assert (count, quantity) == (expected.loc[code, "count"], expected.loc[code, "quantity"])
+        assert value == expected.loc[code, "value"]
+
+def test_sample_activity_is_added_once_per_day(tmp_path):
+    path = str(tmp_path / "transactions.sqlite")
+    stores = [TransactionStore(path) for _ in range(4)]
+    today = date(2024, 3, 31)
+    threads = [threading.Thread(target=ensure_sample_activity, args=(store, today, 10, 20)) for store in stores]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    rows = stores[0].query(limit=10_000)
+    assert sorted(rows["Date"].unique()) == [f"2024-03-{day}" for day in range(22, 32)]
+    assert ensure_sample_activity(stores[0], today, 10, 20) == 0
+    added = ensure_sample_activity(stores[1], date(2024, 4, 2), 10, 20)
+    assert added == stores[0].count() - len(rows) > 0
+
+class RecordingConnection(sqlite3.Connection):
+    statements = []
+
+    def execute(self, sql, params=()):
+        RecordingConnection.statements.append((sql, params))
+        return super().execute(sql, params)
+
+@pytest.fixture(scope="module")
+def sample_store(tmp_path_factory):
+    store = TransactionStore(str(tmp_path_factory.mktemp("store") / "transactions.sqlite"))
+    ensure_sample_activity(store, today=date(2024, 3, 31), days=30, rows_per_day=40, seed=9)
+    store._connect = lambda: sqlite3.connect(store.path, timeout=30, factory=RecordingConnection)
+    return store
+
+def reference_page(frame, sort, descending, offset, limit, chapters=None, search=None, status=None):
+    if chapters is not None:
+        frame = frame[frame["HSN Code"].str[:2].astype(int).between(*chapters)]
+    if search is not None and search.isdigit():
+        frame = frame[frame["HSN Code"].str.startswith(search)]
+    elif search is not None:
+        frame = frame[frame["Product Category"].str.lower().str.contains(search)]
+    if status is not None:
+        frame = frame[frame["Status"] == status]
+    by = [name for column in SORT_COLUMNS[sort] for name, stored in COLUMNS.items() if stored == column]
+    frame = frame.assign(id=frame["Transaction ID"].str[-7:].astype(int))
+    frame = frame.sort_values(by + ["id"], ascending=not descending, kind="stable")
+    return frame.drop(columns="id").iloc[offset:offset + limit].reset_index(drop=True)
+
+@pytest.mark.parametrize("sort", list(SORT_COLUMNS))
+@pytest.mark.parametrize("filters", [
+    {}, {"chapters": (61, 62)}, {"search": "62"}, {"search": "6109"}, {"search": "suit"},
+    {"search": "shirt", "status": "Pending"}, {"chapters": (42, 61), "status": "Completed"}
+])
+def test_pages_match_pandas_sort(sample_store, sort, filters):
+    everything = sample_store.query(limit=10_000)
+    for descending in (True, False):
+        for offset in (0, 37, 400):
+            page = sample_store.query(sort=sort, descending=descending, offset=offset, limit=25, **filters)
+            expected = reference_page(everything, sort, descending, offset, 25, **filters)
+            pd.testing.assert_frame_equal(page, expected, check_dtype=False)
+
+@pytest.mark.parametrize("filters, index", [
+    ({"chapters": (61, 62)}, "idx_transactions_hsn_date"),
+    ({"search": "shirt"}, "idx_transactions_product_date")
+])
+def test_date_sorted_code_and_product_pages_scan_one_index_per_value(sample_store, filters, index):
+    RecordingConnection.statements.clear()
+    sample_store.query(offset=100, limit=25, **filters)
+    sql, params = RecordingConnection.statements[-1]
+    assert "UNION ALL" in sql
+    with sqlite3.connect(sample_store.path) as conn:
+        plan = [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+    scans = [step for step in plan if "transactions" in step]
+    assert scans and all(index in step for step in scans)
+    # Each part stops after offset + limit rows
+    assert params.count(125) == sql.count("UNION ALL") + 1
@@ -0,0 +1,424 @@
+import sqlite3
+import threading
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+from app_config import TRANSACTION_SAMPLE_DAYS, TRANSACTION_SAMPLE_ROWS_PER_DAY, cache_path
+from search_index import NgramIndex
+
+# Persistent HSN transaction store (SQLite, WAL mode).
+#
+# Every filter the transaction views offer is backed by an index that ends in
+# the date, so "filter, newest first, one page" is an index range scan that
+# stops after the page instead of a sort over every matching row. A chapter or
+# HSN prefix filter covers several codes; it is answered by one such scan per
+# code, merged. Transaction IDs are not stored: they are derived from the row
+# id and date, so an ID search is a primary-key lookup. A product search is
+# matched against the distinct product names with a trigram index, which
+# does not grow with the history, and the rows of the matching products are
+# read through the (product, date) index like the codes of a chapter.
+#
+# Row counts are the expensive part of paging through millions of rows, so
+# they are cached per filter set until a new row is added.
+
+# Column name shown in the app -> column in the transactions table
+COLUMNS = {
+    "Date": "date",
+    "HSN Code": "hsn_code",
+    "Product Category": "product",
+    "Quantity": "quantity",
+    "Transaction Type": "type",
+    "Status": "status",
+    "Location": "location",
+    "Value": "value"
+}
+
+# Sort options -> ORDER BY columns (before the final id tie-break). Each
+# order matches an index, so a sorted page is read straight off the index.
+SORT_COLUMNS = {
+    "Date": ["date"],
+    "HSN Code": ["hsn_code", "date"],
+    "Value": ["value"],
+    "Status": ["status", "date"],
+    "Transaction Type": ["type", "date"],
+    "Location": ["location", "date"]
+}
+
+TRANSACTION_TYPES = ["Inward", "Outward", "Transfer", "Return"]
+STATUSES = ["Completed", "Pending", "Cancelled", "On Hold"]
+LOCATIONS = ["Mumbai", "Delhi", "Bangalore", "Chennai", "Hyderabad"]
+
+# Catalogue used for generated sample activity: HSN code -> product category
+SAMPLE_PRODUCTS = {
+    "6109": "T-shirts",
+    "6203": "Men's trousers",
+    "6204": "Women's suits",
+    "6110": "Sweaters",
+    "6205": "Men's shirts",
+    "4202": "Handbags",
+    "6403": "Footwear",
+    "6104": "Women's suits (knitted)",
+    "6206": "Women's blouses",
+    "6201": "Men's coats"
+}
+SAMPLE_STATUS_WEIGHTS = [0.7, 0.2, 0.05, 0.05]
+
+# Code ranges (or product searches) matching more distinct values than this
+# are scanned as one range
+MAX_CODE_SCANS = 200
+
+_ID_SQL = "'TRX-' || replace(date, '-', '') || '-' || printf('%07d', id)"
+
+def transaction_id(row_id, day):
+    """Format the transaction ID of a stored row"""
+    return f"TRX-{pd.Timestamp(day):%Y%m%d}-{row_id:07d}"
+
+def parse_transaction_id(text):
+    """Return the row id encoded in a transaction ID (TRX-YYYYMMDD-NNNNNNN), or None"""
+    parts = text.strip().upper().split("-")
+    if len(parts) == 3 and parts[0] == "TRX" and parts[2].isdigit():
+        return int(parts[2])
+    return None
+
+def _filters(start=None, end=None, hsn_code=None, chapters=None, transaction_type=None,
+             status=None, location=None, search=None, products=None, scan_column=None):
+    """Translate filters into (SQL conditions, parameters, HSN code range or None, products or None)
+
+    start/end are inclusive dates, chapters a (first, last) HSN chapter range
+    and search matches a transaction ID or an HSN code prefix; a product name
+    search arrives as the list of matching products (see
+    TransactionStore.resolve_search). Chapter and HSN prefix filters are
+    returned as a [low, high) code range and products as a list rather than
+    conditions, because the best way to scan them depends on the sort.
+
+    scan_column names the index a sorted query should walk: type, status and
+    location filters on other columns are then checked row by row ("+column")
+    instead of driving the scan, which would mean sorting every match.
+    """
+    clauses, params = [], []
+    hsn_range = None
+
+    def narrow(low, high):
+        nonlocal hsn_range
+        hsn_range = (max(low, hsn_range[0]), min(high, hsn_range[1])) if hsn_range else (low, high)
+
+    if start is not None:
+        clauses.append("date >= ?")
+        params.append(pd.Timestamp(start).strftime("%Y-%m-%d"))
+    if end is not None:
+        clauses.append("date <= ?")
+        params.append(pd.Timestamp(end).strftime("%Y-%m-%d"))
+    if hsn_code:
+        clauses.append("hsn_code = ?")
+        params.append(str(hsn_code))
+    if chapters is not None:
+        # Codes sort as text, so chapters first..last are codes in ["first", "last + 1")
+        narrow(f"{chapters[0]:02d}", f"{chapters[1] + 1:02d}")
+    for column, value in (("type", transaction_type), ("status", status), ("location", location)):
+        if value:
+            clauses.append(f"{'+' if scan_column not in (None, column) else ''}{column} = ?")
+            params.append(value)
+    if search:
+        search = search.strip()
+        row_id = parse_transaction_id(search)
+        if row_id is not None:
+            clauses.append("id = ?")
+            params.append(row_id)
+        elif search.isdigit():
+            # ":" sorts right after "9", so this range holds every code starting with the digits
+            narrow(search, search + ":")
+    return clauses, params, hsn_range, products
+
+def _in(column, values):
+    return f"{column} IN ({', '.join('?' * len(values))})"
+
+def _where_sql(clauses):
+    return (" WHERE " + " AND ".join(clauses)) if clauses else ""
+
+def _where(**filters):
+    """Return the WHERE clause and parameters for filters, with any HSN code range and products as conditions"""
+    clauses, params, hsn_range, products = _filters(**filters)
+    if products is not None:
+        clauses = [_in("product", products)] + clauses
+        params = list(products) + params
+    if hsn_range is not None:
+        clauses = ["hsn_code >= ?", "hsn_code < ?"] + clauses
+        params = list(hsn_range) + params
+    return _where_sql(clauses), params
+
+class TransactionStore:
+    """Indexed, persistent store of HSN inventory transactions"""
+
+    def __init__(self, path=None):
+        self.path = path or cache_path("transactions.sqlite")
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._product_index = NgramIndex()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS transactions (
+                    id INTEGER PRIMARY KEY,
+                    date TEXT NOT NULL,
+                    hsn_code TEXT NOT NULL,
+                    product TEXT NOT NULL,
+                    quantity INTEGER NOT NULL,
+                    type TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    location TEXT NOT NULL,
+                    value REAL NOT NULL
+                )
+            """)
+            # Distinct HSN codes, so code ranges can be expanded without scanning transactions
+            conn.execute("CREATE TABLE IF NOT EXISTS hsn_codes (code TEXT PRIMARY KEY) WITHOUT ROWID")
+            # Distinct product names, the records of the product search index
+            conn.execute("CREATE TABLE IF NOT EXISTS products (name TEXT PRIMARY KEY) WITHOUT ROWID")
+            if conn.execute("SELECT NOT EXISTS (SELECT 1 FROM products)").fetchone()[0]:
+                # Stores created before the product table existed
+                conn.execute("INSERT OR IGNORE INTO products SELECT DISTINCT product FROM transactions")
+            for name, columns in (
+                ("date", "date"),
+                ("hsn_date", "hsn_code, date"),
+                ("product_date", "product, date"),
+                ("status_date", "status, date"),
+                ("type_date", "type, date"),
+                ("location_date", "location, date"),
+                ("value", "value")
+            ):
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_transactions_{name} ON transactions ({columns})")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def add_many(self, rows):
+        """Insert (date, hsn_code, product, quantity, type, status, location, value) tuples
+
+        Returns the id of the last inserted row.
+        """
+        rows = list(rows)
+        with self._lock, self._connect() as conn:
+            return self._insert(conn, rows)
+
+    def _insert(self, conn, rows):
+        conn.executemany(
+            "INSERT INTO transactions (date, hsn_code, product, quantity, type, status, location, value) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO hsn_codes VALUES (?)",
+            [(code,) for code in {row[1] for row in rows}]
+        )
+        products = {row[2] for row in rows}
+        conn.executemany("INSERT OR IGNORE INTO products VALUES (?)", [(name,) for name in products])
+        for name in products:
+            self._product_index.add(name, name)
+        return conn.execute("SELECT last_insert_rowid()").fetchone()[0] if rows else None
+
+    def add_after_last_date(self, generate):
+        """Insert the rows of generate(newest stored date or None) and return how many were added
+
+        The newest date is read inside the write transaction (BEGIN IMMEDIATE
+        takes the write lock first), so processes topping up the store at the
+        same time cannot both add the same days.
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT MAX(date) FROM transactions").fetchone()
+            rows = list(generate(pd.Timestamp(row[0]).date() if row[0] else None))
+            self._insert(conn, rows)
+        return len(rows)
+
+    def add(self, day, hsn_code, product, quantity, transaction_type, status, location, value):
+        """Insert one transaction and return its transaction ID"""
+        day = pd.Timestamp(day).strftime("%Y-%m-%d")
+        row_id = self.add_many([
+            (day, str(hsn_code), product, int(quantity), transaction_type, status, location, float(value))
+        ])
+        return transaction_id(row_id, day)
+
+    def codes_between(self, low, high):
+        """Return the stored HSN codes in [low, high)"""
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT code FROM hsn_codes WHERE code >= ? AND code < ? ORDER BY code", (low, high)
+            )]
+
+    def stored_prefix(self, code, min_length=4):
+        """Return the longest prefix of code (at least min_length digits) that starts a stored HSN code, or None
+
+        The master lists codes down to 8 digits while transactions may be
+        booked under the 4-digit heading, and the other way round.
+        """
+        code = str(code).strip()
+        with self._connect() as conn:
+            for length in range(len(code), min_length - 1, -1):
+                prefix = code[:length]
+                if conn.execute(
+                    "SELECT 1 FROM hsn_codes WHERE code >= ? AND code < ? LIMIT 1", (prefix, prefix + ":")
+                ).fetchone():
+                    return prefix
+        return None
+
+    def search_products(self, text, limit=None):
+        """Return the stored product names matching every word of text, best match first"""
+        with self._connect() as conn:
+            stored = conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+            if stored != len(self._product_index):
+                # Products added by another process (or before this one started)
+                self._product_index.add_many((name, name) for name, in conn.execute("SELECT name FROM products"))
+        return self._product_index.search(text, limit)
+
+    def resolve_search(self, filters):
+        """Return filters with a product name search replaced by the list of matching products"""
+        search = (filters.get("search") or "").strip()
+        if not search or search.isdigit() or parse_transaction_id(search) is not None:
+            return filters
+        filters = dict(filters, search=None)
+        filters["products"] = self.search_products(search)
+        return filters
+
+    def last_id(self):
+        """Return the id of the newest row (0 when empty); it changes whenever rows are added"""
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()[0]
+
+    def last_date(self):
+        """Return the newest transaction date, or None"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(date) FROM transactions").fetchone()
+        return pd.Timestamp(row[0]).date() if row[0] else None
+
+    def query(self, sort="Date", descending=True, offset=0, limit=50, **filters):
+        """Return one page of transactions matching the filters as a DataFrame
+
+        Filters are those of _filters(). Ties are broken by id, so pages are stable.
+        """
+        scan_column = SORT_COLUMNS[sort][0] if sort != "Date" else None
+        clauses, params, hsn_range, products = _filters(scan_column=scan_column, **self.resolve_search(filters))
+        direction = "DESC" if descending else "ASC"
+        order = "ORDER BY " + ", ".join(f"{column} {direction}" for column in SORT_COLUMNS[sort] + ["id"])
+        select = f"SELECT {_ID_SQL} AS transaction_id, {', '.join(COLUMNS.values())}, id FROM transactions"
+        columns = ["Transaction ID"] + list(COLUMNS)
+
+        codes = self.codes_between(*hsn_range) if hsn_range is not None else None
+        if codes == [] or products == []:
+            return pd.DataFrame(columns=columns)
+        scan = None
+        if sort == "Date":
+            if products and len(products) <= MAX_CODE_SCANS:
+                scan = ("product", products)
+            elif codes and len(codes) <= MAX_CODE_SCANS:
+                scan = ("hsn_code", codes)
+        if codes and (scan is None or scan[0] != "hsn_code"):
+            # Sorted by code, the range is an index scan; otherwise "+" keeps SQLite
+            # on the sort column's (or scanned product's) index, filtering codes as it goes
+            prefix = "" if sort == "HSN Code" and scan is None else "+"
+            clauses = [f"{prefix}hsn_code >= ?", f"{prefix}hsn_code < ?"] + clauses
+            params = list(hsn_range) + params
+        if products and scan is None:
+            clauses = [_in("+product", products)] + clauses
+            params = list(products) + params
+        if scan is not None:
+            # One (code or product, date) index scan per value, each already in date
+            # order and cut at the page end; the outer query merges them
+            column, values = scan
+            part = f"SELECT * FROM ({select}{_where_sql([f'{column} = ?'] + clauses)} {order} LIMIT ?)"
+            sql = " UNION ALL ".join([part] * len(values)) + f" {order} LIMIT ? OFFSET ?"
+            params = [value for v in values for value in [v] + params + [int(offset + limit)]]
+        else:
+            sql = f"{select}{_where_sql(clauses)} {order} LIMIT ? OFFSET ?"
+        params = params + [int(limit), int(offset)]
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return pd.DataFrame([row[:-1] for row in rows], columns=columns)
+
+    def count(self, **filters):
+        """Return how many transactions match the filters (see _filters for the filter names)
+
+        Counts are cached until a row is added.
+        """
+        filters = self.resolve_search(filters)
+        if filters.get("products") == []:
+            return 0
+        where, params = _where(**filters)
+        key = (where, tuple(params), self.last_id())
+        with self._lock:
+            cached = self._counts.get(key)
+        if cached is not None:
+            return cached
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM transactions{where}", params).fetchone()[0]
+        with self._lock:
+            if len(self._counts) > 256:
+                self._counts.clear()
+            self._counts[key] = total
+        return total
+
+    def summary(self, by, **filters):
+        """Return {value of column `by`: (transactions, total quantity, total value)} for matching rows"""
+        column = COLUMNS.get(by, by)
+        filters = self.resolve_search(filters)
+        if filters.get("products") == []:
+            return {}
+        where, params = _where(**filters)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {column}, COUNT(*), SUM(quantity), SUM(value) FROM transactions{where} GROUP BY {column}",
+                params
+            ).fetchall()
+        return {key: (count, quantity, value) for key, count, quantity, value in rows}
+
+def sample_rows(day, count, rng):
+    """Generate `count` random sample transactions dated `day`, as insert tuples"""
+    codes = np.array(list(SAMPLE_PRODUCTS))
+    picks = rng.integers(0, len(codes), count)
+    quantity = rng.integers(5, 51, count)
+    value = quantity * rng.integers(500, 2001, count)
+    types = rng.integers(0, len(TRANSACTION_TYPES), count)
+    statuses = rng.choice(len(STATUSES), count, p=SAMPLE_STATUS_WEIGHTS)
+    locations = rng.integers(0, len(LOCATIONS), count)
+    day = day.strftime("%Y-%m-%d")
+    return [
+        (day, codes[p], SAMPLE_PRODUCTS[codes[p]], int(q), TRANSACTION_TYPES[t], STATUSES[s], LOCATIONS[l], float(v))
+        for p, q, v, t, s, l in zip(picks, quantity, value, types, statuses, locations)
+    ]
+
+def ensure_sample_activity(store, today=None, days=TRANSACTION_SAMPLE_DAYS,
+                           rows_per_day=TRANSACTION_SAMPLE_ROWS_PER_DAY, seed=None):
+    """Fill the store with generated activity for every day up to today that has none yet
+
+    An empty store gets `days` days of history; afterwards only days since the
+    newest stored date are added, so the demo data keeps moving forward.
+    Returns the number of rows added.
+    """
+    today = today or date.today()
+    rng = np.random.default_rng(seed)
+
+    def generate(last):
+        day = last + timedelta(days=1) if last else today - timedelta(days=days - 1)
+        rows = []
+        while day <= today:
+            # Weekly rhythm: fewer movements at weekends
+            count = int(rows_per_day * (0.6 if day.weekday() >= 5 else 1.0) * rng.uniform(0.85, 1.15))
+            rows.extend(sample_rows(day, count, rng))
+            day += timedelta(days=1)
+        return rows
+
+    return store.add_after_last_date(generate)
+
+_store = None
+_store_topped_up = None
+_store_lock = threading.Lock()
+
+def get_transaction_store():
+    """Return the process-wide transaction store, topped up with sample activity once a day"""
+    global _store, _store_topped_up
+    with _store_lock:
+        if _store is None:
+            _store = TransactionStore()
+        today = date.today()
+        if _store_topped_up != today:
+            ensure_sample_activity(_store, today)
+            _store_topped_up = today
+    return _store
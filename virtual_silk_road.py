@@ -4,6 +4,7 @@ import numpy as np
 import time
 import plotly.graph_objects as go
 import plotly.express as px
+from lazy_tabs import lazy_tabs
 
 def show_virtual_silk_road():
     """
@@ -29,15 +30,15 @@ def show_virtual_silk_road():
     )
     
     # Emperor's dashboard tabs
-    tabs = st.tabs([
+    tabs = lazy_tabs([
         "🌐 Ecosystem Overview", 
         "🔬 License Management", 
         "📊 Governance Analytics",
         "📅 Review Calendar"
-    ])
+    ], key="vsr_dashboard_tab")
     
     # Tab 1: Ecosystem Overview
-    with tabs[0]:
+    if tabs[0]:
         st.header("Enterprise Ecosystem Digital Twin")
         st.write("Complete visualization of the interconnected components in the Empire OS governance model.")
         
@@ -195,7 +196,7 @@ def show_virtual_silk_road():
             """, unsafe_allow_html=True)
     
     # Tab 2: License Management
-    with tabs[1]:
+    if tabs[1]:
         st.header("License Management Console")
         st.write("Emperor-level control over all license allocations, permissions, and restrictions.")
         
@@ -286,7 +287,7 @@ def show_virtual_silk_road():
         st.table(df_activations)
     
     # Tab 3: Governance Analytics
-    with tabs[2]:
+    if tabs[2]:
         st.header("Governance Analytics")
         st.write("Comprehensive analytics on governance metrics across the Empire OS ecosystem.")
         
@@ -438,7 +439,7 @@ def show_virtual_silk_road():
         st.dataframe(df_issues, use_container_width=True)
     
     # Tab 4: Review Calendar
-    with tabs[3]:
+    if tabs[3]:
         st.header("Governance Review Calendar")
         st.write("Schedule and tracking for governance reviews conducted by the Emperor and the council of ministers.")
         
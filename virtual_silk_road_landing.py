@@ -1,7 +1,48 @@
+import functools
+import io
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
+
+@functools.lru_cache(maxsize=1)
+def _ecosystem_emblem():
+    """Render the ecosystem emblem once per process as PNG bytes"""
+    # matplotlib and numpy load on first use so the page header paints without waiting for them
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    fig, ax = plt.subplots(figsize=(8, 8))
+    
+    # Create concentric circles
+    circle1 = plt.Circle((0.5, 0.5), 0.4, color='#1E3A8A', alpha=0.7)
+    circle2 = plt.Circle((0.5, 0.5), 0.3, color='#7B68EE', alpha=0.7)
+    circle3 = plt.Circle((0.5, 0.5), 0.2, color='#990099', alpha=0.9)
+    circle4 = plt.Circle((0.5, 0.5), 0.1, color='gold', alpha=1)
+    
+    ax.add_patch(circle1)
+    ax.add_patch(circle2)
+    ax.add_patch(circle3)
+    ax.add_patch(circle4)
+    
+    # Add text labels
+    ax.text(0.5, 0.9, "Empire OS Ecosystem", ha='center', va='center', fontsize=12, fontweight='bold')
+    ax.text(0.5, 0.5, "Virtual\nSilk Road", ha='center', va='center', fontsize=10, fontweight='bold', color='white')
+    
+    # Add connecting points around the circles
+    for i in range(8):
+        angle = i * np.pi/4
+        x = 0.5 + 0.45 * np.cos(angle)
+        y = 0.5 + 0.45 * np.sin(angle)
+        ax.plot([0.5, x], [0.5, y], 'k-', alpha=0.3, linewidth=1)
+        ax.plot(x, y, 'o', color='white', markersize=6)
+    
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight", dpi=200)
+    plt.close(fig)
+    return buffer.getvalue()
 
 def show_virtual_silk_road_landing():
     """Display the public landing page for Virtual Silk Road - Marketing focused"""
@@ -48,37 +89,7 @@ def show_virtual_silk_road_landing():
     
     with col2:
         # Create a simple visual representation
-        fig, ax = plt.subplots(figsize=(8, 8))
-        
-        # Create concentric circles
-        circle1 = plt.Circle((0.5, 0.5), 0.4, color='#1E3A8A', alpha=0.7)
-        circle2 = plt.Circle((0.5, 0.5), 0.3, color='#7B68EE', alpha=0.7)
-        circle3 = plt.Circle((0.5, 0.5), 0.2, color='#990099', alpha=0.9)
-        circle4 = plt.Circle((0.5, 0.5), 0.1, color='gold', alpha=1)
-        
-        ax.add_patch(circle1)
-        ax.add_patch(circle2)
-        ax.add_patch(circle3)
-        ax.add_patch(circle4)
-        
-        # Add text labels
-        ax.text(0.5, 0.9, "Empire OS Ecosystem", ha='center', va='center', fontsize=12, fontweight='bold')
-        ax.text(0.5, 0.5, "Virtual\nSilk Road", ha='center', va='center', fontsize=10, fontweight='bold', color='white')
-        
-        # Add connecting points around the circles
-        for i in range(8):
-            angle = i * np.pi/4
-            x = 0.5 + 0.45 * np.cos(angle)
-            y = 0.5 + 0.45 * np.sin(angle)
-            ax.plot([0.5, x], [0.5, y], 'k-', alpha=0.3, linewidth=1)
-            ax.plot(x, y, 'o', color='white', markersize=6)
-        
-        ax.set_xlim(0, 1)
-        ax.set_ylim(0, 1)
-        ax.set_aspect('equal')
-        ax.axis('off')
-        
-        st.pyplot(fig)
+        st.image(_ecosystem_emblem(), use_container_width=True)
     
     # External system integration
     st.markdown("## Integrated Ecosystem")
@@ -200,6 +211,7 @@ def show_virtual_silk_road_landing():
     }
     
     # Create DataFrame
+    import pandas as pd
     df_comparison = pd.DataFrame(comparison_data)
     
     # Display comparison
@@ -2,9 +2,27 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+from plotly.subplots import make_subplots
 import numpy as np
 from datetime import datetime, timedelta
+from frame_memo import memoize_frames
+from downsampling import DEFAULT_CHART_WIDTH, candle_budget, downsample_ohlc, lttb_frame, point_budget
+from figure_encoding import render_chart
+from market_data import get_bars
+from bar_store import INTERVAL_LABELS, PERIODS_PER_YEAR, available_intervals
+from performance_metrics import drawdown_series, performance_metrics, rolling_sharpe
+from retail_universe import BENCHMARK_TICKER
+from session_memory import resolve
 
+ROLLING_SHARPE_WINDOW = 63  # about one quarter of trading days
+
+def visible_window(df, x_range=None):
+    """Slice a time-indexed frame to the zoomed (start, end) range, if any"""
+    if x_range is None:
+        return df
+    return df.loc[pd.Timestamp(x_range[0]):pd.Timestamp(x_range[1])]
+
+@memoize_frames()
 def calculate_moving_averages(df, windows=[20, 50, 200]):
     """Calculate moving averages for the stock data"""
     result = df.copy()
@@ -12,6 +30,7 @@ def calculate_moving_averages(df, windows=[20, 50, 200]):
         result[f'MA{window}'] = result['Close'].rolling(window=window).mean()
     return result
 
+@memoize_frames()
 def calculate_rsi(data, window=14):
     """Calculate Relative Strength Index"""
     delta = data['Close'].diff()
@@ -26,8 +45,14 @@ def calculate_rsi(data, window=14):
     
     return rsi
 
-def create_candlestick_chart(df, title):
+@memoize_frames()
+def create_candlestick_chart(df, title, max_points=None, x_range=None):
     """Create an interactive candlestick chart"""
+    # Aggregate long histories into at most max_points candles
+    df = visible_window(df, x_range)
+    if max_points:
+        df = downsample_ohlc(df, max_points)
+    
     fig = go.Figure()
     
     # Add candlestick chart
@@ -75,10 +100,13 @@ def create_candlestick_chart(df, title):
     
     return fig
 
-def create_technical_chart(df, title):
+@memoize_frames()
+def create_technical_chart(df, title, max_points=None, x_range=None):
     """Create technical analysis chart with moving averages"""
-    # Calculate moving averages
-    df_ma = calculate_moving_averages(df)
+    # Calculate moving averages on the full history, then downsample what is shown
+    df_ma = visible_window(calculate_moving_averages(df), x_range)
+    if max_points:
+        df_ma = lttb_frame(df_ma, 'Close', max_points)
     
     fig = go.Figure()
     
@@ -121,17 +149,20 @@ def create_technical_chart(df, title):
     
     return fig
 
-def create_rsi_chart(df, title):
+@memoize_frames()
+def create_rsi_chart(df, title, max_points=None, x_range=None):
     """Create RSI (Relative Strength Index) chart"""
-    # Calculate RSI
-    rsi = calculate_rsi(df)
+    # Calculate RSI on the full history, then downsample what is shown
+    rsi_data = visible_window(calculate_rsi(df).to_frame('RSI'), x_range)
+    if max_points:
+        rsi_data = lttb_frame(rsi_data, 'RSI', max_points)
     
     fig = go.Figure()
     
     # Add RSI line
     fig.add_trace(go.Scatter(
-        x=df.index,
-        y=rsi,
+        x=rsi_data.index,
+        y=rsi_data['RSI'],
         mode='lines',
         name='RSI',
         line=dict(color='#1E88E5', width=2)
@@ -140,18 +171,18 @@ def create_rsi_chart(df, title):
     # Add overbought/oversold thresholds
     fig.add_shape(
         type="line",
-        x0=df.index[0],
+        x0=rsi_data.index[0],
         y0=70,
-        x1=df.index[-1],
+        x1=rsi_data.index[-1],
         y1=70,
         line=dict(color="red", width=1, dash="dash")
     )
     
     fig.add_shape(
         type="line",
-        x0=df.index[0],
+        x0=rsi_data.index[0],
         y0=30,
-        x1=df.index[-1],
+        x1=rsi_data.index[-1],
         y1=30,
         line=dict(color="green", width=1, dash="dash")
     )
@@ -168,6 +199,7 @@ def create_rsi_chart(df, title):
     
     return fig
 
+@memoize_frames()
 def create_returns_chart(df, title):
     """Create returns distribution chart"""
     # Calculate daily returns
@@ -196,6 +228,48 @@ def create_returns_chart(df, title):
     
     return fig
 
+@memoize_frames()
+def create_risk_chart(df, title, max_points=None, x_range=None, periods_per_year=252):
+    """Create drawdown and rolling Sharpe chart"""
+    risk_data = pd.DataFrame({
+        'Drawdown': drawdown_series(df['Close'])['Close'] * 100,
+        'Rolling Sharpe': rolling_sharpe(df['Close'], ROLLING_SHARPE_WINDOW, periods_per_year)['Close']
+    })
+    risk_data = visible_window(risk_data, x_range)
+    if max_points:
+        risk_data = lttb_frame(risk_data, 'Drawdown', max_points)
+    
+    fig = make_subplots(
+        rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.08,
+        subplot_titles=("Drawdown from Peak (%)", f"Rolling Sharpe ({ROLLING_SHARPE_WINDOW} bars)")
+    )
+    
+    fig.add_trace(go.Scatter(
+        x=risk_data.index,
+        y=risk_data['Drawdown'],
+        mode='lines',
+        name='Drawdown',
+        fill='tozeroy',
+        line=dict(color='#E53935', width=1)
+    ), row=1, col=1)
+    
+    fig.add_trace(go.Scatter(
+        x=risk_data.index,
+        y=risk_data['Rolling Sharpe'],
+        mode='lines',
+        name='Rolling Sharpe',
+        line=dict(color='#43A047', width=1.5)
+    ), row=2, col=1)
+    
+    fig.update_layout(
+        title=title,
+        template='plotly_dark',
+        height=450,
+        showlegend=False
+    )
+    
+    return fig
+
 def show_visualization():
     """Show the visualization page"""
     if st.session_state.stock_data is None or st.session_state.selected_stock is None:
@@ -207,10 +281,49 @@ def show_visualization():
     
     stock_data = st.session_state.stock_data
     ticker = st.session_state.selected_stock
-    historical_data = stock_data["history"]
+    period = stock_data.get("period", "1y")
     
     st.title(f"Visualization: {stock_data['info'].get('shortName', ticker)} ({ticker})")
     
+    # Other intervals are resampled from the cached base bars; each level is built once and then reused
+    intervals = available_intervals(period)
+    loaded_interval = stock_data.get("interval", "1d")
+    interval = st.selectbox(
+        "Bar interval:",
+        intervals,
+        index=intervals.index(loaded_interval) if loaded_interval in intervals else intervals.index("1d"),
+        format_func=INTERVAL_LABELS.get
+    )
+    # The history may have been moved to the shared frame cache (and released after the session went idle)
+    historical_data = resolve(stock_data["history"]) if interval == loaded_interval else None
+    if historical_data is None:
+        historical_data = get_bars(ticker, period=period, interval=interval)
+    periods_per_year = PERIODS_PER_YEAR[interval]
+    
+    # Long histories are downsampled to the chart's point budget; zooming re-samples the window at full resolution
+    x_range = None
+    with st.expander("Chart Resolution & Zoom"):
+        chart_width = st.select_slider(
+            "Chart width (px):",
+            options=[600, 900, 1200, 1600, 2400],
+            value=DEFAULT_CHART_WIDTH
+        )
+        if len(historical_data) > 1:
+            first_date = historical_data.index[0].to_pydatetime()
+            last_date = historical_data.index[-1].to_pydatetime()
+            zoom = st.slider(
+                "Zoom window:",
+                min_value=first_date,
+                max_value=last_date,
+                value=(first_date, last_date),
+                format="YYYY-MM-DD"
+            )
+            if zoom != (first_date, last_date):
+                x_range = zoom
+        st.checkbox("Show chart payload sizes", key="show_chart_payload")
+    max_points = point_budget(chart_width)
+    max_candles = candle_budget(chart_width)
+    
     # Price Chart Section
     st.subheader("Price Analysis")
     
@@ -223,15 +336,19 @@ def show_visualization():
     if chart_type == "Line Chart":
         fig = create_technical_chart(
             historical_data, 
-            f"{ticker} Price with Moving Averages"
+            f"{ticker} Price with Moving Averages",
+            max_points=max_points,
+            x_range=x_range
         )
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
     else:
         fig = create_candlestick_chart(
             historical_data, 
-            f"{ticker} Candlestick Chart"
+            f"{ticker} Candlestick Chart",
+            max_points=max_candles,
+            x_range=x_range
         )
-        st.plotly_chart(fig, use_container_width=True)
+        render_chart(fig, use_container_width=True)
     
     # Technical Indicators Section
     st.subheader("Technical Indicators")
@@ -241,48 +358,74 @@ def show_visualization():
     with col1:
         rsi_fig = create_rsi_chart(
             historical_data, 
-            f"{ticker} RSI (Relative Strength Index)"
+            f"{ticker} RSI (Relative Strength Index)",
+            max_points=max_points,
+            x_range=x_range
         )
-        st.plotly_chart(rsi_fig, use_container_width=True)
+        render_chart(rsi_fig, use_container_width=True)
     
     with col2:
         returns_fig = create_returns_chart(
             historical_data, 
-            f"{ticker} Daily Returns Distribution"
+            f"{ticker} Returns Distribution ({INTERVAL_LABELS[interval]} bars)"
         )
-        st.plotly_chart(returns_fig, use_container_width=True)
+        render_chart(returns_fig, use_container_width=True)
     
     # Performance Summary
     st.subheader("Performance Summary")
     
-    # Calculate performance metrics
+    # Calculate performance metrics in one pass, with beta against the retail sector ETF
     try:
-        # Get first and last closing prices
-        start_price = historical_data['Close'].iloc[0]
-        end_price = historical_data['Close'].iloc[-1]
+        close = historical_data['Close']
+        benchmark = None
+        if ticker != BENCHMARK_TICKER:
+            benchmark_history = get_bars(
+                BENCHMARK_TICKER,
+                start=close.index[0],
+                end=close.index[-1] + timedelta(days=1),
+                interval=interval
+            )
+            if not benchmark_history.empty:
+                benchmark = benchmark_history['Close']
+        else:
+            benchmark = close
+        metrics = performance_metrics(close, benchmark=benchmark, periods_per_year=periods_per_year).iloc[0]
         
-        # Calculate performance metrics
-        total_return = ((end_price - start_price) / start_price) * 100
-        daily_returns = historical_data['Close'].pct_change().dropna()
-        annualized_return = daily_returns.mean() * 252 * 100
-        volatility = daily_returns.std() * np.sqrt(252) * 100
-        sharpe_ratio = annualized_return / volatility if volatility != 0 else 0
-        max_drawdown = ((historical_data['Close'].cummax() - historical_data['Close']) / historical_data['Close'].cummax()).max() * 100
+        format_pct = lambda x: f"{x * 100:.2f}%" if pd.notna(x) else "N/A"
+        format_ratio = lambda x: f"{x:.2f}" if pd.notna(x) else "N/A"
         
         # Display metrics
-        col1, col2, col3 = st.columns(3)
+        col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Return", f"{total_return:.2f}%")
-            st.metric("Annualized Return", f"{annualized_return:.2f}%")
+            st.metric("Total Return", format_pct(metrics['Total Return']))
+            st.metric("Annualized Return", format_pct(metrics['Annualized Return']))
+            st.metric("Volatility (Annualized)", format_pct(metrics['Volatility']))
         
         with col2:
-            st.metric("Volatility (Annualized)", f"{volatility:.2f}%")
-            st.metric("Sharpe Ratio", f"{sharpe_ratio:.2f}")
+            st.metric("Sharpe Ratio", format_ratio(metrics['Sharpe']))
+            st.metric("Sortino Ratio", format_ratio(metrics['Sortino']))
+            st.metric("Calmar Ratio", format_ratio(metrics['Calmar']))
         
         with col3:
-            st.metric("Maximum Drawdown", f"{max_drawdown:.2f}%")
-            st.metric("Average Daily Volume", f"{historical_data['Volume'].mean():.0f}")
+            st.metric("Maximum Drawdown", format_pct(-metrics['Max Drawdown']))
+            st.metric("Current Drawdown", format_pct(-metrics['Current Drawdown']))
+            recovery = metrics['Time to Recovery']
+            recovery_unit = {"1d": "days", "1wk": "weeks"}.get(interval, "bars")
+            st.metric("Time to Recovery", f"{recovery:.0f} {recovery_unit}" if pd.notna(recovery) else "Not recovered")
+        
+        with col4:
+            st.metric(f"Beta vs {BENCHMARK_TICKER}", format_ratio(metrics['Beta']))
+            st.metric(f"Average Volume ({INTERVAL_LABELS[interval]})", f"{historical_data['Volume'].mean():.0f}")
+        
+        risk_fig = create_risk_chart(
+            historical_data[['Close']],
+            f"{ticker} Drawdown & Risk-Adjusted Return",
+            max_points=max_points,
+            x_range=x_range,
+            periods_per_year=periods_per_year
+        )
+        render_chart(risk_fig, use_container_width=True)
     
     except Exception as e:
         st.error(f"Error calculating performance metrics: {str(e)}")
@@ -290,9 +433,11 @@ def show_visualization():
     # Trading Volume Analysis
     st.subheader("Trading Volume Analysis")
     
+    # Volume is summed per bucket, on the same bucket edges as the candles, so no traded volume is dropped
+    volume_data = downsample_ohlc(visible_window(historical_data[['Volume']], x_range), max_candles)
     volume_fig = px.bar(
-        historical_data, 
-        x=historical_data.index, 
+        volume_data, 
+        x=volume_data.index, 
         y='Volume',
         title=f"{ticker} Trading Volume",
         template='plotly_dark',
@@ -304,7 +449,7 @@ def show_visualization():
         height=400
     )
     
-    st.plotly_chart(volume_fig, use_container_width=True)
+    render_chart(volume_fig, use_container_width=True)
     
     # Comparison option (teaser for future feature)
     st.markdown("---")